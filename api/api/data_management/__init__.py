@@ -9,6 +9,7 @@ __all__ = [
     "NewCase",
     "Case",
     "CaseUpdate",
+    "CaseSummary",
     "Customer",
     "CustomerBase",
     "CustomerUpdate",
@@ -35,21 +36,35 @@ __all__ = [
     "VehicleUpdate",
     "Workshop",
     "TimeseriesDataFull",
-    "BaseSignalStore"
+    "BaseSignalStore",
+    "SignalLevel",
+    "ChannelDescription",
+    "NewTimeseriesUpload",
+    "TimeseriesUpload",
+    "UploadOffsetMismatch",
+    "UploadSizeExceeded",
+    "OrphanCollector",
+    "orphan_collector",
+    "TaskDispatch",
+    "CaseDataEvents",
+    "case_data_events"
 ]
 
 from .assets import (
     NewAsset, AssetDefinition, Asset, AssetMetaData, Publication,
     NewPublication, AssetDataStatus
 )
-from .case import NewCase, Case, CaseUpdate
+from .case import NewCase, Case, CaseUpdate, CaseSummary
+from .case_data_events import CaseDataEvents, case_data_events
 from .customer import Customer, CustomerBase, CustomerUpdate
 from .diagnosis import (
     Diagnosis, Action, DiagnosisStatus, DiagnosisLogEntry,
     AttachmentBucket
 )
+from .orphan_collector import OrphanCollector, orphan_collector
 from .obd_data import OBDMetaData, NewOBDData, OBDDataUpdate, OBDData
 from .symptom import NewSymptom, Symptom, SymptomUpdate, SymptomLabel
+from .task_dispatch import TaskDispatch
 from .timeseries_data import (
     TimeseriesMetaData,
     TimeseriesDataUpdate,
@@ -58,7 +73,15 @@ from .timeseries_data import (
     GridFSSignalStore,
     TimeseriesDataLabel,
     TimeseriesDataFull,
-    BaseSignalStore
+    BaseSignalStore,
+    SignalLevel
+)
+from .timeseries_upload import (
+    ChannelDescription,
+    NewTimeseriesUpload,
+    TimeseriesUpload,
+    UploadOffsetMismatch,
+    UploadSizeExceeded
 )
 from .vehicle import Vehicle, VehicleUpdate
 from .workshop import Workshop
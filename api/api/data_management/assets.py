@@ -117,6 +117,8 @@ class Asset(AssetMetaData, Document):
         # submodels
         for data_submodel in ["timeseries_data", "obd_data", "symptoms"]:
             exclude[data_submodel] = {"__all__": {"data_id"}}
+        # Signal levels are not part of the published signal data
+        exclude["timeseries_data"]["__all__"].add("signal_levels")
 
         case_json = case.model_dump_json(exclude=exclude, indent=1)
         return case_json
@@ -0,0 +1,32 @@
+"""
+Set-based clean-up of foreign keys when a referenced document is deleted.
+
+Each helper issues a single write for all referencing documents instead of
+loading and updating them one by one. Note that event handlers of the
+referencing documents are not executed.
+"""
+from typing import Any, Type
+
+from beanie import Document
+
+
+async def set_null(model: Type[Document], field: str, key: Any) -> int:
+    """
+    Set foreign key field to None in all documents of model referencing key.
+    Returns the number of modified documents.
+    """
+    result = await model.get_motor_collection().update_many(
+        {field: key}, {"$set": {field: None}}
+    )
+    return result.modified_count
+
+
+async def delete_referencing(
+        model: Type[Document], field: str, key: Any
+) -> int:
+    """
+    Delete all documents of model referencing key via foreign key field.
+    Returns the number of deleted documents.
+    """
+    result = await model.get_motor_collection().delete_many({field: key})
+    return result.deleted_count
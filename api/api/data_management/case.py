@@ -1,3 +1,6 @@
+import asyncio
+import logging
+import sys
 from datetime import datetime, UTC
 from enum import Enum
 from typing import (
@@ -6,9 +9,11 @@ from typing import (
     Optional,
     Tuple,
     Any,
-    Self
+    Self,
+    Literal
 )
 
+import pymongo
 from beanie import (
     Document,
     Indexed,
@@ -17,13 +22,19 @@ from beanie import (
     Delete,
     PydanticObjectId
 )
+from beanie.exceptions import DocumentNotFound
+from beanie.odm.utils.encoder import Encoder
+from pymongo import ReturnDocument
 from pydantic import (
     BaseModel,
     Field,
     NonNegativeInt,
+    PositiveInt,
     ConfigDict
 )
 
+from .cascade import delete_referencing
+from .case_data_events import case_data_events
 from .diagnosis import Diagnosis
 from .obd_data import NewOBDData, OBDData, OBDDataUpdate
 from .symptom import NewSymptom, Symptom, SymptomUpdate
@@ -32,6 +43,30 @@ from .timeseries_data import (
 )
 from .vehicle import Vehicle
 
+logger = logging.getLogger(__name__)
+
+# Maximum number of signals deleted in parallel when a case is deleted
+SIGNAL_DELETE_CONCURRENCY = 8
+
+
+def _prefix_range(prefix: str) -> dict:
+    """
+    Query operator matching all strings starting with prefix. In contrast to
+    a regex, the bounded range is used as is for index scans and the prefix
+    is not interpreted.
+    """
+    # strings starting with prefix are smaller than the prefix with
+    # incremented last character
+    stripped = prefix.rstrip(chr(sys.maxunicode))
+    if not stripped:
+        return {"$gte": prefix}
+    next_char = ord(stripped[-1]) + 1
+    if 0xD800 <= next_char <= 0xDFFF:
+        # surrogates can not be encoded
+        next_char = 0xE000
+    upper = stripped[:-1] + chr(next_char)
+    return {"$gte": prefix, "$lt": upper}
+
 
 class Occasion(str, Enum):
     unknown = "unknown"
@@ -71,6 +106,49 @@ class CaseUpdate(BaseModel):
     status: Optional[Status] = None
 
 
+class CaseSummary(BaseModel):
+    """
+    Case metadata with the number of diagnostic datasets instead of the
+    datasets themselves.
+    """
+
+    model_config = ConfigDict(populate_by_name=True)
+
+    class Settings:
+        # Projection used to retrieve summaries from the cases collection.
+        # Dataset counts are computed by the database, such that embedded
+        # datasets are never transferred.
+        projection = {
+            "_id": 1,
+            "timestamp": 1,
+            "occasion": 1,
+            "milage": 1,
+            "status": 1,
+            "customer_id": 1,
+            "vehicle_vin": 1,
+            "workshop_id": 1,
+            "diagnosis_id": 1,
+            "timeseries_data_count": {
+                "$size": {"$ifNull": ["$timeseries_data", []]}
+            },
+            "obd_data_count": {"$size": {"$ifNull": ["$obd_data", []]}},
+            "symptoms_count": {"$size": {"$ifNull": ["$symptoms", []]}}
+        }
+
+    id: PydanticObjectId = Field(alias="_id")
+    timestamp: datetime
+    occasion: Occasion = Occasion.unknown
+    milage: Optional[int] = None
+    status: Status = Status.open
+    customer_id: Optional[PydanticObjectId] = None
+    vehicle_vin: str
+    workshop_id: str
+    diagnosis_id: Optional[PydanticObjectId] = None
+    timeseries_data_count: NonNegativeInt = 0
+    obd_data_count: NonNegativeInt = 0
+    symptoms_count: NonNegativeInt = 0
+
+
 class Case(Document):
     """Complete case schema and major db interfacing class."""
 
@@ -80,6 +158,28 @@ class Case(Document):
 
     class Settings:
         name = "cases"
+        # Indexes for the filters of find_in_hub. Paginated results are
+        # sorted by _id.
+        indexes = [
+            [
+                ("workshop_id", pymongo.ASCENDING),
+                ("_id", pymongo.ASCENDING)
+            ],
+            [
+                ("workshop_id", pymongo.ASCENDING),
+                ("vehicle_vin", pymongo.ASCENDING)
+            ],
+            [
+                ("workshop_id", pymongo.ASCENDING),
+                ("obd_data.dtcs", pymongo.ASCENDING)
+            ],
+            [
+                ("workshop_id", pymongo.ASCENDING),
+                ("timeseries_data.component", pymongo.ASCENDING)
+            ],
+            "obd_data.dtcs",
+            "timeseries_data.component"
+        ]
 
     # case descriptions
     timestamp: datetime = Field(default_factory=lambda: datetime.now(UTC))
@@ -128,12 +228,19 @@ class Case(Document):
             vin: Optional[str] = None,
             workshop_id: Optional[str] = None,
             obd_data_dtc: Optional[str] = None,
-            timeseries_data_component: Optional[str] = None
-    ) -> List[Self]:
+            timeseries_data_component: Optional[str] = None,
+            limit: Optional[PositiveInt] = None,
+            after: Optional[str] = None,
+            view: Literal["full", "summary"] = "full"
+    ) -> List[Self] | List[CaseSummary]:
         """
         Get list of all cases with optional filtering by customer_id,
         vehicle_vin, workshop_id or obd_data dtc.
 
+        Results can be paginated via `limit` and `after`. Paginated results
+        are ordered by id, which allows to continue after the last case of
+        the previous page without skipping over preceding cases.
+
         Parameters
         ----------
         customer_id
@@ -154,17 +261,53 @@ class Case(Document):
             Timeseries data component to search for. Only cases that contain at
             least one timeseries dataset for the specified component are
             returned.
+        limit
+            Maximum number of cases to return.
+        after
+            Id of a case. Only cases with greater ids are returned.
+        view
+            With "summary", CaseSummary instances are returned instead of the
+            complete cases.
 
         Returns
         -------
-        List of cases matching the specified search criteria.
+        List of cases or case summaries matching the specified search
+        criteria.
         """
+        filter = cls._hub_filter(
+            customer_id=customer_id,
+            vin=vin,
+            workshop_id=workshop_id,
+            obd_data_dtc=obd_data_dtc,
+            timeseries_data_component=timeseries_data_component,
+            after=after
+        )
+        query = cls.find(filter)
+        if view == "summary":
+            query = query.project(CaseSummary)
+        if limit is not None or after is not None:
+            query = query.sort("_id")
+        if limit is not None:
+            query = query.limit(limit)
+        cases = await query.to_list()
+        return cases
+
+    @staticmethod
+    def _hub_filter(
+            customer_id: Optional[str] = None,
+            vin: Optional[str] = None,
+            workshop_id: Optional[str] = None,
+            obd_data_dtc: Optional[str] = None,
+            timeseries_data_component: Optional[str] = None,
+            after: Optional[str] = None
+    ) -> dict:
+        """Query filter of find_in_hub."""
         filter = {}
         if customer_id is not None:
             filter["customer_id"] = PydanticObjectId(customer_id)
-        if vin is not None:
+        if vin:
             # VIN is matched against beginning of stored vins
-            filter["vehicle_vin"] = {"$regex": f"^{vin}"}
+            filter["vehicle_vin"] = _prefix_range(vin)
         if workshop_id is not None:
             filter["workshop_id"] = workshop_id
         if obd_data_dtc is not None:
@@ -176,33 +319,147 @@ class Case(Document):
             # specified component
             filter["timeseries_data.component"] = timeseries_data_component
 
-        cases = await cls.find(filter).to_list()
-        return cases
+        if after is not None:
+            filter["_id"] = {"$gt": PydanticObjectId(after)}
+        return filter
+
+    async def _reserve_data_id(
+            self, counter: str, count: PositiveInt = 1
+    ) -> NonNegativeInt:
+        """
+        Atomically increment one of the counters of added data in the
+        database and return the first data_id reserved for `count` new
+        datasets.
+        """
+        document = await self.get_motor_collection().find_one_and_update(
+            {"_id": self.id},
+            {"$inc": {counter: count}},
+            projection={counter: 1},
+            return_document=ReturnDocument.AFTER
+        )
+        if document is None:
+            raise DocumentNotFound(f"Case {self.id} does not exist.")
+        setattr(self, counter, document[counter])
+        return document[counter] - count
+
+    async def _push_data(self, array: str, *data: BaseModel):
+        """Atomically append datasets to one of the data arrays."""
+        result = await self.get_motor_collection().update_one(
+            {"_id": self.id},
+            {"$push": {array: {"$each": [Encoder().encode(d) for d in data]}}}
+        )
+        if result.matched_count == 0:
+            raise DocumentNotFound(f"Case {self.id} does not exist.")
+        getattr(self, array).extend(data)
+
+    async def _pull_data(self, array: str, data_id: NonNegativeInt):
+        """Atomically remove a dataset from one of the data arrays."""
+        await self.get_motor_collection().update_one(
+            {"_id": self.id},
+            {"$pull": {array: {"data_id": data_id}}}
+        )
+        setattr(
+            self,
+            array,
+            [d for d in getattr(self, array) if d.data_id != data_id]
+        )
+
+    async def _update_data(
+            self,
+            array: str,
+            data_id: NonNegativeInt,
+            update: BaseModel,
+            data_model: type[BaseModel]
+    ) -> Any:
+        """
+        Atomically update the fields specified in `update` of a dataset in one
+        of the data arrays and notify listeners waiting for data of this
+        case, e.g. if the component of a dataset changed. Returns the updated
+        dataset or None if it does not exist.
+        """
+        idx, data = self.find_data_in_array(
+            data_array=getattr(self, array), data_id=data_id
+        )
+        if data is None or idx is None:
+            return None
+        # validate the updated dataset before writing any changes
+        updated_data = data_model(
+            **{**data.model_dump(), **update.model_dump(exclude_unset=True)}
+        )
+        updated_fields = {
+            f"{array}.$.{field}": Encoder().encode(
+                getattr(updated_data, field)
+            )
+            for field in update.model_fields_set
+        }
+        if updated_fields:
+            result = await self.get_motor_collection().update_one(
+                {"_id": self.id, f"{array}.data_id": data_id},
+                {"$set": updated_fields}
+            )
+            if result.matched_count == 0:
+                # dataset was removed in the meantime
+                return None
+            case_data_events.notify(self.id)
+        getattr(self, array)[idx] = updated_data
+        return updated_data
 
     async def add_timeseries_data(self, new_data: NewTimeseriesData) -> Self:
+        return await self.add_timeseries_data_many([new_data])
+
+    async def add_timeseries_data_many(
+            self, new_data: List[NewTimeseriesData]
+    ) -> Self:
+        """
+        Add multiple timeseries datasets, e.g. all channels of a single
+        measurement. The signals are stored concurrently and the datasets are
+        appended to the case in a single update. If any of the signals can
+        not be stored, signals that were already stored are deleted again and
+        no dataset is added. Listeners waiting for data of this case are
+        notified once the datasets are added.
+        """
+        if not new_data:
+            return self
+        first_data_id = await self._reserve_data_id(
+            "timeseries_data_added", count=len(new_data)
+        )
         # signal data is stored and converted to ref
-        timeseries_data = await new_data.to_timeseries_data()
-        # append to data array
-        timeseries_data.data_id = self.timeseries_data_added
-        self.timeseries_data.append(timeseries_data)
-        self.timeseries_data_added += 1
-        await self.save()
+        results = await asyncio.gather(
+            *[d.to_timeseries_data() for d in new_data],
+            return_exceptions=True
+        )
+        timeseries_data = [
+            r for r in results if isinstance(r, TimeseriesData)
+        ]
+        try:
+            for result in results:
+                if isinstance(result, BaseException):
+                    raise result
+            for data_id, data in enumerate(timeseries_data, first_data_id):
+                data.data_id = data_id
+            await self._push_data("timeseries_data", *timeseries_data)
+        except BaseException:
+            # roll back stored signals
+            await asyncio.gather(
+                *[d.delete_signal() for d in timeseries_data],
+                return_exceptions=True
+            )
+            raise
+        case_data_events.notify(self.id)
         return self
 
     async def add_obd_data(self, new_obd_data: NewOBDData) -> Self:
-        obd_data = OBDData(data_id=self.obd_data_added,
-                           **new_obd_data.model_dump())
-        self.obd_data.append(obd_data)
-        self.obd_data_added += 1
-        await self.save()
+        data_id = await self._reserve_data_id("obd_data_added")
+        obd_data = OBDData(data_id=data_id, **new_obd_data.model_dump())
+        await self._push_data("obd_data", obd_data)
+        case_data_events.notify(self.id)
         return self
 
     async def add_symptom(self, new_symptom: NewSymptom) -> Self:
-        symptom = Symptom(data_id=self.symptoms_added,
-                          **new_symptom.model_dump())
-        self.symptoms.append(symptom)
-        self.symptoms_added += 1
-        await self.save()
+        data_id = await self._reserve_data_id("symptoms_added")
+        symptom = Symptom(data_id=data_id, **new_symptom.model_dump())
+        await self._push_data("symptoms", symptom)
+        case_data_events.notify(self.id)
         return self
 
     @staticmethod
@@ -236,71 +493,58 @@ class Case(Document):
         return symptom
 
     async def delete_timeseries_data(self, data_id: NonNegativeInt):
-        idx, timeseries_data = self.find_data_in_array(
+        _, timeseries_data = self.find_data_in_array(
             data_array=self.timeseries_data, data_id=data_id
         )
-        if timeseries_data is not None and idx is not None:
-            await timeseries_data.delete_signal()
-            self.timeseries_data.pop(idx)
-            await self.save()
+        if timeseries_data is None:
+            return
+        # Remove the dataset and retrieve the removed version. Only the
+        # request that actually removed the dataset deletes the signal.
+        document = await self.get_motor_collection().find_one_and_update(
+            {"_id": self.id, "timeseries_data.data_id": data_id},
+            {"$pull": {"timeseries_data": {"data_id": data_id}}},
+            projection={
+                "timeseries_data": {"$elemMatch": {"data_id": data_id}}
+            },
+            return_document=ReturnDocument.BEFORE
+        )
+        self.timeseries_data = [
+            d for d in self.timeseries_data if d.data_id != data_id
+        ]
+        if document is not None:
+            removed = TimeseriesData(**document["timeseries_data"][0])
+            await removed.delete_signal()
 
     async def delete_obd_data(self, data_id: NonNegativeInt):
-        idx, _ = self.find_data_in_array(
+        _, obd_data = self.find_data_in_array(
             data_array=self.obd_data, data_id=data_id
         )
-        if idx is not None:
-            self.obd_data.pop(idx)
-            await self.save()
+        if obd_data is not None:
+            await self._pull_data("obd_data", data_id)
 
     async def delete_symptom(self, data_id: NonNegativeInt):
-        idx, _ = self.find_data_in_array(
+        _, symptom = self.find_data_in_array(
             data_array=self.symptoms, data_id=data_id
         )
-        if idx is not None:
-            self.symptoms.pop(idx)
-            await self.save()
+        if symptom is not None:
+            await self._pull_data("symptoms", data_id)
 
     async def update_timeseries_data(
             self, data_id: NonNegativeInt, update: TimeseriesDataUpdate
     ) -> TimeseriesData | None:
-        idx, timeseries_data = self.find_data_in_array(
-            data_array=self.timeseries_data, data_id=data_id
+        return await self._update_data(
+            "timeseries_data", data_id, update, TimeseriesData
         )
-        if timeseries_data is not None and idx is not None:
-            timeseries_data = timeseries_data.model_dump()
-            timeseries_data.update(update.model_dump(exclude_unset=True))
-            timeseries_data = TimeseriesData(**timeseries_data)
-            self.timeseries_data[idx] = timeseries_data
-            await self.save()
-        return timeseries_data
 
     async def update_obd_data(
             self, data_id: NonNegativeInt, update: OBDDataUpdate
     ) -> OBDData | None:
-        idx, obd_data = self.find_data_in_array(
-            data_array=self.obd_data, data_id=data_id
-        )
-        if obd_data is not None and idx is not None:
-            obd_data = obd_data.model_dump()
-            obd_data.update(update.model_dump(exclude_unset=True))
-            obd_data = OBDData(**obd_data)
-            self.obd_data[idx] = obd_data
-            await self.save()
-        return obd_data
+        return await self._update_data("obd_data", data_id, update, OBDData)
 
     async def update_symptom(
             self, data_id: NonNegativeInt, update: SymptomUpdate
     ) -> Symptom | None:
-        idx, symptom = self.find_data_in_array(
-            data_array=self.symptoms, data_id=data_id
-        )
-        if symptom is not None and idx is not None:
-            symptom = symptom.model_dump()
-            symptom.update(update.model_dump(exclude_unset=True))
-            symptom = Symptom(**symptom)
-            self.symptoms[idx] = symptom
-            await self.save()
-        return symptom
+        return await self._update_data("symptoms", data_id, update, Symptom)
 
     @property
     def available_timeseries_data(self):
@@ -318,20 +562,34 @@ class Case(Document):
     async def _delete_all_timeseries_signals(self):
         """
         Make sure that binary signal data stored outside of case is also
-        removed.
+        removed. Signals are deleted concurrently.
         """
-        for ts in self.timeseries_data:
-            if ts is not None:
+        semaphore = asyncio.Semaphore(SIGNAL_DELETE_CONCURRENCY)
+
+        async def delete_signal(ts: TimeseriesData):
+            async with semaphore:
                 await ts.delete_signal()
 
+        timeseries_data = [ts for ts in self.timeseries_data if ts is not None]
+        results = await asyncio.gather(
+            *[delete_signal(ts) for ts in timeseries_data],
+            return_exceptions=True
+        )
+        for ts, result in zip(timeseries_data, results):
+            if isinstance(result, asyncio.CancelledError):
+                raise result
+            if isinstance(result, Exception):
+                # the case is deleted anyway, the orphaned signal is
+                # reclaimed by the orphan collector
+                logger.warning(
+                    f"Could not delete signal {ts.signal_id} of case "
+                    f"{self.id}: {result}"
+                )
+
     @before_event(Delete)
     async def _delete_diagnosis(self):
         """
         Make sure any diagnosis attached to the case is also removed.
+        Attachments of the diagnosis are reclaimed by the orphan collector.
         """
-        if self.diagnosis_id is not None:
-            # delete via instance to make sure Diagnosis event handlers
-            # are also executed
-            diag = await Diagnosis.get(self.diagnosis_id)
-            if diag is not None:
-                await diag.delete()
+        await delete_referencing(Diagnosis, "case_id", self.id)
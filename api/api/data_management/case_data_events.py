@@ -0,0 +1,134 @@
+import asyncio
+import logging
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional, Set
+
+from redis import asyncio as aioredis
+
+logger = logging.getLogger(__name__)
+
+
+class CaseDataEvents:
+    """
+    Notifies waiting requests when data is added to a case, e.g. the
+    diagnostics backend waiting for data required by a diagnosis.
+
+    If redis is configured, notifications are published to all instances of
+    the api via redis pub/sub. Otherwise, only requests handled by this
+    process are notified.
+    """
+
+    channel: str = "case-data-added"
+
+    def __init__(self, reconnect_delay: float = 1.):
+        self.reconnect_delay = reconnect_delay
+        self.published = 0
+        self.received = 0
+        self.failed_publications = 0
+        self._listeners: Dict[str, Set[asyncio.Event]] = {}
+        self._redis: Optional[aioredis.Redis] = None
+        self._task: Optional[asyncio.Task] = None
+        # pending publications started by notify
+        self._publications: Set[asyncio.Task] = set()
+
+    def configure(self, redis_uri: str | None):
+        self._redis = aioredis.from_url(redis_uri) if redis_uri else None
+
+    @contextmanager
+    def listen(self, case_id) -> Iterator[asyncio.Event]:
+        """
+        Get an event that is set whenever data is added to a case. Listen
+        before checking the available data to not miss any notification.
+        """
+        event = asyncio.Event()
+        listeners = self._listeners.setdefault(str(case_id), set())
+        listeners.add(event)
+        try:
+            yield event
+        finally:
+            listeners.discard(event)
+            if not listeners:
+                self._listeners.pop(str(case_id), None)
+
+    def _notify(self, case_id: str):
+        self.received += 1
+        for event in self._listeners.get(case_id, ()):
+            event.set()
+
+    async def publish(self, case_id):
+        """
+        Notify all listeners that data of a case was added or changed.
+        Publishing is best-effort and never raises.
+        """
+        self.published += 1
+        if self._redis is None:
+            self._notify(str(case_id))
+            return
+        try:
+            await self._redis.publish(self.channel, str(case_id))
+        except Exception as e:
+            # at least notify the listeners of this process
+            self.failed_publications += 1
+            logger.warning(f"Could not publish case data event: {e}")
+            self._notify(str(case_id))
+
+    def notify(self, case_id):
+        """
+        Publish a notification in the background, such that callers neither
+        wait for redis nor are affected by its failures. Listeners of this
+        process are notified immediately if redis is not configured.
+        """
+        if self._redis is None:
+            self.published += 1
+            self._notify(str(case_id))
+            return
+        task = asyncio.create_task(self.publish(case_id))
+        self._publications.add(task)
+        task.add_done_callback(self._publications.discard)
+
+    async def _receive(self):
+        async with self._redis.pubsub() as pubsub:
+            await pubsub.subscribe(self.channel)
+            async for message in pubsub.listen():
+                if message["type"] == "message":
+                    self._notify(message["data"].decode())
+
+    async def receive_continuously(self):
+        while True:
+            try:
+                await self._receive()
+            except (aioredis.RedisError, OSError) as e:
+                logger.warning(f"Could not receive case data events: {e}")
+            await asyncio.sleep(self.reconnect_delay)
+
+    def start(self):
+        """Start receiving notifications published via redis."""
+        if self._redis is None:
+            return
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self.receive_continuously())
+
+    async def stop(self):
+        """Stop receiving notifications published via redis."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._publications:
+            await asyncio.gather(*self._publications, return_exceptions=True)
+        if self._redis is not None:
+            await self._redis.aclose()
+
+    def stats(self) -> dict:
+        return {
+            "listeners": sum(map(len, self._listeners.values())),
+            "published": self.published,
+            "received": self.received,
+            "failed_publications": self.failed_publications
+        }
+
+
+case_data_events = CaseDataEvents()
@@ -3,10 +3,10 @@ from typing import Optional
 
 import pymongo
 from beanie import Document, after_event, Delete
-from beanie.odm.fields import ExpressionField
 from pydantic import BaseModel, Field, ConfigDict
 
 from .case import Case
+from .cascade import set_null
 
 
 class CustomerBase(BaseModel):
@@ -53,6 +53,4 @@ class Customer(CustomerBase, Document):
         Remove the customer_id foreign key from each case that points to the
         deleted customer.
         """
-        cases = await Case.find_in_hub(customer_id=str(self.id))
-        for case in cases:
-            await case.set({ExpressionField(Case.customer_id): None})
+        await set_null(Case, "customer_id", self.id)
@@ -3,9 +3,10 @@ from enum import Enum
 from typing import List, Optional
 from typing_extensions import Annotated
 
+import pymongo
 from beanie import Document, Indexed, PydanticObjectId
 from motor import motor_asyncio
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PositiveInt
 
 
 class Action(BaseModel):
@@ -51,63 +52,52 @@ class Diagnosis(Document):
 
     class Settings:
         name = "diagnosis"
+        indexes = [
+            # listing diagnoses of a workshop, optionally by status
+            [
+                ("workshop_id", pymongo.ASCENDING),
+                ("_id", pymongo.ASCENDING)
+            ],
+            [
+                ("workshop_id", pymongo.ASCENDING),
+                ("status", pymongo.ASCENDING),
+                ("_id", pymongo.ASCENDING)
+            ]
+        ]
 
     timestamp: datetime = Field(default_factory=lambda: datetime.now(UTC))
     status: Optional[DiagnosisStatus] = None
     state_machine_log: List[DiagnosisLogEntry] = []
     case_id: Annotated[PydanticObjectId, Indexed(unique=True)]
+    # workshop of the case, stored with the diagnosis to list diagnoses of a
+    # workshop without joining the cases
+    workshop_id: Optional[str] = None
     todos: List[Action] = []
 
     @classmethod
     async def find_in_hub(
             cls,
-            workshop_id: Optional[str] = None,
-            status: Optional[DiagnosisStatus] = None
+            workshop_id: str,
+            status: Optional[DiagnosisStatus] = None,
+            limit: Optional[PositiveInt] = None,
+            after: Optional[str] = None
     ) -> List["Diagnosis"]:
         """
         Get list of all diagnoses of a workshop, optionally filtered by status.
-        """
-        pipeline = [
-            # Lookup case in cases collection restricted to workshop
-            {
-                "$lookup": {
-                    "from": "cases",
-                    "localField": "case_id",
-                    "foreignField": "_id",
-                    "as": "case",
-                    "pipeline": [
-                        {"$match": {"workshop_id": workshop_id}},
-                        {"$project": {"_id": 1}}
-                    ]
-                }
-            },
-            # Indicate if a diagnosis has a matching case
-            {
-                "$addFields": {
-                    "case_found": {
-                        "$size": "$case"
-                    }
-                }
-            },
-            # Only keep diagnoses with matching case
-            {
-                "$match": {
-                    "case_found": 1
-                }
-            },
-            # Remove leftovers from lookup to recover plain diagnosis schema
-            {
-                "$project": {
-                    "case": 0,
-                    "case_found": 0
-                }
-            }
-        ]
 
+        Results can be paginated via `limit` and `after`. Paginated results
+        are ordered by id, `after` is the id of the last diagnosis of the
+        previous page.
+        """
+        filter = {"workshop_id": workshop_id}
         if status is not None:
-            # Only keep results with specified status
-            pipeline.append({"$match": {"status": status}})
-
-        return await cls.aggregate(
-            pipeline, projection_model=Diagnosis
-        ).to_list()
+            filter["status"] = status
+        if after is not None:
+            filter["_id"] = {"$gt": PydanticObjectId(after)}
+
+        query = cls.find(filter)
+        if limit is not None or after is not None:
+            query = query.sort("_id")
+        if limit is not None:
+            query = query.limit(limit)
+        return await query.to_list()
@@ -0,0 +1,57 @@
+"""
+Migrations of stored documents to the current schemas. All migrations are
+idempotent and run on startup of the api.
+"""
+import logging
+
+from pymongo import UpdateOne
+
+from .case import Case
+from .diagnosis import Diagnosis
+
+logger = logging.getLogger(__name__)
+
+
+async def set_diagnosis_workshop_ids(batch_size: int = 1000) -> int:
+    """
+    Store the workshop_id of the case with each diagnosis created before
+    the workshop_id was part of the diagnosis. Returns the number of
+    migrated diagnoses.
+    """
+    diagnoses = Diagnosis.get_motor_collection()
+    migrated = 0
+    last_id = None
+    while True:
+        query = {"workshop_id": None}
+        if last_id is not None:
+            query["_id"] = {"$gt": last_id}
+        batch = await diagnoses.find(
+            query, projection={"case_id": 1}
+        ).sort("_id", 1).limit(batch_size).to_list(None)
+        if not batch:
+            break
+        last_id = batch[-1]["_id"]
+        cases = await Case.get_motor_collection().find(
+            {"_id": {"$in": [diag["case_id"] for diag in batch]}},
+            projection={"workshop_id": 1}
+        ).to_list(None)
+        workshop_ids = {case["_id"]: case["workshop_id"] for case in cases}
+        # Diagnoses without case are kept as they are. They are not listed
+        # for any workshop.
+        updates = [
+            UpdateOne(
+                {"_id": diag["_id"], "workshop_id": None},
+                {"$set": {"workshop_id": workshop_ids[diag["case_id"]]}}
+            )
+            for diag in batch if diag["case_id"] in workshop_ids
+        ]
+        if updates:
+            result = await diagnoses.bulk_write(updates, ordered=False)
+            migrated += result.modified_count
+    if migrated:
+        logger.info(f"Stored workshop_id with {migrated} diagnoses.")
+    return migrated
+
+
+async def run_migrations():
+    await set_diagnosis_workshop_ids()
@@ -0,0 +1,181 @@
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta, UTC
+from typing import Dict, List, Optional, Tuple, Type
+
+from beanie import Document
+from motor import motor_asyncio
+
+from .case import Case
+from .diagnosis import Diagnosis
+from .timeseries_upload import TimeseriesUpload
+
+logger = logging.getLogger(__name__)
+
+# GridFS buckets and the document fields referencing their files
+REFERENCES: Dict[str, List[Tuple[Type[Document], str]]] = {
+    "signals": [
+        (Case, "timeseries_data.signal_id"),
+        (Case, "timeseries_data.signal_levels.signal_id")
+    ],
+    "attachments": [
+        (Diagnosis, "state_machine_log.attachment")
+    ],
+    # chunks of expired uploads
+    "uploads": [
+        (TimeseriesUpload, "chunks.file_id")
+    ]
+}
+
+
+class OrphanCollector:
+    """
+    Reclaims GridFS files that are not referenced by any document anymore,
+    e.g. signals of deleted cases whose deletion failed.
+
+    Files are checked in batches of batch_size. Files younger than min_age
+    seconds are skipped, as files are stored before the referencing
+    document is updated.
+    """
+
+    def __init__(
+            self,
+            interval: float = 3600.,
+            batch_size: int = 1000,
+            min_age: float = 3600.
+    ):
+        self.interval = interval
+        self.batch_size = batch_size
+        self.min_age = min_age
+        self.runs = 0
+        self.failed_runs = 0
+        self.last_run: Optional[datetime] = None
+        self.last_run_seconds = 0.
+        self.reclaimed = {bucket_name: 0 for bucket_name in REFERENCES}
+        self._db: Optional[motor_asyncio.AsyncIOMotorDatabase] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def configure(
+            self,
+            db: motor_asyncio.AsyncIOMotorDatabase,
+            interval: float,
+            batch_size: int,
+            min_age: float
+    ):
+        self._db = db
+        self.interval = interval
+        self.batch_size = batch_size
+        self.min_age = min_age
+
+    async def _referenced(self, bucket_name: str, ids: list) -> set:
+        """Get the subset of file ids that are referenced."""
+        referenced = set()
+        for model, field in REFERENCES[bucket_name]:
+            referenced.update(
+                await model.get_motor_collection().distinct(
+                    field, {field: {"$in": ids}}
+                )
+            )
+        return referenced
+
+    async def _reclaim(self, bucket_name: str, ids: list):
+        # Chunks are deleted first. If deleting the files fails, they are
+        # found again in the next run.
+        await self._db[f"{bucket_name}.chunks"].delete_many(
+            {"files_id": {"$in": ids}}
+        )
+        await self._db[f"{bucket_name}.files"].delete_many(
+            {"_id": {"$in": ids}}
+        )
+
+    async def collect_bucket(self, bucket_name: str) -> int:
+        """
+        Reclaim all orphaned files of a bucket. Returns the number of
+        reclaimed files.
+        """
+        if self._db is None:
+            raise AttributeError("No database configured to collect orphans")
+        uploaded_before = datetime.now(UTC) - timedelta(seconds=self.min_age)
+        files = self._db[f"{bucket_name}.files"]
+        reclaimed = 0
+        last_id = None
+        while True:
+            query = {"uploadDate": {"$lt": uploaded_before}}
+            if last_id is not None:
+                query["_id"] = {"$gt": last_id}
+            batch = await files.find(
+                query, projection={"_id": 1}
+            ).sort("_id", 1).limit(self.batch_size).to_list(None)
+            if not batch:
+                break
+            ids = [file["_id"] for file in batch]
+            last_id = ids[-1]
+            referenced = await self._referenced(bucket_name, ids)
+            orphans = [id for id in ids if id not in referenced]
+            if orphans:
+                await self._reclaim(bucket_name, orphans)
+                reclaimed += len(orphans)
+                self.reclaimed[bucket_name] += len(orphans)
+        return reclaimed
+
+    async def collect(self) -> Dict[str, int]:
+        """
+        Reclaim orphaned files of all buckets. Returns the number of reclaimed
+        files by bucket.
+        """
+        start = time.perf_counter()
+        try:
+            result = {
+                bucket_name: await self.collect_bucket(bucket_name)
+                for bucket_name in REFERENCES
+            }
+        except Exception:
+            self.failed_runs += 1
+            raise
+        finally:
+            self.runs += 1
+            self.last_run = datetime.now(UTC)
+            self.last_run_seconds = time.perf_counter() - start
+        if any(result.values()):
+            logger.info(f"Reclaimed orphaned files: {result}")
+        return result
+
+    async def collect_periodically(self):
+        while True:
+            try:
+                await self.collect()
+            except Exception as e:
+                logger.warning(f"Could not collect orphaned files: {e}")
+            await asyncio.sleep(self.interval)
+
+    def start(self):
+        """Start collecting orphaned files in the background."""
+        if self.interval <= 0:
+            return
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self.collect_periodically())
+
+    async def stop(self):
+        """Stop collecting orphaned files in the background."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def stats(self) -> dict:
+        return {
+            "interval": self.interval,
+            "runs": self.runs,
+            "failed_runs": self.failed_runs,
+            "last_run": self.last_run,
+            "last_run_seconds": self.last_run_seconds,
+            "reclaimed": self.reclaimed
+        }
+
+
+orphan_collector = OrphanCollector()
@@ -0,0 +1,85 @@
+from typing import Tuple
+
+import numpy as np
+
+
+def min_max_envelope(
+        signal: np.ndarray, max_points: int
+) -> Tuple[np.ndarray, int]:
+    """
+    Reduce a signal to at most max_points values by splitting it into equally
+    sized buckets and keeping the minimum and maximum of each bucket in order
+    of occurrence. Signals with at most max_points values are returned as is.
+
+    Returns the envelope and the bucket size, e.g. each consecutive pair of
+    values in the envelope covers bucket size samples of the original signal.
+    """
+    length = signal.size
+    if length <= max_points:
+        return signal, 1
+    bucket_count = max(max_points // 2, 1)
+    bucket_size = -(-length // bucket_count)
+    bucket_count = -(-length // bucket_size)
+    # Repeating the last value does not change min or max of the last bucket
+    padded = np.pad(signal, (0, bucket_count * bucket_size - length), "edge")
+    buckets = padded.reshape(bucket_count, bucket_size)
+    rows = np.arange(bucket_count)
+    idx_min = buckets.argmin(axis=1)
+    idx_max = buckets.argmax(axis=1)
+    mins = buckets[rows, idx_min]
+    maxs = buckets[rows, idx_max]
+    min_first = idx_min <= idx_max
+    envelope = np.empty((bucket_count, 2), dtype=signal.dtype)
+    envelope[:, 0] = np.where(min_first, mins, maxs)
+    envelope[:, 1] = np.where(min_first, maxs, mins)
+    return envelope.ravel(), bucket_size
+
+
+def decimate(signal: np.ndarray, factor: int) -> np.ndarray:
+    """
+    Decimate a signal by factor. Returns an array with shape (n, 3) holding
+    minimum, maximum and mean of each block of factor consecutive samples.
+    The last block may hold less samples.
+    """
+    full_blocks = signal.size // factor
+    blocks = signal[:full_blocks * factor].reshape(full_blocks, factor)
+    level = np.column_stack(
+        [blocks.min(axis=1), blocks.max(axis=1), blocks.mean(axis=1)]
+    )
+    remainder = signal[full_blocks * factor:]
+    if remainder.size:
+        level = np.vstack(
+            [level, [remainder.min(), remainder.max(), remainder.mean()]]
+        )
+    return level
+
+
+def level_envelope(
+        level: np.ndarray, max_points: int
+) -> Tuple[np.ndarray, int]:
+    """
+    Compute a min/max envelope with at most max_points values from a
+    decimation level as returned by `decimate`.
+
+    Returns the envelope and the number of level values per bucket.
+    """
+    mins, maxs = level[:, 0], level[:, 1]
+    length = mins.size
+    bucket_count = max(max_points // 2, 1)
+    bucket_size = max(-(-length // bucket_count), 1)
+    bucket_count = -(-length // bucket_size)
+    padding = (0, bucket_count * bucket_size - length)
+    mins = np.pad(mins, padding, "edge").reshape(bucket_count, bucket_size)
+    maxs = np.pad(maxs, padding, "edge").reshape(bucket_count, bucket_size)
+    idx_min = mins.argmin(axis=1)
+    idx_max = maxs.argmax(axis=1)
+    rows = np.arange(bucket_count)
+    bucket_mins = mins[rows, idx_min]
+    bucket_maxs = maxs[rows, idx_max]
+    # Position of extrema within a level value is unknown. Order by level
+    # value and put minimum first for ties.
+    min_first = idx_min <= idx_max
+    envelope = np.empty((bucket_count, 2), dtype=level.dtype)
+    envelope[:, 0] = np.where(min_first, bucket_mins, bucket_maxs)
+    envelope[:, 1] = np.where(min_first, bucket_maxs, bucket_mins)
+    return envelope.ravel(), bucket_size
@@ -0,0 +1,201 @@
+"""
+Versioned binary storage format for timeseries signals.
+
+Signals are stored as a sequence of independently encoded chunks. Each chunk
+holds `chunk_length` samples (the last one possibly less) that are
+
+1. quantised to the storage dtype (optionally using `scale` and `offset`),
+2. delta encoded (integer dtypes only),
+3. byte shuffled and
+4. compressed.
+
+The `SignalFormat` header holds everything needed to decode the chunks and is
+stored next to the encoded bytes, e.g. as GridFS file metadata. Signals
+without such a header are plain float64 bytes as written by earlier versions
+of the hub.
+"""
+import zlib
+from enum import Enum
+from typing import List, Literal, Tuple, Iterator
+
+import numpy as np
+from pydantic import BaseModel, NonNegativeInt, PositiveInt
+
+# Dtype of decoded signals and of signals without format header
+SIGNAL_DTYPE = "<f8"
+
+# Current version of the storage format
+SIGNAL_FORMAT_VERSION = 1
+
+# Default number of samples per encoded chunk
+DEFAULT_CHUNK_LENGTH = 2**16
+
+# Range of quantised int16 values. -32768 is left out to keep the range
+# symmetric around the offset.
+_INT16_MAX = 32767
+
+_ZLIB_LEVEL = 6
+
+
+class SignalStorageDtype(str, Enum):
+    """Dtypes a signal can be stored with."""
+    float64 = "float64"
+    float32 = "float32"
+    int16 = "int16"
+
+    @property
+    def numpy_dtype(self) -> np.dtype:
+        return np.dtype({
+            "float64": "<f8", "float32": "<f4", "int16": "<i2"
+        }[self.value])
+
+
+class SignalCompression(str, Enum):
+    """Compression applied to encoded signal chunks."""
+    none = "none"
+    zlib = "zlib"
+
+
+class SignalFormat(BaseModel):
+    """Header describing how a signal is encoded."""
+
+    format_version: Literal[1] = SIGNAL_FORMAT_VERSION
+    dtype: SignalStorageDtype
+    # decoded = stored * scale + offset
+    scale: float = 1.0
+    offset: float = 0.0
+    length: NonNegativeInt
+    compression: SignalCompression = SignalCompression.none
+    shuffle: bool = False
+    delta: bool = False
+    chunk_length: PositiveInt = DEFAULT_CHUNK_LENGTH
+    # byte size of each encoded chunk
+    chunk_sizes: List[NonNegativeInt] = []
+
+    @property
+    def chunk_count(self) -> int:
+        return len(self.chunk_sizes)
+
+    def chunk_sample_count(self, chunk_idx: int) -> int:
+        """Number of samples in the chunk with index chunk_idx."""
+        start = chunk_idx * self.chunk_length
+        return min(self.chunk_length, self.length - start)
+
+
+def _quantise(
+        signal: np.ndarray, dtype: SignalStorageDtype
+) -> Tuple[np.ndarray, float, float]:
+    """Convert signal to the storage dtype. Returns values, scale, offset."""
+    if dtype != SignalStorageDtype.int16:
+        return signal.astype(dtype.numpy_dtype, copy=False), 1.0, 0.0
+    if signal.size == 0:
+        return signal.astype(dtype.numpy_dtype), 1.0, 0.0
+    low, high = float(signal.min()), float(signal.max())
+    offset = (high + low) / 2
+    scale = (high - low) / (2 * _INT16_MAX) or 1.0
+    quantised = np.rint((signal - offset) / scale)
+    np.clip(quantised, -_INT16_MAX, _INT16_MAX, out=quantised)
+    return quantised.astype(dtype.numpy_dtype), scale, offset
+
+
+def _shuffle(values: np.ndarray) -> bytes:
+    """Group the i-th bytes of all values together."""
+    itemsize = values.dtype.itemsize
+    return values.view(np.uint8).reshape(-1, itemsize).T.tobytes()
+
+
+def _unshuffle(data: bytes, dtype: np.dtype) -> np.ndarray:
+    raw = np.frombuffer(data, dtype=np.uint8)
+    return raw.reshape(dtype.itemsize, -1).T.copy().view(dtype).ravel()
+
+
+def encode_signal(
+        signal,
+        dtype: SignalStorageDtype = SignalStorageDtype.float64,
+        compression: SignalCompression = SignalCompression.zlib,
+        chunk_length: int = DEFAULT_CHUNK_LENGTH
+) -> Tuple[SignalFormat, List[bytes]]:
+    """
+    Encode a signal. Returns the format header and the encoded chunks.
+
+    Signals with non-finite values can not be quantised to int16 and are
+    stored as float64 instead.
+    """
+    signal = np.asarray(signal, dtype=SIGNAL_DTYPE).ravel()
+    if dtype == SignalStorageDtype.int16 and not np.isfinite(signal).all():
+        dtype = SignalStorageDtype.float64
+    values, scale, offset = _quantise(signal, dtype)
+    compressed = compression != SignalCompression.none
+    delta = dtype == SignalStorageDtype.int16
+    chunks = []
+    for start in range(0, values.size, chunk_length):
+        chunk = values[start:start + chunk_length]
+        if delta:
+            # int16 arithmetic wraps around, so this is lossless
+            chunk = np.concatenate([chunk[:1], np.diff(chunk)])
+        chunk_bytes = _shuffle(chunk) if compressed else chunk.tobytes()
+        if compressed:
+            chunk_bytes = zlib.compress(chunk_bytes, _ZLIB_LEVEL)
+        chunks.append(chunk_bytes)
+    signal_format = SignalFormat(
+        dtype=dtype,
+        scale=scale,
+        offset=offset,
+        length=values.size,
+        compression=compression,
+        shuffle=compressed,
+        delta=delta,
+        chunk_length=chunk_length,
+        chunk_sizes=[len(c) for c in chunks]
+    )
+    return signal_format, chunks
+
+
+def decode_chunk(signal_format: SignalFormat, data: bytes) -> np.ndarray:
+    """Decode a single encoded chunk to float64 values."""
+    dtype = signal_format.dtype.numpy_dtype
+    if signal_format.compression == SignalCompression.zlib:
+        data = zlib.decompress(data)
+    if signal_format.shuffle:
+        values = _unshuffle(data, dtype)
+    else:
+        values = np.frombuffer(data, dtype=dtype)
+    if signal_format.delta:
+        values = np.cumsum(values, dtype=dtype)
+    if signal_format.dtype == SignalStorageDtype.int16:
+        return values * signal_format.scale + signal_format.offset
+    return values.astype(SIGNAL_DTYPE, copy=False)
+
+
+def iter_encoded_chunks(
+        chunk_sizes: List[int], data: bytes
+) -> Iterator[bytes]:
+    """Split concatenated encoded chunks with the given byte sizes."""
+    position = 0
+    for size in chunk_sizes:
+        yield data[position:position + size]
+        position += size
+
+
+def decode_signal(signal_format: SignalFormat, data: bytes) -> np.ndarray:
+    """Decode concatenated encoded chunks to float64 values."""
+    if signal_format.length == 0:
+        return np.empty(0, dtype=SIGNAL_DTYPE)
+    return np.concatenate([
+        decode_chunk(signal_format, chunk)
+        for chunk in iter_encoded_chunks(signal_format.chunk_sizes, data)
+    ])
+
+
+def chunk_span(
+        signal_format: SignalFormat, start: int, stop: int
+) -> Tuple[int, List[int], int]:
+    """
+    Determine which encoded chunks hold the samples in [start, stop).
+    Returns the index of the first chunk, the byte sizes of all required
+    chunks and the byte position of the first chunk.
+    """
+    first = start // signal_format.chunk_length
+    last = (stop - 1) // signal_format.chunk_length
+    position = sum(signal_format.chunk_sizes[:first])
+    return first, signal_format.chunk_sizes[first:last + 1], position
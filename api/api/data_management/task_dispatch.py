@@ -0,0 +1,34 @@
+from datetime import datetime, UTC
+from typing import Optional
+
+import pymongo
+from beanie import Document, PydanticObjectId
+from pydantic import Field
+
+
+class TaskDispatch(Document):
+    """
+    Pending hand over of a diagnosis to the diagnostics service. Records are
+    deleted once the task is published to the broker.
+    """
+
+    class Settings:
+        name = "task_dispatches"
+        indexes = [
+            # fetching due dispatches in order of creation
+            [
+                ("next_attempt", pymongo.ASCENDING),
+                ("created", pymongo.ASCENDING)
+            ],
+            "claim"
+        ]
+
+    task_name: str
+    diagnosis_id: PydanticObjectId
+    created: datetime = Field(default_factory=lambda: datetime.now(UTC))
+    # Time from which on the dispatch may be attempted (again)
+    next_attempt: datetime = Field(default_factory=lambda: datetime.now(UTC))
+    attempts: int = 0
+    last_error: Optional[str] = None
+    # Set by the dispatcher attempting the dispatch
+    claim: Optional[str] = None
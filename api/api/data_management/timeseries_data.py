@@ -1,7 +1,11 @@
+import asyncio
 from abc import ABC
+from array import array
 from datetime import datetime, UTC
 from enum import Enum
-from typing import List, ClassVar, Literal, Optional, Any
+from typing import (
+    List, ClassVar, Literal, Optional, Any, AsyncIterator, Tuple, Annotated
+)
 
 import numpy as np
 from beanie import PydanticObjectId
@@ -10,14 +14,37 @@ from pydantic import (
     BaseModel,
     Field,
     NonNegativeInt,
-    ConfigDict
+    ConfigDict,
+    PositiveInt,
+    ValidatorFunctionWrapHandler,
+    WrapValidator
+)
+
+from .signal_encoding import (
+    SIGNAL_DTYPE,
+    SIGNAL_FORMAT_VERSION,
+    DEFAULT_CHUNK_LENGTH,
+    SignalCompression,
+    SignalFormat,
+    SignalStorageDtype,
+    chunk_span,
+    decode_chunk,
+    decode_signal,
+    encode_signal,
+    iter_encoded_chunks
 )
+from .signal_decimation import decimate, level_envelope, min_max_envelope
+
+# Signal data that can be stored. Besides lists of floats, float64 buffers,
+# i.e. array('d') or numpy arrays, are accepted to avoid holding a Python
+# float object per sample.
+SignalData = List[float] | array | np.ndarray
 
 
 class BaseSignalStore(ABC):
     """Interface definition for a signal store."""
 
-    async def create(self, signal: List[float]) -> Any:
+    async def create(self, signal: SignalData) -> Any:
         """Store the signal and return the storage id."""
         del signal
         raise NotImplementedError
@@ -27,6 +54,29 @@ class BaseSignalStore(ABC):
         del id
         raise NotImplementedError
 
+    async def get_range(
+            self,
+            id: Any,
+            start: Optional[int] = None,
+            stop: Optional[int] = None,
+            step: Optional[int] = None
+    ) -> np.ndarray:
+        """
+        Get the section signal[start:stop:step] of a signal by storage id.
+        Only the required part of the signal should be loaded.
+        """
+        del id, start, stop, step
+        raise NotImplementedError
+
+    async def stream(self, id: Any) -> Tuple[int, AsyncIterator[bytes]]:
+        """
+        Stream a signal by storage id. Returns the number of samples and an
+        async iterator over the signal's binary representation (see
+        SIGNAL_DTYPE).
+        """
+        del id
+        raise NotImplementedError
+
     async def delete(self, id: Any):
         """Delete a signal by storage id."""
         del id
@@ -34,24 +84,120 @@ class BaseSignalStore(ABC):
 
 
 class GridFSSignalStore(BaseSignalStore):
-    """MongoDB GridFS based signal store."""
-
-    def __init__(self, bucket: motor_asyncio.AsyncIOMotorGridFSBucket):
+    """
+    MongoDB GridFS based signal store.
+
+    New signals are stored in the format described in `signal_encoding`
+    with the format header as GridFS file metadata. Signals stored as plain
+    float64 bytes without such metadata are still supported.
+    """
+
+    def __init__(
+            self,
+            bucket: motor_asyncio.AsyncIOMotorGridFSBucket,
+            dtype: SignalStorageDtype = SignalStorageDtype.float64,
+            compression: SignalCompression = SignalCompression.none,
+            chunk_length: int = DEFAULT_CHUNK_LENGTH
+    ):
         self._bucket = bucket
-
-    async def create(self, signal: List[float]) -> Any:
-        signal_bytes = np.array(signal).tobytes()
+        self._dtype = SignalStorageDtype(dtype)
+        self._compression = SignalCompression(compression)
+        self._chunk_length = chunk_length
+
+    async def create(self, signal: SignalData) -> Any:
+        signal_format, chunks = encode_signal(
+            signal,
+            dtype=self._dtype,
+            compression=self._compression,
+            chunk_length=self._chunk_length
+        )
         id = await self._bucket.upload_from_stream(
             filename="",
-            source=signal_bytes
+            source=b"".join(chunks),
+            metadata=signal_format.model_dump(mode="json")
         )
         return id
 
+    @staticmethod
+    def _signal_format(grid_out) -> SignalFormat | None:
+        """Get the format header of a stored signal, if there is any."""
+        metadata = grid_out.metadata or {}
+        if metadata.get("format_version") != SIGNAL_FORMAT_VERSION:
+            # Legacy signal stored as plain float64 bytes
+            return None
+        return SignalFormat(**metadata)
+
     async def get(self, id: Any) -> List[float]:
         grid_out = await self._bucket.open_download_stream(id)
+        signal_format = self._signal_format(grid_out)
         signal_bytes = await grid_out.read()
-        signal = np.frombuffer(signal_bytes, dtype=float).tolist()
-        return signal
+        if signal_format is None:
+            signal = np.frombuffer(signal_bytes, dtype=SIGNAL_DTYPE)
+        else:
+            signal = decode_signal(signal_format, signal_bytes)
+        return signal.tolist()
+
+    async def get_range(
+            self,
+            id: Any,
+            start: Optional[int] = None,
+            stop: Optional[int] = None,
+            step: Optional[int] = None
+    ) -> np.ndarray:
+        grid_out = await self._bucket.open_download_stream(id)
+        signal_format = self._signal_format(grid_out)
+
+        if signal_format is None:
+            itemsize = np.dtype(SIGNAL_DTYPE).itemsize
+            length = grid_out.length // itemsize
+            start, stop, step = slice(start, stop, step).indices(length)
+            if start >= stop:
+                return np.empty(0, dtype=SIGNAL_DTYPE)
+            # Seeking makes GridFS fetch only the chunks holding the range
+            grid_out.seek(start * itemsize)
+            signal_bytes = await grid_out.read((stop - start) * itemsize)
+            return np.frombuffer(signal_bytes, dtype=SIGNAL_DTYPE)[::step]
+
+        start, stop, step = slice(start, stop, step).indices(
+            signal_format.length
+        )
+        if start >= stop:
+            return np.empty(0, dtype=SIGNAL_DTYPE)
+        # Only read and decode the encoded chunks holding the range
+        first_chunk, chunk_sizes, position = chunk_span(
+            signal_format, start, stop
+        )
+        grid_out.seek(position)
+        signal_bytes = await grid_out.read(sum(chunk_sizes))
+        signal = np.concatenate([
+            decode_chunk(signal_format, chunk)
+            for chunk in iter_encoded_chunks(chunk_sizes, signal_bytes)
+        ])
+        offset = first_chunk * signal_format.chunk_length
+        return signal[start - offset:stop - offset:step]
+
+    async def stream(self, id: Any) -> Tuple[int, AsyncIterator[bytes]]:
+        grid_out = await self._bucket.open_download_stream(id)
+        signal_format = self._signal_format(grid_out)
+
+        if signal_format is None:
+            length = grid_out.length // np.dtype(SIGNAL_DTYPE).itemsize
+
+            async def iter_chunks():
+                # Read chunk by chunk, so that only a single GridFS chunk is
+                # held in memory at any time
+                while chunk := await grid_out.readchunk():
+                    yield chunk
+
+            return length, iter_chunks()
+
+        async def iter_decoded_chunks():
+            # Decode one encoded chunk at a time
+            for size in signal_format.chunk_sizes:
+                chunk = await grid_out.read(size)
+                yield decode_chunk(signal_format, chunk).tobytes()
+
+        return signal_format.length, iter_decoded_chunks()
 
     async def delete(self, id: Any):
         await self._bucket.delete(id)
@@ -82,6 +228,9 @@ class TimeseriesMetaData(BaseModel):
     # references in subclasses
     signal_store: ClassVar[BaseSignalStore]
 
+    # decimation factors of the signal levels stored next to new signals
+    signal_level_factors: ClassVar[Tuple[int, ...]] = (10, 100, 1000)
+
 
 class TimeseriesDataUpdate(BaseModel):
     """Schema for updating timeseries meta data."""
@@ -103,6 +252,17 @@ class TimeseriesDataUpdate(BaseModel):
     device_specs: Optional[dict] = None
 
 
+class SignalLevel(BaseModel):
+    """
+    Reference to a stored decimation level of a signal. The stored level
+    signal holds minimum, maximum and mean of each block of `factor`
+    consecutive samples of the original signal, e.g. `length` blocks.
+    """
+    factor: PositiveInt
+    length: NonNegativeInt
+    signal_id: PydanticObjectId
+
+
 class TimeseriesData(TimeseriesMetaData):
     """Schema for existing timeseries data."""
 
@@ -130,13 +290,131 @@ class TimeseriesData(TimeseriesMetaData):
     # Ref to signal data instead of actual data
     signal_id: PydanticObjectId
 
+    # Refs to decimation levels of the signal data, sorted by factor
+    signal_levels: List[SignalLevel] = []
+
     async def get_signal(self):
         """Fetches the actual signal data on demand."""
         return await self.signal_store.get(self.signal_id)
 
+    async def get_signal_range(
+            self,
+            start: Optional[int] = None,
+            stop: Optional[int] = None,
+            step: Optional[int] = None,
+            max_points: Optional[int] = None
+    ) -> Tuple[np.ndarray, float]:
+        """
+        Fetch the section signal[start:stop:step] of the signal data. If
+        max_points is specified, longer sections are reduced to a min/max
+        envelope with at most max_points values.
+
+        Returns the values and the distance of consecutive values in samples
+        of the original signal.
+        """
+        if max_points is not None and step is None:
+            level = self._level_for_envelope(start, stop, max_points)
+            if level is not None:
+                return await self._get_level_envelope(
+                    level, start, stop, max_points
+                )
+        signal = await self.signal_store.get_range(
+            self.signal_id, start=start, stop=stop, step=step
+        )
+        sample_distance = float(step or 1)
+        if max_points is not None:
+            signal, bucket_size = min_max_envelope(signal, max_points)
+            if bucket_size > 1:
+                # Two values per bucket
+                sample_distance *= bucket_size / 2
+        return signal, sample_distance
+
+    async def get_signal_level(
+            self,
+            factor: int,
+            start: Optional[int] = None,
+            stop: Optional[int] = None
+    ) -> np.ndarray | None:
+        """
+        Fetch the decimation level with the specified factor as array with
+        columns minimum, maximum and mean. start and stop refer to blocks of
+        the level. None is returned, if the level does not exist.
+        """
+        for level in self.signal_levels:
+            if level.factor == factor:
+                start, stop, _ = slice(start, stop).indices(level.length)
+                values = await self.signal_store.get_range(
+                    level.signal_id, start=3 * start, stop=3 * stop
+                )
+                return values.reshape(-1, 3)
+        return None
+
+    def _level_for_envelope(
+            self, start: Optional[int], stop: Optional[int], max_points: int
+    ) -> SignalLevel | None:
+        """Find the coarsest level sufficient for the requested envelope."""
+        if not self.signal_levels:
+            return None
+        finest_level = self.signal_levels[0]
+        # Approximation with an error below the factor of the finest level
+        signal_length = finest_level.length * finest_level.factor
+        start, stop, _ = slice(start, stop).indices(signal_length)
+        bucket_size = -(-(stop - start) // max(max_points // 2, 1))
+        suitable_levels = [
+            level for level in self.signal_levels
+            if level.factor <= bucket_size
+        ]
+        return suitable_levels[-1] if suitable_levels else None
+
+    async def _get_level_envelope(
+            self,
+            level: SignalLevel,
+            start: Optional[int],
+            stop: Optional[int],
+            max_points: int
+    ) -> Tuple[np.ndarray, float]:
+        level_start = None if start is None else start // level.factor
+        level_stop = None if stop is None else -(-stop // level.factor)
+        values = await self.get_signal_level(
+            level.factor, start=level_start, stop=level_stop
+        )
+        envelope, bucket_size = level_envelope(values, max_points)
+        return envelope, bucket_size * level.factor / 2
+
+    async def stream_signal(self) -> Tuple[int, AsyncIterator[bytes]]:
+        """
+        Stream the binary signal data. Returns the number of samples and an
+        async iterator over the raw bytes.
+        """
+        return await self.signal_store.stream(self.signal_id)
+
     async def delete_signal(self):
-        """Delete the actual signal data."""
+        """Delete the actual signal data including all decimation levels."""
         await self.signal_store.delete(self.signal_id)
+        for level in self.signal_levels:
+            await self.signal_store.delete(level.signal_id)
+
+
+def _keep_signal_buffer(value: Any, handler: ValidatorFunctionWrapHandler):
+    """
+    Float64 buffers as created by the streaming file readers are kept as they
+    are instead of being converted to a list with a Python float per sample.
+    Numpy arrays with real numeric dtype are converted to contiguous 1-D
+    float64 arrays, which only copies the data if the dtype differs.
+    """
+    if isinstance(value, array) and value.typecode == "d":
+        return value
+    if isinstance(value, np.ndarray):
+        if value.dtype.kind not in "fiu":
+            raise ValueError(
+                f"Expected a real numeric array but got dtype {value.dtype}."
+            )
+        return np.ascontiguousarray(value.ravel(), dtype=SIGNAL_DTYPE)
+    return handler(value)
+
+
+# Signal of new timeseries data. Either a list of floats or a float64 buffer
+Signal = Annotated[List[float], WrapValidator(_keep_signal_buffer)]
 
 
 class NewTimeseriesData(TimeseriesMetaData):
@@ -155,7 +433,7 @@ class NewTimeseriesData(TimeseriesMetaData):
         }
     )
 
-    signal: List[float]
+    signal: Signal
 
     async def to_timeseries_data(self) -> TimeseriesData:
         """
@@ -164,10 +442,51 @@ class NewTimeseriesData(TimeseriesMetaData):
         data.
         """
         signal_id = await self.signal_store.create(self.signal)
+        try:
+            signal_levels = await self._store_signal_levels()
+        except BaseException:
+            # nothing references the stored signal yet
+            await self.signal_store.delete(signal_id)
+            raise
         meta_data = self.model_dump(exclude={"signal"})
         meta_data["signal_id"] = signal_id
+        meta_data["signal_levels"] = signal_levels
         return TimeseriesData(**meta_data)
 
+    def _decimate_signal(self) -> List[Tuple[int, np.ndarray]]:
+        """
+        Decimate the signal by all configured factors that are smaller than
+        the signal length.
+        """
+        signal = np.asarray(self.signal, dtype=SIGNAL_DTYPE)
+        return [
+            (factor, decimate(signal, factor))
+            for factor in sorted(self.signal_level_factors)
+            if factor < signal.size
+        ]
+
+    async def _store_signal_levels(self) -> List[SignalLevel]:
+        """
+        Store decimation levels of the signal. If storing any of the levels
+        fails, the levels stored so far are deleted again.
+        """
+        # decimating long signals would block the event loop
+        decimated = await asyncio.to_thread(self._decimate_signal)
+        levels = []
+        try:
+            for factor, level in decimated:
+                level_id = await self.signal_store.create(level.ravel())
+                levels.append(
+                    SignalLevel(
+                        factor=factor, length=len(level), signal_id=level_id
+                    )
+                )
+        except BaseException:
+            for level in levels:
+                await self.signal_store.delete(level.signal_id)
+            raise
+        return levels
+
 
 class TimeseriesDataFull(TimeseriesData):
     signal: List[float]
@@ -0,0 +1,243 @@
+import asyncio
+import tempfile
+from datetime import datetime, UTC
+from typing import (
+    AsyncIterator, BinaryIO, ClassVar, Dict, List, Literal, Optional, Self
+)
+
+import pymongo
+from beanie import Document, PydanticObjectId
+from beanie.odm.utils.encoder import Encoder
+from gridfs.errors import NoFile
+from motor import motor_asyncio
+from pydantic import (
+    BaseModel, ConfigDict, Field, NonNegativeInt, PositiveInt, model_validator
+)
+from pymongo import ReturnDocument
+
+from .timeseries_data import TimeseriesDataLabel
+
+# Uploads are deleted once they were not active for this many seconds. The
+# stored chunks are reclaimed by the orphan collector afterwards.
+UPLOAD_EXPIRE_AFTER_SECONDS = 24 * 3600
+
+
+class UploadOffsetMismatch(Exception):
+    """Raised if a chunk does not start at the end of the received data."""
+
+    def __init__(self, expected_offset: int):
+        super().__init__(f"Expected chunk at offset {expected_offset}.")
+        self.expected_offset = expected_offset
+
+
+class UploadSizeExceeded(Exception):
+    """Raised if more data is sent than announced for an upload."""
+
+
+class ChannelDescription(BaseModel):
+    """Description of an oscilloscope channel to add to a case."""
+    component: str
+    label: TimeseriesDataLabel = TimeseriesDataLabel.unknown
+
+
+class NewTimeseriesUpload(BaseModel):
+    """Schema to start a chunked upload of a timeseries data file."""
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "file_format": "Picoscope MAT",
+                "filename": "capture.mat",
+                "size": 104857600,
+                "channels": {
+                    "A": {"component": "battery", "label": "unknown"}
+                }
+            }
+        }
+    )
+
+    file_format: Literal["Picoscope MAT", "Picoscope CSV", "Omniview CSV"]
+    filename: str = ""
+    size: PositiveInt = Field(description="Size of the file in bytes")
+    channels: Dict[str, ChannelDescription] = Field(
+        default={},
+        description="Picoscope uploads: Descriptions by channel name of the "
+                    "channels to add. Other channels are ignored."
+    )
+    component: Optional[str] = Field(
+        default=None,
+        description="Omniview uploads: The investigated vehicle component"
+    )
+    sampling_rate: Optional[NonNegativeInt] = Field(
+        default=None,
+        description="Omniview uploads: Sampling rate of measurement [Hz]"
+    )
+    duration: Optional[NonNegativeInt] = Field(
+        default=None,
+        description="Omniview uploads: Duration of measurement [s]"
+    )
+    label: TimeseriesDataLabel = Field(
+        default=TimeseriesDataLabel.unknown,
+        description="Omniview uploads: Label for the oscillogram"
+    )
+
+    @model_validator(mode="after")
+    def check_descriptions(self) -> Self:
+        if self.file_format == "Omniview CSV":
+            if None in (self.component, self.sampling_rate, self.duration):
+                raise ValueError(
+                    "component, sampling_rate and duration are required for "
+                    "Omniview uploads."
+                )
+        elif not self.channels:
+            raise ValueError(
+                "At least one channel needs to be described for Picoscope "
+                "uploads."
+            )
+        return self
+
+
+class UploadChunk(BaseModel):
+    """Reference to a stored chunk of an upload."""
+    offset: NonNegativeInt
+    length: NonNegativeInt
+    file_id: PydanticObjectId
+
+
+class TimeseriesUpload(NewTimeseriesUpload, Document):
+    """
+    Chunked upload of a timeseries data file. Chunks have to be sent in
+    order and are stored in a GridFS bucket until the upload is finalized.
+    An interrupted upload is resumed by sending the next chunk at offset
+    `received`. Abandoned uploads expire after UPLOAD_EXPIRE_AFTER_SECONDS.
+    """
+
+    class Settings:
+        name = "timeseries_uploads"
+        indexes = [
+            pymongo.IndexModel(
+                [("last_activity", pymongo.ASCENDING)],
+                expireAfterSeconds=UPLOAD_EXPIRE_AFTER_SECONDS
+            )
+        ]
+
+    workshop_id: str
+    case_id: PydanticObjectId
+    timestamp: datetime = Field(default_factory=lambda: datetime.now(UTC))
+    last_activity: datetime = Field(
+        default_factory=lambda: datetime.now(UTC)
+    )
+    state: Literal["open", "finalizing"] = "open"
+    received: NonNegativeInt = Field(
+        default=0, description="Number of bytes received in order"
+    )
+    chunks: List[UploadChunk] = []
+
+    # GridFS bucket to store the chunks
+    bucket: ClassVar[Optional[motor_asyncio.AsyncIOMotorGridFSBucket]] = None
+
+    @property
+    def complete(self) -> bool:
+        return self.received == self.size
+
+    async def add_chunk(
+            self, offset: NonNegativeInt, content: AsyncIterator[bytes]
+    ) -> Self:
+        """
+        Store the next chunk of the file. Content is written to GridFS
+        while it is received.
+        """
+        if offset != self.received:
+            raise UploadOffsetMismatch(self.received)
+        grid_in = self.bucket.open_upload_stream(
+            filename=self.filename,
+            metadata={"upload_id": self.id, "offset": offset}
+        )
+        length = 0
+        try:
+            async for data in content:
+                length += len(data)
+                if offset + length > self.size:
+                    raise UploadSizeExceeded(
+                        f"Upload is limited to {self.size} bytes."
+                    )
+                await grid_in.write(data)
+            await grid_in.close()
+        except BaseException:
+            await grid_in.abort()
+            raise
+
+        chunk = UploadChunk(offset=offset, length=length, file_id=grid_in._id)
+        # Only append the chunk if no other chunk was added meanwhile
+        updated = await self.get_motor_collection().find_one_and_update(
+            {"_id": self.id, "received": offset},
+            {
+                "$inc": {"received": length},
+                "$push": {"chunks": Encoder().encode(chunk)},
+                "$set": {"last_activity": datetime.now(UTC)}
+            },
+            return_document=ReturnDocument.AFTER
+        )
+        if updated is None:
+            await self.bucket.delete(chunk.file_id)
+            current = await self.get(self.id)
+            raise UploadOffsetMismatch(
+                current.received if current is not None else self.received
+            )
+        self.received = updated["received"]
+        self.chunks.append(chunk)
+        return self
+
+    async def start_finalization(self) -> bool:
+        """
+        Atomically claim the upload for finalization. Returns False if the
+        upload is already being finalized, e.g. by a concurrent request.
+        """
+        updated = await self.get_motor_collection().find_one_and_update(
+            {"_id": self.id, "state": {"$ne": "finalizing"}},
+            {"$set": {
+                "state": "finalizing", "last_activity": datetime.now(UTC)
+            }},
+            return_document=ReturnDocument.AFTER
+        )
+        if updated is None:
+            return False
+        self.state = "finalizing"
+        return True
+
+    async def cancel_finalization(self):
+        """Release the claim, such that finalization can be retried."""
+        await self.get_motor_collection().update_one(
+            {"_id": self.id}, {"$set": {"state": "open"}}
+        )
+        self.state = "open"
+
+    async def open_file(self) -> BinaryIO:
+        """
+        Assemble the received chunks to a temporary file on disk, which is
+        deleted when closed. Parse workers read the file from its path. The
+        writes are done in a thread to not block the event loop.
+        """
+        file = tempfile.NamedTemporaryFile(prefix="upload-")
+        try:
+            for chunk in sorted(self.chunks, key=lambda c: c.offset):
+                grid_out = await self.bucket.open_download_stream(
+                    chunk.file_id
+                )
+                while data := await grid_out.readchunk():
+                    await asyncio.to_thread(file.write, data)
+            await asyncio.to_thread(file.flush)
+        except BaseException:
+            file.close()
+            raise
+        file.seek(0)
+        return file
+
+    async def discard(self):
+        """Delete the upload including all stored chunks."""
+        for chunk in self.chunks:
+            try:
+                await self.bucket.delete(chunk.file_id)
+            except NoFile:
+                pass
+        await self.delete()
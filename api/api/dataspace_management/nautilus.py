@@ -1,25 +1,128 @@
-from typing import Optional, Tuple
+import asyncio
+import bisect
+import logging
+import time
+from typing import Dict, Optional, Tuple
 
 import httpx
 
 from ..data_management import Asset, Publication
 
+logger = logging.getLogger(__name__)
+
+# Upper bounds in seconds of the request latency histogram buckets
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1., 2.5, 5., 10., 30., 60., 120.)
+
+# Responses of failed requests that are retried if the request is idempotent
+RETRY_STATUS_CODES = {502, 503, 504}
+
+
+class LatencyHistogram:
+    """Histogram of request latencies with cumulative buckets."""
+
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.buckets = buckets
+        # the last count is for latencies exceeding all buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.
+        self.failed = 0
+
+    def observe(self, seconds: float, failed: bool = False):
+        self.counts[bisect.bisect_left(self.buckets, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+        if failed:
+            self.failed += 1
+
+    def stats(self) -> dict:
+        cumulative = 0
+        buckets = {}
+        for bound, count in zip(self.buckets + (float("inf"),), self.counts):
+            cumulative += count
+            buckets[str(bound) if bound != float("inf") else "+Inf"] = \
+                cumulative
+        return {
+            "count": self.count,
+            "failed": self.failed,
+            "sum_seconds": self.sum,
+            "buckets": buckets
+        }
+
 
 class Nautilus:
     _url: Optional[str] = None
     _timeout: Optional[int] = None  # Timeout for external requests to nautilus
     _api_key_assets: Optional[str] = None
 
+    # Connection pool shared by all requests to nautilus
+    _client: Optional[httpx.AsyncClient] = None
+    _limits: httpx.Limits = httpx.Limits(
+        max_connections=10, max_keepalive_connections=5, keepalive_expiry=30.
+    )
+    # Retries of idempotent requests with exponential backoff
+    _max_retries: int = 3
+    _retry_backoff: float = 0.5
+    _retries: int = 0
+    # Request latencies by nautilus endpoint
+    _latencies: Dict[str, LatencyHistogram] = {}
+
     def __init__(self):
         if not self._url:
             raise AttributeError("No Nautilus connection configured.")
 
     @classmethod
-    def configure(cls, url: str, timeout: int, api_key_assets: str):
+    def configure(
+            cls,
+            url: str,
+            timeout: int,
+            api_key_assets: str,
+            max_connections: int = 10,
+            max_keepalive_connections: int = 5,
+            keepalive_expiry: float = 30.,
+            max_retries: int = 3,
+            retry_backoff: float = 0.5
+    ):
         """Configure the nautilus connection details."""
         cls._url = url
         cls._timeout = timeout
         cls._api_key_assets = api_key_assets
+        cls._limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry
+        )
+        cls._max_retries = max_retries
+        cls._retry_backoff = retry_backoff
+
+    @classmethod
+    def open_client(cls, transport: Optional[httpx.AsyncBaseTransport] = None):
+        """
+        Create the client used for all requests to nautilus. Connections are
+        kept alive and reused until the client is closed.
+        """
+        cls._client = httpx.AsyncClient(
+            timeout=cls._timeout, limits=cls._limits, transport=transport
+        )
+
+    @classmethod
+    async def close_client(cls):
+        """Close the client and all pooled connections."""
+        if cls._client is not None:
+            await cls._client.aclose()
+            cls._client = None
+
+    @classmethod
+    def stats(cls) -> dict:
+        return {
+            "max_connections": cls._limits.max_connections,
+            "max_keepalive_connections": cls._limits.max_keepalive_connections,
+            "retries": cls._retries,
+            "latencies": {
+                endpoint: histogram.stats()
+                for endpoint, histogram in cls._latencies.items()
+            }
+        }
 
     @property
     def _publication_url(self):
@@ -29,25 +132,65 @@ class Nautilus:
     def _revocation_url(self):
         return "/".join([self._url, "revoke"])
 
+    async def _send(
+            self,
+            endpoint: str,
+            url: str,
+            headers: dict,
+            json_payload: Optional[dict]
+    ) -> httpx.Response:
+        """Send a POST request and record its latency for endpoint."""
+        if self._client is None:
+            self.open_client()
+        histogram = self._latencies.setdefault(endpoint, LatencyHistogram())
+        start = time.perf_counter()
+        failed = True
+        try:
+            response = await self._client.post(
+                url, json=json_payload, headers=headers
+            )
+            failed = response.is_error
+            return response
+        finally:
+            histogram.observe(time.perf_counter() - start, failed=failed)
+
     async def _post_request(
             self,
+            endpoint: str,
             url: str,
             headers: dict,
-            json_payload: Optional[dict] = None
+            json_payload: Optional[dict] = None,
+            idempotent: bool = False
     ) -> Tuple[Optional[httpx.Response], str]:
         """
         Helper method to perform a POST request with standard error handling.
+        Idempotent requests are retried with exponential backoff if the
+        connection fails or nautilus is unavailable.
         """
-        try:
-            response = await httpx.AsyncClient().post(
-                url, json=json_payload, headers=headers, timeout=self._timeout
-            )
-            response.raise_for_status()
-            return response, "success"
-        except httpx.TimeoutException:
-            return None, "Connection timeout."
-        except httpx.HTTPStatusError as e:
-            return None, e.response.text
+        max_retries = self._max_retries if idempotent else 0
+        for attempt in range(max_retries + 1):
+            if attempt > 0:
+                Nautilus._retries += 1
+                await asyncio.sleep(self._retry_backoff * 2 ** (attempt - 1))
+            try:
+                response = await self._send(
+                    endpoint, url, headers, json_payload
+                )
+                if response.status_code in RETRY_STATUS_CODES and \
+                        attempt < max_retries:
+                    continue
+                response.raise_for_status()
+                return response, "success"
+            except httpx.TimeoutException:
+                if attempt < max_retries:
+                    continue
+                return None, "Connection timeout."
+            except httpx.TransportError as e:
+                if attempt < max_retries:
+                    continue
+                return None, f"Connection failed: {e}"
+            except httpx.HTTPStatusError as e:
+                return None, e.response.text
 
     async def publish_access_dataset(
             self, asset: Asset, nautilus_private_key: str
@@ -75,6 +218,7 @@ class Nautilus:
         }
         # Attempt publication
         response, info = await self._post_request(
+            endpoint="publish",
             url="/".join(
                 [self._publication_url, asset.publication.network]
             ),
@@ -97,7 +241,10 @@ class Nautilus:
             [self._revocation_url, publication.network, publication.did]
         )
         response, info = await self._post_request(
-            url=url, headers={"priv_key": nautilus_private_key}
+            endpoint="revoke",
+            url=url,
+            headers={"priv_key": nautilus_private_key},
+            idempotent=True
         )
         if response is None:
             return False, info
@@ -1,9 +1,20 @@
 __all__ = [
     "DiagnosticTaskManager",
+    "TaskDispatcher",
+    "task_dispatcher",
     "KnowledgeGraph",
-    "get_components_from_knowledge_graph"
+    "get_components_from_knowledge_graph",
+    "fetch_components",
+    "knowledge_cache",
+    "knowledge_queries",
+    "SuspectComponent"
 ]
 
 from .tasks import DiagnosticTaskManager
+from .task_dispatcher import TaskDispatcher, task_dispatcher
 from .knowledge_graph import KnowledgeGraph
-from .knowledge_retrieval import get_components_from_knowledge_graph
+from .knowledge_retrieval import (
+    get_components_from_knowledge_graph, fetch_components
+)
+from .knowledge_cache import knowledge_cache
+from .knowledge_queries import knowledge_queries, SuspectComponent
@@ -0,0 +1,125 @@
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class KnowledgeCache:
+    """
+    Cache for results of knowledge graph queries, which only change if the
+    knowledge graph is reloaded.
+
+    Entries are fresh for ttl seconds. Afterwards, stale entries are still
+    served for up to max_stale seconds while they are revalidated in the
+    background. Concurrent loads of the same key are coalesced into a single
+    query.
+    """
+
+    def __init__(self, ttl: float = 300., max_stale: float = 3600.):
+        self.ttl = ttl
+        self.max_stale = max_stale
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.failed_refreshes = 0
+        # Values and monotonic time of loading by key
+        self._entries: Dict[Hashable, Tuple[Any, float]] = {}
+        self._loads: Dict[Hashable, asyncio.Task] = {}
+        # Incremented on invalidation to discard results of running loads
+        self._generation = 0
+
+    def configure(self, ttl: float, max_stale: float):
+        self.ttl = ttl
+        self.max_stale = max_stale
+
+    async def _load_and_store(
+            self,
+            key: Hashable,
+            load: Callable[[], Awaitable[Any]],
+            generation: int
+    ) -> Any:
+        try:
+            value = await load()
+        finally:
+            if self._loads.get(key) is asyncio.current_task():
+                del self._loads[key]
+        if generation == self._generation:
+            self._entries[key] = (value, time.monotonic())
+        return value
+
+    def _start_load(
+            self, key: Hashable, load: Callable[[], Awaitable[Any]]
+    ) -> asyncio.Task:
+        task = self._loads.get(key)
+        if task is None:
+            task = asyncio.create_task(
+                self._load_and_store(key, load, self._generation)
+            )
+            self._loads[key] = task
+        return task
+
+    def _log_failed_refresh(self, task: asyncio.Task):
+        if not task.cancelled() and task.exception() is not None:
+            self.failed_refreshes += 1
+            logger.warning(
+                f"Could not refresh knowledge cache: {task.exception()}"
+            )
+
+    async def get(
+            self, key: Hashable, load: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """
+        Get the value cached for key. Missing or expired values are loaded
+        by awaiting load(), whose exceptions are propagated. Stale values are
+        returned immediately and refreshed in the background.
+        """
+        entry = self._entries.get(key)
+        if entry is not None:
+            value, loaded_at = entry
+            age = time.monotonic() - loaded_at
+            if age < self.ttl:
+                self.hits += 1
+                return value
+            if age < self.ttl + self.max_stale:
+                self.stale_hits += 1
+                if key not in self._loads:
+                    self._start_load(key, load).add_done_callback(
+                        self._log_failed_refresh
+                    )
+                return value
+        self.misses += 1
+        # Shield the shared load from cancellation of a single caller
+        return await asyncio.shield(self._start_load(key, load))
+
+    def invalidate(self):
+        """
+        Drop all entries, e.g. after the knowledge graph was reloaded. Loads
+        that are running are not cached.
+        """
+        self._generation += 1
+        self._entries.clear()
+        self._loads.clear()
+
+    async def stop(self):
+        """Cancel all running loads."""
+        loads = list(self._loads.values())
+        self.invalidate()
+        for task in loads:
+            task.cancel()
+        await asyncio.gather(*loads, return_exceptions=True)
+
+    def stats(self) -> dict:
+        return {
+            "size": len(self._entries),
+            "ttl": self.ttl,
+            "max_stale": self.max_stale,
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "failed_refreshes": self.failed_refreshes
+        }
+
+
+knowledge_cache = KnowledgeCache()
@@ -1,10 +1,19 @@
-from typing import Optional
+from typing import List, Optional
+
+import httpx
 
 
 class KnowledgeGraph:
     kg_url: Optional[str] = None
     obd_dataset_name: str = "OBD"
 
+    # Connection pool shared by all SPARQL queries to the knowledge graph
+    _client: Optional[httpx.AsyncClient] = None
+    _timeout: float = 10.
+    _limits: httpx.Limits = httpx.Limits(
+        max_connections=10, max_keepalive_connections=5
+    )
+
     @classmethod
     def set_kg_url(cls, url: str | None):
         """Set knowledge graph (root) url"""
@@ -17,3 +26,56 @@ class KnowledgeGraph:
             return None
         kg_obd_url = f"{cls.kg_url}/{cls.obd_dataset_name}"
         return kg_obd_url
+
+    @classmethod
+    def configure_client(
+            cls,
+            timeout: float,
+            max_connections: int = 10,
+            max_keepalive_connections: int = 5
+    ):
+        """Configure the connections used for SPARQL queries."""
+        cls._timeout = timeout
+        cls._limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections
+        )
+
+    @classmethod
+    def open_client(cls, transport: Optional[httpx.AsyncBaseTransport] = None):
+        """
+        Create the client used for all SPARQL queries. Connections are kept
+        alive and reused until the client is closed.
+        """
+        cls._client = httpx.AsyncClient(
+            timeout=cls._timeout, limits=cls._limits, transport=transport
+        )
+
+    @classmethod
+    async def close_client(cls):
+        """Close the client and all pooled connections."""
+        if cls._client is not None:
+            await cls._client.aclose()
+            cls._client = None
+
+    @classmethod
+    async def query(cls, dataset_url: str, sparql_query: str) -> List[dict]:
+        """
+        Send a SPARQL query to the sparql endpoint of a dataset and return
+        the result bindings.
+
+        Raises httpx.HTTPError if the request fails and KeyError or
+        ValueError if the response is not a SPARQL JSON result.
+        """
+        if cls._client is None:
+            cls.open_client()
+        response = await cls._client.post(
+            f"{dataset_url}/sparql",
+            content=sparql_query.encode(),
+            headers={
+                'Content-Type': 'application/sparql-query',
+                'Accept': 'application/json'
+            }
+        )
+        response.raise_for_status()
+        return response.json()["results"]["bindings"]
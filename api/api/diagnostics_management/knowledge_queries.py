@@ -0,0 +1,241 @@
+from collections import OrderedDict
+from typing import Dict, Hashable, Iterable, List, Optional, Tuple
+
+from pydantic import BaseModel
+
+from .knowledge_cache import knowledge_cache
+from .knowledge_graph import KnowledgeGraph
+from .knowledge_retrieval import ONTOLOGY_PREFIX
+
+PREFIXES = f"PREFIX diag: <{ONTOLOGY_PREFIX}>\n" \
+           f"PREFIX owl: <http://www.w3.org/2002/07/owl#>\n"
+
+# Marks the position of the VALUES block in a prepared query
+VALUES_PLACEHOLDER = "%VALUES%"
+
+SPARQL_ESCAPES = str.maketrans({
+    "\\": "\\\\",
+    "\"": "\\\"",
+    "\n": "\\n",
+    "\r": "\\r",
+    "\t": "\\t",
+    "\b": "\\b",
+    "\f": "\\f"
+})
+
+
+def sparql_literal(value: str) -> str:
+    """Serialize value as SPARQL string literal."""
+    return f"\"{value.translate(SPARQL_ESCAPES)}\""
+
+
+class PreparedQuery:
+    """
+    SPARQL select query with a single parameter. Values of the parameter are
+    bound via a VALUES block at the position of VALUES_PLACEHOLDER, such that
+    several lookups are answered by one query. The parameter has to be
+    selected to match result rows to the looked up values.
+    """
+
+    def __init__(self, name: str, parameter: str, query: str):
+        before, placeholder, after = (PREFIXES + query).partition(
+            VALUES_PLACEHOLDER
+        )
+        if not placeholder:
+            raise ValueError(f"Query '{name}' has no {VALUES_PLACEHOLDER}.")
+        self.name = name
+        self.parameter = parameter
+        self._before = f"{before}VALUES ?{parameter} {{ "
+        self._after = f" }}{after}"
+
+    def bind(self, values: Iterable[str]) -> str:
+        """Get the query text for lookups of values."""
+        return self._before + \
+            " ".join(sparql_literal(value) for value in values) + \
+            self._after
+
+
+SUSPECT_COMPONENTS = PreparedQuery(
+    name="suspect_components",
+    parameter="dtc",
+    query="""
+SELECT ?dtc ?name ?priority ?use_oscilloscope WHERE {
+    %VALUES%
+    ?dtc_entry a diag:DTC ;
+        diag:code ?dtc ;
+        diag:hasAssociation ?association .
+    ?association diag:pointsTo ?component .
+    ?component diag:component_name ?name .
+    OPTIONAL { ?association diag:priority_id ?priority }
+    OPTIONAL { ?component diag:use_oscilloscope ?use_oscilloscope }
+}"""
+)
+
+AFFECTING_COMPONENTS = PreparedQuery(
+    name="affecting_components",
+    parameter="component",
+    query="""
+SELECT ?component ?name WHERE {
+    %VALUES%
+    ?component_entry a diag:SuspectComponent ;
+        diag:component_name ?component ;
+        diag:affected_by ?name .
+}"""
+)
+
+DATASET_VERSION = PREFIXES + """
+SELECT ?triples ?version WHERE {
+    { SELECT (COUNT(*) AS ?triples) WHERE { ?s ?p ?o } }
+    OPTIONAL { ?ontology a owl:Ontology ; owl:versionInfo ?version }
+}"""
+
+
+class SuspectComponent(BaseModel):
+    """Vehicle component pointed to by a DTC in the knowledge graph."""
+    name: str
+    priority: Optional[int] = None
+    use_oscilloscope: Optional[bool] = None
+
+
+class KnowledgeQueries:
+    """
+    Batched lookups in the knowledge graph. Results are memoised per looked
+    up value in a bounded LRU cache. Cache keys include the version of the
+    dataset, such that results are not served anymore once the knowledge
+    graph is reloaded.
+    """
+
+    def __init__(self, max_size: int = 4096, batch_size: int = 100):
+        self.max_size = max_size
+        self.batch_size = batch_size
+        self.hits = 0
+        self.misses = 0
+        self.queries = 0
+        self._results: OrderedDict[Hashable, List[dict]] = OrderedDict()
+
+    def configure(self, max_size: int, batch_size: int):
+        self.max_size = max_size
+        self.batch_size = batch_size
+
+    @staticmethod
+    async def _fetch_dataset_version(dataset_url: str) -> str:
+        bindings = await KnowledgeGraph.query(dataset_url, DATASET_VERSION)
+        triples = bindings[0]["triples"]["value"] if bindings else "0"
+        versions = sorted(
+            binding["version"]["value"] for binding in bindings
+            if "version" in binding
+        )
+        return "/".join([triples, *versions])
+
+    async def dataset_version(self, dataset_url: str) -> str:
+        """
+        Get the version of a dataset, i.e. its number of triples and the
+        version info of its ontologies. The version is cached like other
+        knowledge graph data, see knowledge_cache.
+        """
+        return await knowledge_cache.get(
+            ("dataset_version", dataset_url),
+            lambda: self._fetch_dataset_version(dataset_url)
+        )
+
+    def _put(self, key: Hashable, rows: List[dict]):
+        if self.max_size <= 0:
+            return
+        self._results[key] = rows
+        self._results.move_to_end(key)
+        while len(self._results) > self.max_size:
+            self._results.popitem(last=False)
+
+    async def lookup(
+            self, dataset_url: str, query: PreparedQuery, values: Iterable[str]
+    ) -> Dict[str, List[dict]]:
+        """
+        Look up values with a prepared query. Returns the result rows by
+        value. Values that are not memoised are looked up in batches of
+        batch_size.
+
+        Raises httpx.HTTPError if the knowledge graph is not available, see
+        KnowledgeGraph.query.
+        """
+        values = list(dict.fromkeys(values))
+        version = await self.dataset_version(dataset_url)
+
+        def cache_key(value: str) -> Tuple[str, str, str, str]:
+            return dataset_url, version, query.name, value
+
+        results = {}
+        missing = []
+        for value in values:
+            key = cache_key(value)
+            if key in self._results:
+                self._results.move_to_end(key)
+                results[value] = self._results[key]
+                self.hits += 1
+            else:
+                missing.append(value)
+                self.misses += 1
+
+        batch_size = max(self.batch_size, 1)
+        for i in range(0, len(missing), batch_size):
+            batch = missing[i:i + batch_size]
+            bindings = await KnowledgeGraph.query(
+                dataset_url, query.bind(batch)
+            )
+            self.queries += 1
+            rows_by_value = {value: [] for value in batch}
+            for binding in bindings:
+                row = {
+                    variable: term["value"]
+                    for variable, term in binding.items()
+                }
+                value = row.pop(query.parameter)
+                if value in rows_by_value:
+                    rows_by_value[value].append(row)
+            for value, rows in rows_by_value.items():
+                self._put(cache_key(value), rows)
+                results[value] = rows
+
+        return {value: results[value] for value in values}
+
+    async def suspect_components(
+            self, dataset_url: str, dtcs: Iterable[str]
+    ) -> Dict[str, List[SuspectComponent]]:
+        """Get the suspect components by DTC, ordered by priority."""
+        rows_by_dtc = await self.lookup(dataset_url, SUSPECT_COMPONENTS, dtcs)
+        return {
+            dtc: sorted(
+                (SuspectComponent(**row) for row in rows),
+                key=lambda c: (c.priority is None, c.priority, c.name)
+            )
+            for dtc, rows in rows_by_dtc.items()
+        }
+
+    async def affecting_components(
+            self, dataset_url: str, components: Iterable[str]
+    ) -> Dict[str, List[str]]:
+        """
+        Get the names of the components affecting each component, i.e. the
+        components to check when investigating it.
+        """
+        rows_by_component = await self.lookup(
+            dataset_url, AFFECTING_COMPONENTS, components
+        )
+        return {
+            component: sorted(row["name"] for row in rows)
+            for component, rows in rows_by_component.items()
+        }
+
+    def invalidate(self):
+        self._results.clear()
+
+    def stats(self) -> dict:
+        return {
+            "size": len(self._results),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "queries": self.queries
+        }
+
+
+knowledge_queries = KnowledgeQueries()
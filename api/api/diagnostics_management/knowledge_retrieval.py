@@ -1,46 +1,41 @@
-import httpx
+import logging
 from typing import List
 
+import httpx
+
+from .knowledge_cache import knowledge_cache
+from .knowledge_graph import KnowledgeGraph
+
+logger = logging.getLogger(__name__)
+
+ONTOLOGY_PREFIX = "http://www.semanticweb.org/diag_ontology#"
+
+
+async def fetch_components(kg_obd_url: str) -> List[str]:
+    """Fetch all vehicle component names stored in knowledge graph.
 
-def get_components_from_knowledge_graph(kg_obd_url: str) -> List[str]:
+    Raises, if retrieval fails. See KnowledgeGraph.query.
+    """
+    sparql_query = f"SELECT ?name WHERE " \
+                   f"{{?comp a <{ONTOLOGY_PREFIX}SuspectComponent> . " \
+                   f"?comp <{ONTOLOGY_PREFIX}component_name> ?name .}}"
+    bindings = await KnowledgeGraph.query(kg_obd_url, sparql_query)
+    return [binding["name"]["value"] for binding in bindings]
+
+
+async def get_components_from_knowledge_graph(kg_obd_url: str) -> List[str]:
     """Try to fetch all vehicle component names stored in knowledge graph.
 
-    Returned list will be empty, if retrieval fails.
+    The names are served from the knowledge cache. Returned list will be
+    empty, if retrieval fails. Failures are not cached.
     """
-    # construct sparql endpoint and query
-    sparql_endpoint = f"{kg_obd_url}/sparql"
-    ontology_prefix = "<http://www.semanticweb.org/diag_ontology#>"
-    component_ontology_entry = ontology_prefix.replace(
-        "#", "#SuspectComponent"
-    )
-    name_ontology_entry = ontology_prefix.replace("#", "#component_name")
-    sparql_query = f"SELECT ?name WHERE {{?comp a {component_ontology_entry}" \
-                   f" . ?comp {name_ontology_entry} ?name .}}"
-    # try to send sparql query via knowledge graphs http interface
     try:
-        response = httpx.post(
-            sparql_endpoint,
-            content=sparql_query.encode(),
-            headers={
-                'Content-Type': 'application/sparql-query',
-                'Accept': 'application/json'
-            }
+        return await knowledge_cache.get(
+            ("components", kg_obd_url), lambda: fetch_components(kg_obd_url)
+        )
+    except (httpx.HTTPError, KeyError, ValueError) as e:
+        logger.warning(
+            f"Failed to fetch components from knowledge graph with "
+            f"{type(e).__name__}: {e}"
         )
-        response.raise_for_status()
-    except (
-            httpx.ConnectError, httpx.ConnectTimeout, httpx.HTTPStatusError
-    ) as e:
-        print("Failed to fetch data from knowledge graph with")
-        print(type(e).__name__, ":", e)
-        return []
-
-    # try to extract components from response
-    try:
-        response_data = response.json()
-        bindings = response_data["results"]["bindings"]
-        components = [binding["name"]["value"] for binding in bindings]
-        return components
-    except KeyError as e:
-        print("Failed to process data fetched from knowledge graph with")
-        print(type(e).__name__, ":", e)
         return []
@@ -0,0 +1,245 @@
+import asyncio
+import logging
+from datetime import datetime, timedelta, UTC
+from typing import List, Optional, Tuple
+from uuid import uuid4
+
+from celery import Celery
+from pymongo import UpdateOne
+
+from ..data_management import Case, TaskDispatch
+
+logger = logging.getLogger(__name__)
+
+
+class TaskDispatcher:
+    """
+    Publishes the pending task dispatches recorded by the
+    DiagnosticTaskManager to the celery broker. Publishing runs in a thread
+    such that a slow or unavailable broker does not block the event loop.
+
+    Due dispatches are claimed in batches of batch_size and published over a
+    single broker connection. Failed dispatches are retried with exponential
+    backoff. A dispatch is only published once a case links its diagnosis,
+    as the diagnostics service retrieves the data of the diagnosis via the
+    case. Dispatches of diagnoses that were not linked within grace_period
+    seconds are dropped. Claims of dispatchers that stopped expire after
+    claim_timeout seconds.
+    """
+
+    def __init__(
+            self,
+            interval: float = 5.,
+            batch_size: int = 100,
+            retry_backoff: float = 1.,
+            max_backoff: float = 300.,
+            grace_period: float = 60.,
+            claim_timeout: float = 60.
+    ):
+        self.interval = interval
+        self.batch_size = batch_size
+        self.retry_backoff = retry_backoff
+        self.max_backoff = max_backoff
+        self.grace_period = grace_period
+        self.claim_timeout = claim_timeout
+        self.runs = 0
+        self.failed_runs = 0
+        self.last_run: Optional[datetime] = None
+        self.dispatched = 0
+        self.failed_attempts = 0
+        self.dropped = 0
+        self._celery: Optional[Celery] = None
+        self._task: Optional[asyncio.Task] = None
+        self._wakeup = asyncio.Event()
+
+    def configure(
+            self,
+            celery: Celery | None,
+            interval: float,
+            batch_size: int,
+            retry_backoff: float,
+            max_backoff: float
+    ):
+        self._celery = celery
+        self.interval = interval
+        self.batch_size = batch_size
+        self.retry_backoff = retry_backoff
+        self.max_backoff = max_backoff
+
+    def _publish(
+            self, dispatches: List[Tuple[str, str]]
+    ) -> List[Optional[Exception]]:
+        """
+        Publish tasks with their single argument. Returns the exception by
+        task if publishing failed.
+        """
+        errors = []
+        try:
+            with self._celery.producer_or_acquire() as producer:
+                for task_name, arg in dispatches:
+                    try:
+                        self._celery.send_task(
+                            task_name, (arg,), producer=producer, retry=False
+                        )
+                        errors.append(None)
+                    except Exception as e:
+                        errors.append(e)
+        except Exception as e:
+            # no connection to the broker
+            errors.extend([e] * (len(dispatches) - len(errors)))
+        return errors
+
+    def _backoff(self, attempts: int) -> timedelta:
+        return timedelta(
+            seconds=min(self.retry_backoff * 2 ** attempts, self.max_backoff)
+        )
+
+    async def dispatch_due(self) -> int:
+        """
+        Publish a batch of due dispatches. Returns the number of claimed
+        dispatches.
+        """
+        if self._celery is None:
+            raise AttributeError("Celery not configured.")
+        collection = TaskDispatch.get_motor_collection()
+        now = datetime.now(UTC)
+        due = await collection.find(
+            {"next_attempt": {"$lte": now}}, projection={"_id": 1}
+        ).sort(
+            [("next_attempt", 1), ("created", 1)]
+        ).limit(self.batch_size).to_list(None)
+        if not due:
+            return 0
+
+        # Claim the due dispatches, such that they are not published by
+        # other instances of the api meanwhile
+        claim = uuid4().hex
+        await collection.update_many(
+            {
+                "_id": {"$in": [dispatch["_id"] for dispatch in due]},
+                "next_attempt": {"$lte": now}
+            },
+            {"$set": {
+                "claim": claim,
+                "next_attempt": now + timedelta(seconds=self.claim_timeout)
+            }}
+        )
+        dispatches = await collection.find({"claim": claim}).to_list(None)
+        if not dispatches:
+            return 0
+
+        # Dispatches are recorded before their diagnosis is created and
+        # linked to the case
+        linked = await Case.get_motor_collection().distinct(
+            "diagnosis_id",
+            {
+                "diagnosis_id": {
+                    "$in": [d["diagnosis_id"] for d in dispatches]
+                }
+            }
+        )
+        not_linked = {"claim": claim, "diagnosis_id": {"$nin": linked}}
+        dropped = await collection.delete_many({
+            **not_linked,
+            "created": {"$lt": now - timedelta(seconds=self.grace_period)}
+        })
+        self.dropped += dropped.deleted_count
+        await collection.update_many(
+            not_linked,
+            {"$set": {
+                "claim": None,
+                "next_attempt": now + self._backoff(0)
+            }}
+        )
+        dispatches = [d for d in dispatches if d["diagnosis_id"] in linked]
+        if not dispatches:
+            return len(due)
+
+        errors = await asyncio.to_thread(
+            self._publish,
+            [(d["task_name"], str(d["diagnosis_id"])) for d in dispatches]
+        )
+        published = [
+            d["_id"] for d, error in zip(dispatches, errors) if error is None
+        ]
+        if published:
+            await collection.delete_many({"_id": {"$in": published}})
+            self.dispatched += len(published)
+        failed = [
+            UpdateOne(
+                {"_id": d["_id"], "claim": claim},
+                {
+                    "$set": {
+                        "claim": None,
+                        "last_error": str(error),
+                        "next_attempt": now + self._backoff(d["attempts"])
+                    },
+                    "$inc": {"attempts": 1}
+                }
+            )
+            for d, error in zip(dispatches, errors) if error is not None
+        ]
+        if failed:
+            await collection.bulk_write(failed, ordered=False)
+            self.failed_attempts += len(failed)
+            logger.warning(
+                f"Could not publish {len(failed)} diagnostic tasks: "
+                f"{next(e for e in errors if e is not None)}"
+            )
+        return len(due)
+
+    async def dispatch_continuously(self):
+        while True:
+            self._wakeup.clear()
+            claimed = 0
+            try:
+                claimed = await self.dispatch_due()
+            except Exception as e:
+                self.failed_runs += 1
+                logger.warning(f"Could not dispatch diagnostic tasks: {e}")
+            finally:
+                self.runs += 1
+                self.last_run = datetime.now(UTC)
+            if claimed >= self.batch_size:
+                # more dispatches might be due
+                continue
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.interval)
+            except TimeoutError:
+                pass
+
+    def wakeup(self):
+        """Look for due dispatches immediately."""
+        self._wakeup.set()
+
+    def start(self):
+        """Start dispatching in the background."""
+        if self._task is None or self._task.done():
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.create_task(self.dispatch_continuously())
+
+    async def stop(self):
+        """Stop dispatching in the background."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def stats(self) -> dict:
+        return {
+            "interval": self.interval,
+            "batch_size": self.batch_size,
+            "runs": self.runs,
+            "failed_runs": self.failed_runs,
+            "last_run": self.last_run,
+            "dispatched": self.dispatched,
+            "failed_attempts": self.failed_attempts,
+            "dropped": self.dropped
+        }
+
+
+task_dispatcher = TaskDispatcher()
@@ -1,6 +1,8 @@
 from celery import Celery
 from typing import Optional
 
+from ..data_management import TaskDispatch
+
 
 class DiagnosticTaskManager:
     """
@@ -19,8 +21,14 @@ class DiagnosticTaskManager:
         cls._celery = celery
 
     async def __call__(self, diagnosis_id):
-        """Send a diagnosis id to the diagnostics backend for processing."""
+        """
+        Schedule sending a diagnosis id to the diagnostics backend for
+        processing. The dispatch is recorded in the database and published
+        to the broker in the background once the diagnosis is linked to its
+        case, see task_dispatcher.
+        """
         if self._celery is not None:
-            self._celery.send_task(
-                self._diagnostic_task_name, (str(diagnosis_id),)
-            )
+            await TaskDispatch(
+                task_name=self._diagnostic_task_name,
+                diagnosis_id=diagnosis_id
+            ).insert()
@@ -6,15 +6,22 @@ from motor import motor_asyncio
 
 from .data_management import (
     Case, Vehicle, Customer, Workshop, TimeseriesMetaData, Diagnosis,
-    AttachmentBucket, Asset
+    AttachmentBucket, Asset, TimeseriesUpload, TaskDispatch, orphan_collector,
+    case_data_events
 )
+from .data_management.migrations import run_migrations
 from .data_management.timeseries_data import GridFSSignalStore
 from .dataspace_management import Nautilus
-from .diagnostics_management import DiagnosticTaskManager, KnowledgeGraph
+from .diagnostics_management import (
+    DiagnosticTaskManager, KnowledgeGraph, knowledge_cache, knowledge_queries,
+    task_dispatcher
+)
 from .settings import settings
 from .security.keycloak import Keycloak
+from .security.token_auth import verified_token_cache
+from .upload_filereader import parse_executor
 from .v1 import api_v1
-from .routers import diagnostics, assets
+from .routers import diagnostics, assets, health
 
 app = FastAPI()
 app.add_middleware(
@@ -43,48 +50,144 @@ async def init_mongo():
     await init_beanie(
         client[settings.mongo_db],
         document_models=[
-            Case, Vehicle, Customer, Workshop, Diagnosis, Asset
+            Case, Vehicle, Customer, Workshop, Diagnosis, Asset,
+            TimeseriesUpload, TaskDispatch
         ]
     )
+    await run_migrations()
 
     # initialized gridfs signal storage
     bucket = motor_asyncio.AsyncIOMotorGridFSBucket(
         client[settings.mongo_db], bucket_name="signals"
     )
-    TimeseriesMetaData.signal_store = GridFSSignalStore(bucket=bucket)
+    TimeseriesMetaData.signal_store = GridFSSignalStore(
+        bucket=bucket,
+        dtype=settings.signal_storage_dtype,
+        compression=settings.signal_storage_compression
+    )
+
+    # initialized chunk storage for chunked timeseries data uploads
+    TimeseriesUpload.bucket = motor_asyncio.AsyncIOMotorGridFSBucket(
+        client[settings.mongo_db], bucket_name="uploads"
+    )
 
     # initialized attachment store for diagnostics api
     AttachmentBucket.bucket = motor_asyncio.AsyncIOMotorGridFSBucket(
         client[settings.mongo_db], bucket_name="attachments"
     )
 
+    # reclaim files of the signal and attachment buckets that are not
+    # referenced anymore
+    orphan_collector.configure(
+        db=client[settings.mongo_db],
+        interval=settings.orphan_collection_interval,
+        batch_size=settings.orphan_collection_batch_size,
+        min_age=settings.orphan_min_age
+    )
+    orphan_collector.start()
+
+
+@app.on_event("shutdown")
+async def stop_orphan_collector():
+    await orphan_collector.stop()
+
 
 @app.on_event("startup")
 async def init_diagnostics_management():
-    DiagnosticTaskManager.set_celery(
-        Celery(
-            broker=settings.redis_uri, backend=settings.redis_uri
-        )
+    celery = Celery(broker=settings.redis_uri, backend=settings.redis_uri)
+    DiagnosticTaskManager.set_celery(celery)
+    # publish recorded diagnostic tasks to the broker in the background
+    task_dispatcher.configure(
+        celery=celery,
+        interval=settings.task_dispatch_interval,
+        batch_size=settings.task_dispatch_batch_size,
+        retry_backoff=settings.task_dispatch_retry_backoff,
+        max_backoff=settings.task_dispatch_max_backoff
     )
+    task_dispatcher.start()
+
+
+@app.on_event("shutdown")
+async def stop_task_dispatcher():
+    await task_dispatcher.stop()
+
+
+@app.on_event("startup")
+async def init_case_data_events():
+    # notify requests waiting for case data across all api instances
+    case_data_events.configure(redis_uri=settings.redis_uri)
+    case_data_events.start()
+
+
+@app.on_event("shutdown")
+async def stop_case_data_events():
+    await case_data_events.stop()
 
 
 @app.on_event("startup")
 def init_knowledge_graph():
     KnowledgeGraph.set_kg_url(settings.knowledge_graph_url)
+    KnowledgeGraph.configure_client(
+        timeout=settings.knowledge_graph_timeout,
+        max_connections=settings.knowledge_graph_max_connections,
+        max_keepalive_connections=(
+            settings.knowledge_graph_max_keepalive_connections
+        )
+    )
+    KnowledgeGraph.open_client()
+    knowledge_cache.configure(
+        ttl=settings.knowledge_cache_ttl,
+        max_stale=settings.knowledge_cache_max_stale
+    )
+    knowledge_queries.configure(
+        max_size=settings.knowledge_query_cache_size,
+        batch_size=settings.knowledge_query_batch_size
+    )
+
+
+@app.on_event("shutdown")
+async def close_knowledge_graph():
+    await knowledge_cache.stop()
+    await KnowledgeGraph.close_client()
 
 
 @app.on_event("startup")
-def init_keycloak():
+async def init_keycloak():
     Keycloak.configure(
         url=settings.keycloak_url,
-        workshop_realm=settings.keycloak_workshop_realm
+        workshop_realm=settings.keycloak_workshop_realm,
+        key_ttl=settings.keycloak_key_ttl,
+        min_refresh_interval=settings.keycloak_min_key_refresh_interval
+    )
+    Keycloak.start_key_refresh()
+    verified_token_cache.max_size = settings.verified_token_cache_size
+
+
+@app.on_event("shutdown")
+async def stop_keycloak_key_refresh():
+    await Keycloak.stop_key_refresh()
+
+
+@app.on_event("startup")
+def init_parse_executor():
+    parse_executor.configure(
+        kind=settings.parse_executor,
+        max_workers=settings.parse_executor_workers,
+        max_pending=settings.parse_executor_max_pending
     )
+    parse_executor.start()
+
+
+@app.on_event("shutdown")
+def stop_parse_executor():
+    parse_executor.shutdown()
 
 
 @app.on_event("startup")
 def set_api_keys():
     diagnostics.api_key_auth.valid_key = settings.api_key_diagnostics
     assets.api_key_auth.valid_key = settings.api_key_assets
+    health.api_key_auth.valid_key = settings.api_key_metrics
 
 
 @app.on_event("startup")
@@ -92,5 +195,16 @@ def init_nautilus():
     Nautilus.configure(
         url=settings.nautilus_url,
         timeout=settings.nautilus_timeout,
-        api_key_assets=settings.api_key_assets
+        api_key_assets=settings.api_key_assets,
+        max_connections=settings.nautilus_max_connections,
+        max_keepalive_connections=settings.nautilus_max_keepalive_connections,
+        keepalive_expiry=settings.nautilus_keepalive_expiry,
+        max_retries=settings.nautilus_max_retries,
+        retry_backoff=settings.nautilus_retry_backoff
     )
+    Nautilus.open_client()
+
+
+@app.on_event("shutdown")
+async def close_nautilus():
+    await Nautilus.close_client()
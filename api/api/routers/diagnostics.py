@@ -1,9 +1,10 @@
-from typing import List, Optional
+import asyncio
+from typing import Callable, List, Optional
 
 from beanie.odm.fields import PydanticObjectId
 from bson import ObjectId
 from fastapi import (
-    APIRouter, HTTPException, Body, Form, Depends, UploadFile, File
+    APIRouter, HTTPException, Body, Form, Depends, UploadFile, File, Query
 )
 from motor import motor_asyncio
 
@@ -17,7 +18,8 @@ from ..data_management import (
     Symptom,
     AttachmentBucket,
     TimeseriesDataFull,
-    Action
+    Action,
+    case_data_events
 )
 from ..security.api_key_auth import APIKeyAuth
 
@@ -32,6 +34,17 @@ api_key_auth = APIKeyAuth()
 
 router = APIRouter(tags=["Diagnostics"], dependencies=[Depends(api_key_auth)])
 
+# Maximum number of seconds a request waits for data to be added to a case
+MAX_DATA_WAIT = 60
+
+wait_query = Query(
+    default=0,
+    ge=0,
+    le=MAX_DATA_WAIT,
+    description="Seconds to wait for data to be added if none is available. "
+                "The response is sent as soon as data is added."
+)
+
 
 async def _diag_by_id_or_404(diag_id: str) -> Diagnosis:
     diag = await Diagnosis.get(diag_id)
@@ -51,6 +64,35 @@ async def _case_by_diag_id_or_404(diag_id: str) -> Case:
     return case
 
 
+async def _wait_for_case_data(
+        case: Case, wait: float, select: Callable[[Case], list]
+) -> list:
+    """
+    Select data of a case. If no data is available, wait up to `wait`
+    seconds for data to be added to the case.
+    """
+    data = select(case)
+    if data or wait <= 0:
+        return data
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + wait
+    with case_data_events.listen(case.id) as data_added:
+        while True:
+            data_added.clear()
+            # data might have been added before listening
+            case = await Case.get(case.id)
+            if case is None:
+                return []
+            data = select(case)
+            remaining = deadline - loop.time()
+            if data or remaining <= 0:
+                return data
+            try:
+                await asyncio.wait_for(data_added.wait(), remaining)
+            except TimeoutError:
+                pass
+
+
 @router.get(
     "/{diag_id}",
     status_code=200,
@@ -69,10 +111,11 @@ async def get_diagnosis(
     response_model=List[OBDData]
 )
 async def get_obd_data(
+        wait: float = wait_query,
         case: Case = Depends(_case_by_diag_id_or_404)
 ) -> List[OBDData]:
     """Get OBD data for a diagnosis."""
-    return case.obd_data
+    return await _wait_for_case_data(case, wait, lambda c: c.obd_data)
 
 
 @router.get(
@@ -101,16 +144,23 @@ async def get_vehicle(
 )
 async def get_oscillograms(
         component: str,
+        wait: float = wait_query,
         case: Case = Depends(_case_by_diag_id_or_404)
 ) -> List[TimeseriesDataFull]:
     """Get all oscillograms for a specific component."""
+    timeseries_data = await _wait_for_case_data(
+        case,
+        wait,
+        lambda c: [tsd for tsd in c.timeseries_data
+                   if tsd.component == component]
+    )
+    # signals are only loaded once oscillograms are available
     output_data: List[TimeseriesDataFull] = []
-    for tsd in case.timeseries_data:
-        if tsd.component == component:
-            signal = await tsd.get_signal()
-            output_data.append(
-                TimeseriesDataFull(signal=signal, **tsd.model_dump())
-            )
+    for tsd in timeseries_data:
+        signal = await tsd.get_signal()
+        output_data.append(
+            TimeseriesDataFull(signal=signal, **tsd.model_dump())
+        )
     return output_data
 
 
@@ -120,11 +170,16 @@ async def get_oscillograms(
     response_model=List[Symptom]
 )
 async def get_symptoms(
-        component: str, case: Case = Depends(_case_by_diag_id_or_404)
+        component: str,
+        wait: float = wait_query,
+        case: Case = Depends(_case_by_diag_id_or_404)
 ) -> List[Symptom]:
     """Get all symptoms for a specific component."""
-    symptoms = [s for s in case.symptoms if s.component == component]
-    return symptoms
+    return await _wait_for_case_data(
+        case,
+        wait,
+        lambda c: [s for s in c.symptoms if s.component == component]
+    )
 
 
 @router.put(
@@ -1,4 +1,13 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
+
+from ..data_management import case_data_events, orphan_collector
+from ..dataspace_management import Nautilus
+from ..diagnostics_management import (
+    knowledge_cache, knowledge_queries, task_dispatcher
+)
+from ..security.api_key_auth import APIKeyAuth
+from ..security.token_auth import verified_token_cache
+from ..upload_filereader import parse_executor
 
 tags_metadata = [
     {
@@ -7,9 +16,28 @@ tags_metadata = [
     }
 ]
 
+api_key_auth = APIKeyAuth()
+
 router = APIRouter(tags=["Health"])
 
 
 @router.get("/ping", status_code=200)
 def ping():
     return {"msg": "ok"}
+
+
+@router.get(
+    "/metrics", status_code=200, dependencies=[Depends(api_key_auth)]
+)
+def metrics():
+    """Internal metrics of the api instance. Requires the metrics api key."""
+    return {
+        "verified_token_cache": verified_token_cache.stats(),
+        "parse_executor": parse_executor.stats(),
+        "orphan_collector": orphan_collector.stats(),
+        "nautilus": Nautilus.stats(),
+        "knowledge_cache": knowledge_cache.stats(),
+        "knowledge_queries": knowledge_queries.stats(),
+        "task_dispatcher": task_dispatcher.stats(),
+        "case_data_events": case_data_events.stats()
+    }
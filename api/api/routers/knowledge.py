@@ -1,11 +1,18 @@
-from typing import List, Optional
+import logging
+from typing import Dict, List, Optional
 
-from fastapi import APIRouter, Depends
+import httpx
+from fastapi import APIRouter, Depends, HTTPException, Query
 
 from ..diagnostics_management import (
-    KnowledgeGraph, get_components_from_knowledge_graph
+    KnowledgeGraph, SuspectComponent, get_components_from_knowledge_graph,
+    knowledge_cache, knowledge_queries
 )
-from ..security.token_auth import authorized_knowledge_access
+from ..security.token_auth import (
+    authorized_knowledge_access, authorized_knowledge_management
+)
+
+logger = logging.getLogger(__name__)
 
 tags_metadata = [
     {
@@ -28,9 +35,78 @@ async def list_vehicle_components(
 ) -> List[str]:
     """List all names of vehicle components stored in the knowledge graph
     instance connected to the Hub.
+
+    The components are cached and refreshed in the background, see
+    `DELETE /knowledge/cache` to fetch them again immediately.
     """
     if not kg_obd_url:
         # No knowledge graph configured
         return []
-    components = get_components_from_knowledge_graph(kg_obd_url)
-    return components
+    return await get_components_from_knowledge_graph(kg_obd_url)
+
+
+def knowledge_graph_unavailable(e: Exception) -> HTTPException:
+    logger.warning(
+        f"Failed to query knowledge graph with {type(e).__name__}: {e}"
+    )
+    return HTTPException(
+        status_code=503, detail="Knowledge graph is not available."
+    )
+
+
+@router.get(
+    "/suspect_components",
+    response_model=Dict[str, List[SuspectComponent]],
+    status_code=200
+)
+async def list_suspect_components(
+        dtc: List[str] = Query(description="DTCs to look up"),
+        kg_obd_url: Optional[str] = Depends(KnowledgeGraph.get_obd_url)
+) -> Dict[str, List[SuspectComponent]]:
+    """List the suspect components of each DTC ordered by priority.
+
+    All DTCs are looked up with a single knowledge graph query.
+    """
+    if not kg_obd_url:
+        return {code: [] for code in dtc}
+    try:
+        return await knowledge_queries.suspect_components(kg_obd_url, dtc)
+    except (httpx.HTTPError, KeyError, ValueError) as e:
+        raise knowledge_graph_unavailable(e)
+
+
+@router.get(
+    "/components/affected_by",
+    response_model=Dict[str, List[str]],
+    status_code=200
+)
+async def list_affecting_components(
+        component: List[str] = Query(description="Components to look up"),
+        kg_obd_url: Optional[str] = Depends(KnowledgeGraph.get_obd_url)
+) -> Dict[str, List[str]]:
+    """List the components affecting each component, i.e. the components to
+    check when investigating a component.
+
+    All components are looked up with a single knowledge graph query.
+    """
+    if not kg_obd_url:
+        return {name: [] for name in component}
+    try:
+        return await knowledge_queries.affecting_components(
+            kg_obd_url, component
+        )
+    except (httpx.HTTPError, KeyError, ValueError) as e:
+        raise knowledge_graph_unavailable(e)
+
+
+@router.delete(
+    "/cache",
+    status_code=204,
+    dependencies=[Depends(authorized_knowledge_management)]
+)
+async def invalidate_knowledge_cache() -> None:
+    """Drop all cached knowledge graph data, e.g. after the knowledge graph
+    was reloaded. Requires the knowledge role.
+    """
+    knowledge_cache.invalidate()
+    knowledge_queries.invalidate()
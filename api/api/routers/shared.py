@@ -7,11 +7,19 @@ from typing import (
 
 from bson import ObjectId
 from bson.errors import InvalidId
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Header, Query, Request
+from fastapi.responses import Response
 from pydantic import NonNegativeInt
 
 from ..data_management import (
-    Case, Customer, Vehicle, TimeseriesData, OBDData, Symptom
+    Case, CaseSummary, Customer, Vehicle, TimeseriesData, OBDData, Symptom
+)
+from .utils import pagination
+from .utils.signal import (
+    SignalQuery,
+    binary_signal_responses,
+    signal_query,
+    signal_response
 )
 from ..security.token_auth import authorized_shared_access
 
@@ -28,14 +36,23 @@ router = APIRouter(
 )
 
 
-@router.get("/cases", status_code=200, response_model=List[Case])
+@router.get(
+    "/cases",
+    status_code=200,
+    response_model=List[Case] | List[CaseSummary]
+)
 async def list_cases(
+        response: Response,
+        request: Request,
         customer_id: Optional[str] = None,
         vin: Optional[str] = None,
         workshop_id: Optional[str] = None,
         obd_data_dtc: Optional[str] = None,
-        timeseries_data_component: Optional[str] = None
-) -> List[Case]:
+        timeseries_data_component: Optional[str] = None,
+        page_size: Optional[int] = Query(default=None, ge=1, le=100),
+        cursor: Optional[str] = None,
+        view: Literal["full", "summary"] = "full"
+) -> List[Case] | List[CaseSummary]:
     """
     List all cases in Hub. Query params can be used to filter by `customer_id`,
     (partial) `vin`, `workshop_id`, `obd_data_dtc` or
@@ -43,14 +60,38 @@ async def list_cases(
 
     The specified `vin` is matched against the beginning of the stored vehicle
     vins.
-    """
+
+    With `view=summary` only the case metadata and the number of datasets are
+    returned instead of the complete cases.
+
+    Pagination:
+    Cases are paginated if `page_size` (between 1 and 100) or `cursor` is
+    specified. Pages are ordered by case id and the `link` response header
+    as specified in [RFC5988](https://datatracker.ietf.org/doc/html/rfc5988#section-5)
+    contains the URLs of the first and, if existent, the next page. The next
+    page is requested via the `cursor` param, which is the id of the last
+    case on the current page.
+    """  # noqa: E501
+    if cursor is not None and not ObjectId.is_valid(cursor):
+        raise HTTPException(status_code=400, detail="Invalid cursor.")
+    if cursor is not None and page_size is None:
+        page_size = pagination.DEFAULT_CASES_PAGE_SIZE
     cases = await Case.find_in_hub(
         customer_id=customer_id,
         vin=vin,
         workshop_id=workshop_id,
         obd_data_dtc=obd_data_dtc,
-        timeseries_data_component=timeseries_data_component
+        timeseries_data_component=timeseries_data_component,
+        # request one additional case to determine if a next page exists
+        limit=page_size + 1 if page_size is not None else None,
+        after=cursor,
+        view=view
     )
+    if page_size is not None:
+        cases, next_cursor = pagination.cursor_page(cases, page_size)
+        response.headers["link"] = pagination.cursor_link_header(
+            next_cursor=next_cursor, page_size=page_size, url=str(request.url)
+        )
     return cases
 
 
@@ -139,13 +180,28 @@ async def get_timeseries_data(
 @router.get(
     "/cases/{case_id}/timeseries_data/{data_id}/signal",
     status_code=200,
-    response_model=List[float]
+    response_model=List[float],
+    responses=binary_signal_responses
 )
 async def get_timeseries_data_signal(
-        timeseries_data: TimeseriesData = Depends(timeseries_data_by_id)
-) -> List[float]:
-    """Get the signal of a specific timeseries dataset from a case."""
-    return await timeseries_data.get_signal()
+        timeseries_data: TimeseriesData = Depends(timeseries_data_by_id),
+        query: SignalQuery = Depends(signal_query),
+        accept: Optional[str] = Header(default=None)
+) -> List[float] | Response:
+    """
+    Get the signal of a specific timeseries dataset from a case.
+
+    By default, the signal is returned as json list. Clients can request the
+    binary float64 signal data via `Accept: application/octet-stream` or
+    `Accept: application/x-npy`.
+
+    Query params `start`, `stop` and `step` select a section
+    `signal[start:stop:step]`. With `max_points`, longer sections are reduced
+    to a min/max envelope for plotting. For reduced sections, the headers
+    `X-Signal-Start` and `X-Signal-Sample-Distance` map the returned values to
+    sample indices of the full signal.
+    """
+    return await signal_response(timeseries_data, query, accept)
 
 
 @router.get(
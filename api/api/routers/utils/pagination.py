@@ -1,3 +1,6 @@
+from typing import List, Optional, Tuple, Any
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
 from pydantic import PositiveInt, NonNegativeInt
 
 
@@ -120,3 +123,70 @@ def link_header(
     link_header += f'<{last_page_link}>; rel="last"'
 
     return link_header
+
+
+# Page size used if only a cursor is specified when listing cases
+DEFAULT_CASES_PAGE_SIZE = 30
+
+
+def cursor_page(
+        documents: List[Any], page_size: PositiveInt
+) -> Tuple[List[Any], Optional[str]]:
+    """
+    Split documents that were retrieved with limit `page_size + 1` into the
+    requested page and the cursor for the next page. The cursor is the id of
+    the last document on the requested page or None if there is no next
+    page.
+    """
+    _validate_pagination_params(page_size=page_size)
+    if len(documents) <= page_size:
+        return documents, None
+    page = documents[:page_size]
+    return page, str(page[-1].id)
+
+
+def cursor_link_header(
+        next_cursor: Optional[str],
+        page_size: PositiveInt,
+        url: str
+):
+    """
+    Create an [RFC5988](https://datatracker.ietf.org/doc/html/rfc5988#section-5)
+    compliant entry for the `link` header` for cursor based pagination.
+
+    In contrast to page based pagination the position of a page is not
+    described by an index but by the id of the last document on the previous
+    page. Hence, only links to the first and to the next page are available.
+
+    Parameters
+    ----------
+    next_cursor: str
+        Cursor of the next page or None if the requested page is the last one
+    page_size: int
+        The requested page size
+    url: str
+        The requested URl
+
+    Returns
+    -------
+    str
+        Entry to place in the `link` header field.
+    """  # noqa: E501
+    _validate_pagination_params(page_size=page_size)
+    scheme, netloc, path, query, fragment = urlsplit(url)
+    params = [
+        (name, value) for name, value in parse_qsl(query)
+        if name not in ("cursor", "page_size")
+    ]
+    params.append(("page_size", str(page_size)))
+
+    def page_link(extra_params: list) -> str:
+        page_query = urlencode(params + extra_params)
+        return urlunsplit((scheme, netloc, path, page_query, fragment))
+
+    link_header = ""
+    if next_cursor is not None:
+        next_page_link = page_link([("cursor", next_cursor)])
+        link_header += f'<{next_page_link}>; rel="next", '
+    link_header += f'<{page_link([])}>; rel="first"'
+    return link_header
@@ -0,0 +1,167 @@
+import io
+from typing import Optional, AsyncIterator, List
+
+import numpy as np
+from fastapi import Query
+from fastapi.responses import StreamingResponse, Response, JSONResponse
+from pydantic import BaseModel, NonNegativeInt, PositiveInt
+
+from ...data_management import TimeseriesData
+from ...data_management.signal_encoding import SIGNAL_DTYPE
+
+# Media types that can be requested via the `Accept` header to retrieve the
+# binary signal data instead of a json list
+OCTET_STREAM_MEDIA_TYPE = "application/octet-stream"
+NPY_MEDIA_TYPE = "application/x-npy"
+BINARY_SIGNAL_MEDIA_TYPES = (OCTET_STREAM_MEDIA_TYPE, NPY_MEDIA_TYPE)
+
+# OpenAPI documentation of the alternative response media types
+binary_signal_responses = {
+    200: {
+        "description": "The signal as json list or, depending on the "
+                       "`Accept` header, as binary data.",
+        "content": {
+            OCTET_STREAM_MEDIA_TYPE: {},
+            NPY_MEDIA_TYPE: {}
+        }
+    }
+}
+
+
+class SignalQuery(BaseModel):
+    """Query parameters to retrieve (a reduced section of) a signal."""
+    start: Optional[NonNegativeInt] = None
+    stop: Optional[NonNegativeInt] = None
+    step: Optional[PositiveInt] = None
+    max_points: Optional[PositiveInt] = None
+
+    @property
+    def is_full_signal(self) -> bool:
+        return not self.model_dump(exclude_none=True)
+
+
+def signal_query(
+        start: Optional[NonNegativeInt] = Query(
+            default=None, description="Index of the first sample to return."
+        ),
+        stop: Optional[NonNegativeInt] = Query(
+            default=None,
+            description="Index of the sample to stop before (exclusive)."
+        ),
+        step: Optional[PositiveInt] = Query(
+            default=None, description="Only return every step-th sample."
+        ),
+        max_points: Optional[int] = Query(
+            default=None,
+            ge=2,
+            description="Maximum number of values to return. Longer "
+                        "sections are reduced to the minimum and maximum "
+                        "of equally sized buckets."
+        )
+) -> SignalQuery:
+    """Dependency to retrieve signal query parameters."""
+    return SignalQuery(
+        start=start, stop=stop, step=step, max_points=max_points
+    )
+
+
+def requested_binary_media_type(accept: Optional[str]) -> Optional[str]:
+    """
+    Determine which binary media type, if any, is requested via an `Accept`
+    header. The first supported binary media type listed in the header is
+    returned. If no binary media type is listed, None is returned and the
+    client is served with json.
+    """
+    if not accept:
+        return None
+    for media_range in accept.split(","):
+        media_type = media_range.split(";")[0].strip().lower()
+        if media_type in BINARY_SIGNAL_MEDIA_TYPES:
+            return media_type
+    return None
+
+
+def _signal_headers(
+        length: int, start: int = 0, sample_distance: float = 1.
+) -> dict:
+    headers = {
+        "X-Signal-Dtype": SIGNAL_DTYPE,
+        "X-Signal-Length": str(length),
+        "Vary": "Accept"
+    }
+    if start or sample_distance != 1.:
+        # Information to map values to sample indices of the full signal
+        headers["X-Signal-Start"] = str(start)
+        headers["X-Signal-Sample-Distance"] = str(sample_distance)
+    return headers
+
+
+def _npy_header(length: int) -> bytes:
+    """Create the header of a .npy file for a 1-D signal array."""
+    header = io.BytesIO()
+    np.lib.format.write_array_header_1_0(
+        header,
+        {"descr": SIGNAL_DTYPE, "fortran_order": False, "shape": (length,)}
+    )
+    return header.getvalue()
+
+
+async def binary_signal_response(
+        timeseries_data: TimeseriesData, media_type: str
+) -> StreamingResponse:
+    """
+    Stream the signal of a timeseries dataset as raw bytes. Information
+    required to decode the bytes is attached via the headers
+    `X-Signal-Dtype` and `X-Signal-Length`.
+    If `application/x-npy` is requested, the bytes are prefixed with a .npy
+    header, e.g. such that clients can use `numpy.load` directly.
+    """
+    length, chunks = await timeseries_data.stream_signal()
+    prefix = b""
+    if media_type == NPY_MEDIA_TYPE:
+        prefix = _npy_header(length)
+
+    async def content() -> AsyncIterator[bytes]:
+        if prefix:
+            yield prefix
+        async for chunk in chunks:
+            yield chunk
+
+    content_length = len(prefix) + length * np.dtype(SIGNAL_DTYPE).itemsize
+    headers = _signal_headers(length)
+    headers["Content-Length"] = str(content_length)
+    return StreamingResponse(
+        content(), media_type=media_type, headers=headers
+    )
+
+
+async def signal_response(
+        timeseries_data: TimeseriesData,
+        query: SignalQuery,
+        accept: Optional[str]
+) -> List[float] | Response:
+    """
+    Create the response for a signal request. Depending on the `Accept`
+    header the signal is returned as json list or binary. Only the section
+    specified via the query is loaded from the signal store.
+    """
+    media_type = requested_binary_media_type(accept)
+    if query.is_full_signal:
+        if media_type is not None:
+            return await binary_signal_response(timeseries_data, media_type)
+        return await timeseries_data.get_signal()
+
+    signal, sample_distance = await timeseries_data.get_signal_range(
+        **query.model_dump()
+    )
+    headers = _signal_headers(
+        length=signal.size,
+        start=query.start or 0,
+        sample_distance=sample_distance
+    )
+    if media_type is None:
+        return JSONResponse(content=signal.tolist(), headers=headers)
+    content = signal.astype(SIGNAL_DTYPE, copy=False).tobytes()
+    if media_type == NPY_MEDIA_TYPE:
+        content = _npy_header(signal.size) + content
+    return Response(content=content, media_type=media_type, headers=headers)
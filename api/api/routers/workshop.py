@@ -8,7 +8,8 @@ from typing import (
 from bson import ObjectId
 from bson.errors import InvalidId
 from fastapi import (
-    APIRouter, HTTPException, Depends, UploadFile, File, Form
+    APIRouter, HTTPException, Depends, UploadFile, File, Form, Header,
+    Query, Request
 )
 from fastapi.responses import Response
 from motor import motor_asyncio
@@ -17,6 +18,7 @@ from pydantic import NonNegativeInt
 from ..data_management import (
     NewCase,
     Case,
+    CaseSummary,
     CaseUpdate,
     NewOBDData,
     OBDDataUpdate,
@@ -33,11 +35,36 @@ from ..data_management import (
     Customer,
     Diagnosis,
     DiagnosisStatus,
-    AttachmentBucket
+    AttachmentBucket,
+    NewTimeseriesUpload,
+    TimeseriesUpload,
+    UploadOffsetMismatch,
+    UploadSizeExceeded
 )
-from ..diagnostics_management import DiagnosticTaskManager
+from .utils import pagination
+from .utils.signal import (
+    SignalQuery,
+    binary_signal_responses,
+    signal_query,
+    signal_response
+)
+from ..diagnostics_management import DiagnosticTaskManager, task_dispatcher
 from ..security.token_auth import authorized_workshop_id
-from ..upload_filereader import filereader_factory, FileReaderException
+from ..upload_filereader import (
+    FileReaderException,
+    OBD_FORMATS,
+    ParseExecutorSaturated,
+    TIMESERIES_FORMATS,
+    filereader_factory,
+    parse_executor
+)
+
+# Page size used if only a cursor is specified when listing diagnoses
+DEFAULT_DIAGNOSES_PAGE_SIZE = 30
+
+# Seconds clients are asked to wait before retrying an upload that was
+# rejected because the parse executor is saturated
+PARSE_RETRY_AFTER_SECONDS = 5
 
 tags_metadata = [
     {
@@ -60,16 +87,21 @@ router = APIRouter(dependencies=[Depends(authorized_workshop_id)])
 @router.get(
     "/{workshop_id}/cases",
     status_code=200,
-    response_model=List[Case],
+    response_model=List[Case] | List[CaseSummary],
     tags=["Workshop - Case Management"]
 )
 async def list_cases(
+        response: Response,
+        request: Request,
         workshop_id: str,
         customer_id: Optional[str] = None,
         vin: Optional[str] = None,
         obd_data_dtc: Optional[str] = None,
-        timeseries_data_component: Optional[str] = None
-) -> List[Case]:
+        timeseries_data_component: Optional[str] = None,
+        page_size: Optional[int] = Query(default=None, ge=1, le=100),
+        cursor: Optional[str] = None,
+        view: Literal["full", "summary"] = "full"
+) -> List[Case] | List[CaseSummary]:
     """
     List all cases in Hub. Query params can be used to filter by `customer_id`,
     (partial) `vin`, `workshop_id`, `obd_data_dtc` or
@@ -77,14 +109,38 @@ async def list_cases(
 
     The specified `vin` is matched against the beginning of the stored vehicle
     vins.
-    """
+
+    With `view=summary` only the case metadata and the number of datasets are
+    returned instead of the complete cases.
+
+    Pagination:
+    Cases are paginated if `page_size` (between 1 and 100) or `cursor` is
+    specified. Pages are ordered by case id and the `link` response header
+    as specified in [RFC5988](https://datatracker.ietf.org/doc/html/rfc5988#section-5)
+    contains the URLs of the first and, if existent, the next page. The next
+    page is requested via the `cursor` param, which is the id of the last
+    case on the current page.
+    """  # noqa: E501
+    if cursor is not None and not ObjectId.is_valid(cursor):
+        raise HTTPException(status_code=400, detail="Invalid cursor.")
+    if cursor is not None and page_size is None:
+        page_size = pagination.DEFAULT_CASES_PAGE_SIZE
     cases = await Case.find_in_hub(
         customer_id=customer_id,
         vin=vin,
         workshop_id=workshop_id,
         obd_data_dtc=obd_data_dtc,
-        timeseries_data_component=timeseries_data_component
+        timeseries_data_component=timeseries_data_component,
+        # request one additional case to determine if a next page exists
+        limit=page_size + 1 if page_size is not None else None,
+        after=cursor,
+        view=view
     )
+    if page_size is not None:
+        cases, next_cursor = pagination.cursor_page(cases, page_size)
+        response.headers["link"] = pagination.cursor_link_header(
+            next_cursor=next_cursor, page_size=page_size, url=str(request.url)
+        )
     return cases
 
 
@@ -244,14 +300,25 @@ async def add_timeseries_data(
     return case
 
 
-def read_file_or_400(upload: UploadFile, file_format: str) -> list:
+async def read_file_or_400(
+        upload: UploadFile, file_format: str, **reader_options
+) -> list:
     """
     Helper that attempts to read an uploaded file based on a user specified
-    format and raises a 400 if file reading fails.
+    format and raises a 400 if file reading fails. Additional options are
+    passed to the file reader. Files are parsed by the parse executor and a
+    503 is raised if it is saturated.
     """
-    reader = filereader_factory.get_reader(file_format)
     try:
-        read_result = reader.read_file(upload.file)
+        read_result = await parse_executor.read_file(
+            file_format, upload.file, **reader_options
+        )
+    except ParseExecutorSaturated:
+        raise HTTPException(
+            status_code=503,
+            detail="Too many uploads are being processed. Try again later.",
+            headers={"Retry-After": str(PARSE_RETRY_AFTER_SECONDS)}
+        )
     except FileReaderException:
         raise HTTPException(
             status_code=400,
@@ -261,6 +328,21 @@ def read_file_or_400(upload: UploadFile, file_format: str) -> list:
     return read_result
 
 
+def detect_format_or_400(upload: UploadFile, file_formats: list) -> str:
+    """
+    Helper that detects the format of an uploaded file among file_formats
+    and raises a 400 if the format is not recognized.
+    """
+    file_format = filereader_factory.detect_format(upload.file, file_formats)
+    if file_format is None:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Could not detect the format of file '{upload.filename}'."
+                   f" Supported formats are {', '.join(file_formats)}."
+        )
+    return file_format
+
+
 def channel_description_form(
         component_A: str = Form(
             default=None, description="The investigated vehicle component"
@@ -302,7 +384,7 @@ def channel_description_form(
     }
 
 
-def process_picoscope_upload(
+async def process_picoscope_upload(
         upload: UploadFile = File(description="Picoscope Data File"),
         file_format: Literal["Picoscope MAT", "Picoscope CSV"] = Form(
             default="Picoscope MAT"
@@ -313,9 +395,22 @@ def process_picoscope_upload(
     Helper to preprocess picoscope upload and user-provided channel
     descriptions.
     """
-    # Read the uploaded file.
-    read_results = read_file_or_400(upload, file_format)
+    # Read the uploaded file. Signals are kept as numpy arrays.
+    read_results = await read_file_or_400(
+        upload, file_format, as_array=True
+    )
+    return select_picoscope_channels(
+        read_results, channel_description, upload.filename
+    )
+
 
+def select_picoscope_channels(
+        read_results: list, channel_description: dict, filename: str
+) -> list:
+    """
+    Helper to select the read results of picoscope channels with
+    user-provided description.
+    """
     # Only select results that have a specified component.
     selected_results = []
     for channel, description in channel_description.items():
@@ -346,7 +441,7 @@ def process_picoscope_upload(
                     status_code=400,
                     detail=f"A component was specified for channel "
                            f"'{channel}' but this channel is not found in "
-                           f"file '{upload.filename}'."
+                           f"file '{filename}'."
                 )
 
     return selected_results
@@ -362,10 +457,9 @@ async def upload_picoscope_data(
         processed_upload: list = Depends(process_picoscope_upload),
         case: Case = Depends(case_from_workshop)
 ) -> Case:
-    for data in processed_upload:
-        case = await case.add_timeseries_data(
-            NewTimeseriesData(**data)
-        )
+    case = await case.add_timeseries_data_many(
+        [NewTimeseriesData(**data) for data in processed_upload]
+    )
     return case
 
 
@@ -394,7 +488,9 @@ async def upload_omniview_data(
         case: Case = Depends(case_from_workshop)
 ) -> Case:
     """Upload an Omniview csv export to a case."""
-    data = read_file_or_400(upload, file_format)[0]
+    data = (
+        await read_file_or_400(upload, file_format, streaming=True)
+    )[0]
     data["component"] = component
     data["sampling_rate"] = sampling_rate
     data["duration"] = duration
@@ -405,6 +501,251 @@ async def upload_omniview_data(
     return case
 
 
+@router.post(
+    "/{workshop_id}/cases/{case_id}/timeseries_data/upload",
+    status_code=201,
+    response_model=Case,
+    tags=["Workshop - Data Management"]
+)
+async def upload_timeseries_data(
+        upload: UploadFile = File(
+            description="Picoscope or Omniview Data File"
+        ),
+        channel_description: dict = Depends(channel_description_form),
+        component: Optional[str] = Form(
+            default=None,
+            description="Omniview uploads: The investigated vehicle component"
+        ),
+        sampling_rate: Optional[NonNegativeInt] = Form(
+            default=None,
+            description="Omniview uploads: Sampling rate of measurement [Hz]"
+        ),
+        duration: Optional[NonNegativeInt] = Form(
+            default=None,
+            description="Omniview uploads: Duration of measurement [s]"
+        ),
+        label: TimeseriesDataLabel = Form(
+            default=TimeseriesDataLabel.unknown,
+            description="Omniview uploads: Label for the oscillogram"
+        ),
+        case: Case = Depends(case_from_workshop)
+) -> Case:
+    """
+    Upload a timeseries data file to a case. The file format is detected
+    from the head of the file. Picoscope uploads require channel
+    descriptions, Omniview uploads require component, sampling_rate and
+    duration.
+    """
+    file_format = detect_format_or_400(upload, TIMESERIES_FORMATS)
+    if file_format == "Omniview CSV":
+        if None in (component, sampling_rate, duration):
+            raise HTTPException(
+                status_code=400,
+                detail="component, sampling_rate and duration are required "
+                       "for Omniview uploads."
+            )
+        data = (
+            await read_file_or_400(upload, file_format, streaming=True)
+        )[0]
+        data["component"] = component
+        data["sampling_rate"] = sampling_rate
+        data["duration"] = duration
+        data["label"] = label
+        selected_results = [data]
+    else:
+        read_results = await read_file_or_400(
+            upload, file_format, as_array=True
+        )
+        selected_results = select_picoscope_channels(
+            read_results, channel_description, upload.filename
+        )
+    case = await case.add_timeseries_data_many(
+        [NewTimeseriesData(**data) for data in selected_results]
+    )
+    return case
+
+
+async def timeseries_upload_from_case(
+        upload_id: str, case: Case = Depends(case_from_workshop)
+) -> TimeseriesUpload:
+    """
+    Shared dependency for all endpoints with path root
+    '/{workshop_id}/cases/{case_id}/timeseries_data/uploads/{upload_id}'.
+    Returns the upload with id {upload_id} if it belongs to the case.
+    Otherwise a 404 Not Found is raised.
+    """
+    no_upload_with_id_exception = HTTPException(
+        status_code=404,
+        detail=f"No upload with id '{upload_id}' found for case "
+               f"'{case.id}'."
+    )
+    try:
+        document_id: ObjectId = ObjectId(upload_id)
+    except InvalidId:
+        raise no_upload_with_id_exception
+
+    upload = await TimeseriesUpload.get(document_id)
+    if upload is None or upload.case_id != case.id:
+        raise no_upload_with_id_exception
+    return upload
+
+
+@router.post(
+    "/{workshop_id}/cases/{case_id}/timeseries_data/uploads",
+    status_code=201,
+    response_model=TimeseriesUpload,
+    tags=["Workshop - Data Management"]
+)
+async def start_timeseries_upload(
+        new_upload: NewTimeseriesUpload,
+        case: Case = Depends(case_from_workshop)
+) -> TimeseriesUpload:
+    """
+    Start a chunked upload of a timeseries data file. The file is sent in
+    chunks via PUT and added to the case when the upload is finalized.
+    """
+    upload = TimeseriesUpload(
+        **new_upload.model_dump(),
+        workshop_id=case.workshop_id,
+        case_id=case.id
+    )
+    await upload.create()
+    return upload
+
+
+@router.get(
+    "/{workshop_id}/cases/{case_id}/timeseries_data/uploads/{upload_id}",
+    status_code=200,
+    response_model=TimeseriesUpload,
+    tags=["Workshop - Data Management"]
+)
+async def get_timeseries_upload(
+        upload: TimeseriesUpload = Depends(timeseries_upload_from_case)
+) -> TimeseriesUpload:
+    """
+    Get the state of a chunked upload. An interrupted upload is resumed by
+    sending the next chunk at offset `received`.
+    """
+    return upload
+
+
+@router.put(
+    "/{workshop_id}/cases/{case_id}/timeseries_data/uploads/{upload_id}",
+    status_code=200,
+    response_model=TimeseriesUpload,
+    tags=["Workshop - Data Management"]
+)
+async def put_timeseries_upload_chunk(
+        request: Request,
+        offset: NonNegativeInt = Query(
+            description="Byte offset of the chunk within the file. Has to "
+                        "match the number of bytes received so far."
+        ),
+        upload: TimeseriesUpload = Depends(timeseries_upload_from_case)
+) -> TimeseriesUpload:
+    """
+    Send the next chunk of a chunked upload as raw request body. The chunk
+    is stored while it is received.
+    """
+    try:
+        upload = await upload.add_chunk(offset, request.stream())
+    except UploadOffsetMismatch as e:
+        raise HTTPException(
+            status_code=409,
+            detail=str(e),
+            headers={"Upload-Offset": str(e.expected_offset)}
+        )
+    except UploadSizeExceeded as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    return upload
+
+
+@router.post(
+    "/{workshop_id}/cases/{case_id}/timeseries_data/uploads/{upload_id}"
+    "/finalize",
+    status_code=201,
+    response_model=Case,
+    tags=["Workshop - Data Management"]
+)
+async def finalize_timeseries_upload(
+        upload: TimeseriesUpload = Depends(timeseries_upload_from_case),
+        case: Case = Depends(case_from_workshop)
+) -> Case:
+    """
+    Finalize a chunked upload. The file is read and the timeseries data is
+    added to the case. Uploads that can not be added, e.g. because the file
+    can not be read, are discarded. An upload can only be finalized once,
+    concurrent requests are rejected with 409.
+    """
+    if not upload.complete:
+        raise HTTPException(
+            status_code=409,
+            detail=f"Upload is incomplete. Received {upload.received} of "
+                   f"{upload.size} bytes.",
+            headers={"Upload-Offset": str(upload.received)}
+        )
+    if not await upload.start_finalization():
+        raise HTTPException(
+            status_code=409,
+            detail="Upload is already being finalized."
+        )
+    try:
+        file = await upload.open_file()
+        try:
+            uploaded_file = UploadFile(file=file, filename=upload.filename)
+            if upload.file_format == "Omniview CSV":
+                data = (
+                    await read_file_or_400(
+                        uploaded_file, upload.file_format, streaming=True
+                    )
+                )[0]
+                data["component"] = upload.component
+                data["sampling_rate"] = upload.sampling_rate
+                data["duration"] = upload.duration
+                data["label"] = upload.label
+                selected_results = [data]
+            else:
+                read_results = await read_file_or_400(
+                    uploaded_file, upload.file_format, as_array=True
+                )
+                selected_results = select_picoscope_channels(
+                    read_results,
+                    {
+                        channel: description.model_dump()
+                        for channel, description in upload.channels.items()
+                    },
+                    upload.filename
+                )
+        finally:
+            file.close()
+        case = await case.add_timeseries_data_many(
+            [NewTimeseriesData(**data) for data in selected_results]
+        )
+    except BaseException as e:
+        if isinstance(e, HTTPException) and e.status_code == 400:
+            await upload.discard()
+        else:
+            # finalization can be retried, e.g. after a 503
+            await upload.cancel_finalization()
+        raise
+
+    await upload.discard()
+    return case
+
+
+@router.delete(
+    "/{workshop_id}/cases/{case_id}/timeseries_data/uploads/{upload_id}",
+    status_code=200,
+    response_model=None,
+    tags=["Workshop - Data Management"]
+)
+async def abort_timeseries_upload(
+        upload: TimeseriesUpload = Depends(timeseries_upload_from_case)
+) -> None:
+    """Abort a chunked upload and delete all received chunks."""
+    await upload.discard()
+
+
 @router.get(
     "/{workshop_id}/cases/{case_id}/timeseries_data/{data_id}",
     status_code=200,
@@ -427,15 +768,32 @@ async def get_timeseries_data(
 @router.get(
     "/{workshop_id}/cases/{case_id}/timeseries_data/{data_id}/signal",
     status_code=200,
+    response_model=List[float],
+    responses=binary_signal_responses,
     tags=["Workshop - Data Management"]
 )
 async def get_timeseries_data_signal(
-        data_id: NonNegativeInt, case: Case = Depends(case_from_workshop)
-) -> List[float]:
-    """Get the signal of a specific timeseries dataset from a case."""
+        data_id: NonNegativeInt,
+        case: Case = Depends(case_from_workshop),
+        query: SignalQuery = Depends(signal_query),
+        accept: Optional[str] = Header(default=None)
+) -> List[float] | Response:
+    """
+    Get the signal of a specific timeseries dataset from a case.
+
+    By default, the signal is returned as json list. Clients can request the
+    binary float64 signal data via `Accept: application/octet-stream` or
+    `Accept: application/x-npy`.
+
+    Query params `start`, `stop` and `step` select a section
+    `signal[start:stop:step]`. With `max_points`, longer sections are reduced
+    to a min/max envelope for plotting. For reduced sections, the headers
+    `X-Signal-Start` and `X-Signal-Sample-Distance` map the returned values to
+    sample indices of the full signal.
+    """
     timeseries_data = case.get_timeseries_data(data_id)
     if timeseries_data is not None:
-        return await timeseries_data.get_signal()
+        return await signal_response(timeseries_data, query, accept)
     else:
         exception_detail = f"No timeseries_data with data_id `{data_id}` in " \
                            f"case '{case.id}'. Available data_ids are " \
@@ -518,7 +876,30 @@ async def upload_vcds_data(
         file_format: Literal["VCDS TXT"] = Form(default="VCDS TXT"),
         case: Case = Depends(case_from_workshop)
 ) -> Case:
-    data = read_file_or_400(upload, file_format)[0]
+    data = (await read_file_or_400(upload, file_format))[0]
+    data = data["obd_data"]
+    case = await case.add_obd_data(
+        NewOBDData(**data)
+    )
+    return case
+
+
+@router.post(
+    "/{workshop_id}/cases/{case_id}/obd_data/upload",
+    status_code=201,
+    response_model=Case,
+    tags=["Workshop - Data Management"]
+)
+async def upload_obd_data(
+        upload: UploadFile = File(description="OBD Data File"),
+        case: Case = Depends(case_from_workshop)
+) -> Case:
+    """
+    Upload an OBD data file to a case. The file format is detected from the
+    head of the file.
+    """
+    file_format = detect_format_or_400(upload, OBD_FORMATS)
+    data = (await read_file_or_400(upload, file_format))[0]
     data = data["obd_data"]
     case = await case.add_obd_data(
         NewOBDData(**data)
@@ -696,15 +1077,20 @@ async def start_diagnosis(
             raise HTTPException(status_code=500, detail=exception_detail)
         else:
             diag = Diagnosis(
+                id=ObjectId(),
                 case_id=case.id,
+                workshop_id=case.workshop_id,
                 status=DiagnosisStatus("scheduled")
             )
+            # New diagnosis is handed over to diagnostic backend. The hand
+            # over is recorded first, such that no diagnosis is left without
+            # being processed. It is published once the case links the
+            # diagnosis.
+            await manage_diagnostic_task(diag.id)
             await diag.create()
             case.diagnosis_id = diag.id
             await case.save()
-
-            # New diagnosis is handed over to diagnostic backend
-            await manage_diagnostic_task(case.diagnosis_id)
+            task_dispatcher.wakeup()
 
     return diag
 
@@ -755,10 +1141,38 @@ async def get_diagnosis_attachment(
     tags=["Workshop - Diagnostics"]
 )
 async def list_diagnoses(
-        workshop_id: str, status: Optional[DiagnosisStatus] = None
+        response: Response,
+        request: Request,
+        workshop_id: str,
+        status: Optional[DiagnosisStatus] = None,
+        page_size: Optional[int] = Query(default=None, ge=1, le=100),
+        cursor: Optional[str] = None
 ) -> List[Diagnosis]:
-    """List all diagnoses of a workshop, optionally filtered by status."""
+    """
+    List all diagnoses of a workshop, optionally filtered by status.
+
+    Pagination:
+    Diagnoses are paginated if `page_size` (between 1 and 100) or `cursor` is
+    specified. Pages are ordered by diagnosis id and the `link` response
+    header as specified in [RFC5988](https://datatracker.ietf.org/doc/html/rfc5988#section-5)
+    contains the URLs of the first and, if existent, the next page. The next
+    page is requested via the `cursor` param, which is the id of the last
+    diagnosis on the current page.
+    """  # noqa: E501
+    if cursor is not None and not ObjectId.is_valid(cursor):
+        raise HTTPException(status_code=400, detail="Invalid cursor.")
+    if cursor is not None and page_size is None:
+        page_size = DEFAULT_DIAGNOSES_PAGE_SIZE
     diagnoses = await Diagnosis.find_in_hub(
-        workshop_id=workshop_id, status=status
+        workshop_id=workshop_id,
+        status=status,
+        # request one additional diagnosis to determine if a next page exists
+        limit=page_size + 1 if page_size is not None else None,
+        after=cursor
     )
+    if page_size is not None:
+        diagnoses, next_cursor = pagination.cursor_page(diagnoses, page_size)
+        response.headers["link"] = pagination.cursor_link_header(
+            next_cursor=next_cursor, page_size=page_size, url=str(request.url)
+        )
     return diagnoses
@@ -1,5 +1,41 @@
+import asyncio
+import functools
+import logging
+import time
+from typing import Optional, Dict
+
 import httpx
-from typing import Optional
+from jose import jwk
+from jose.exceptions import JOSEError
+from pydantic import BaseModel
+
+logger = logging.getLogger(__name__)
+
+
+@functools.lru_cache(maxsize=64)
+def normalize_public_key(key: str) -> str:
+    """
+    Serialize a pem encoded public key in a canonical form, such that keys
+    retrieved from the realm endpoint and the JWKS endpoint can be compared.
+    Keys that can not be parsed are returned as they are.
+    """
+    try:
+        return jwk.construct(key, algorithm="RS256").to_pem().decode()
+    except JOSEError:
+        return key
+
+
+class RealmKeys(BaseModel):
+    """Cached public keys of a realm."""
+    # pem encoded active public key of the realm
+    public_key: str
+    # pem encoded signature keys of the realm by key id
+    keys_by_kid: Dict[str, str] = {}
+    # time.monotonic() of retrieval
+    retrieved_at: float
+
+    def age(self) -> float:
+        return time.monotonic() - self.retrieved_at
 
 
 class Keycloak:
@@ -8,13 +44,35 @@ class Keycloak:
     _url: Optional[str] = None  # root url or the keycloak server
     _workshop_realm: Optional[str] = None  # name of realm with workshop users
 
+    # Public keys are cached to keep keycloak requests out of the request
+    # path. Keys are refreshed in the background after _key_ttl seconds and
+    # at most every _min_refresh_interval seconds if a token can not be
+    # verified with the cached keys, e.g. after a key rotation.
+    _key_ttl: float = 300.
+    _min_refresh_interval: float = 10.
+    _keys: Dict[str, RealmKeys] = {}
+    _last_forced_refresh: Dict[str, float] = {}
+    _refresh_lock: Optional[asyncio.Lock] = None
+    _refresh_task: Optional[asyncio.Task] = None
+
     @classmethod
-    def configure(cls, url: str, workshop_realm: str):
+    def configure(
+            cls,
+            url: str,
+            workshop_realm: str,
+            key_ttl: float = 300.,
+            min_refresh_interval: float = 10.
+    ):
         """Configure keycloak connection details."""
         cls._url = url
         cls._workshop_realm = workshop_realm
-        # confirm working configuration
-        cls.get_public_key_for_workshop_realm()
+        cls._key_ttl = key_ttl
+        cls._min_refresh_interval = min_refresh_interval
+        cls._keys = {}
+        cls._last_forced_refresh = {}
+        cls._refresh_lock = None
+        # confirm working configuration and fill key cache
+        cls.refresh_public_keys(realm=workshop_realm)
 
     @classmethod
     def get_public_key(cls, realm: str) -> str | None:
@@ -29,9 +87,129 @@ class Keycloak:
                  f"-----END PUBLIC KEY-----"
         return pubkey
 
+    @classmethod
+    def get_signature_keys(cls, realm: str) -> Dict[str, str]:
+        """
+        Get all public rsa signature keys of a realm from the keycloak JWKS
+        endpoint. Returns pem encoded keys by key id.
+        """
+        if cls._url is None:
+            return {}
+        response = httpx.get(
+            f"{cls._url}/realms/{realm}/protocol/openid-connect/certs"
+        )
+        response.raise_for_status()
+        keys = {}
+        for key in response.json().get("keys", []):
+            if key.get("kty") != "RSA" or key.get("use", "sig") != "sig":
+                continue
+            try:
+                pem = jwk.construct(key, algorithm="RS256").to_pem()
+            except JOSEError:
+                logger.warning(f"Ignoring invalid key {key.get('kid')}.")
+                continue
+            keys[key["kid"]] = pem.decode()
+        return keys
+
+    @classmethod
+    def refresh_public_keys(cls, realm: str) -> RealmKeys | None:
+        """Retrieve the public keys of a realm from keycloak and cache them."""
+        public_key = cls.get_public_key(realm=realm)
+        if public_key is None:
+            return None
+        realm_keys = RealmKeys(
+            public_key=public_key,
+            keys_by_kid=cls.get_signature_keys(realm=realm),
+            retrieved_at=time.monotonic()
+        )
+        cls._keys[realm] = realm_keys
+        return realm_keys
+
     @classmethod
     def get_public_key_for_workshop_realm(cls) -> str | None:
-        """Get public rsa key for the workshop realm."""
+        """
+        Get public rsa key for the workshop realm. The key is served from
+        cache and only retrieved from keycloak if the cache is empty.
+        """
         if cls._workshop_realm is None:
             return None
-        return cls.get_public_key(realm=cls._workshop_realm)
+        realm_keys = cls._keys.get(cls._workshop_realm)
+        if realm_keys is None:
+            realm_keys = cls.refresh_public_keys(realm=cls._workshop_realm)
+        if realm_keys is None:
+            return None
+        return realm_keys.public_key
+
+    @classmethod
+    async def get_rotated_public_key_for_workshop_realm(
+            cls, kid: Optional[str]
+    ) -> str | None:
+        """
+        Get the public key with id kid for the workshop realm after a token
+        could not be verified with the active public key. If the key is not
+        cached, the keys are retrieved from keycloak once, unless this was
+        already done within the last _min_refresh_interval seconds.
+        """
+        realm = cls._workshop_realm
+        if realm is None:
+            return None
+        realm_keys = cls._keys.get(realm)
+        if realm_keys is not None and kid in realm_keys.keys_by_kid:
+            return realm_keys.keys_by_kid[kid]
+
+        if cls._refresh_lock is None:
+            cls._refresh_lock = asyncio.Lock()
+        async with cls._refresh_lock:
+            # concurrent requests wait for a single refresh
+            last_refresh = cls._last_forced_refresh.get(realm)
+            now = time.monotonic()
+            if last_refresh is None or \
+                    now - last_refresh >= cls._min_refresh_interval:
+                cls._last_forced_refresh[realm] = now
+                try:
+                    realm_keys = await asyncio.to_thread(
+                        cls.refresh_public_keys, realm
+                    )
+                except httpx.HTTPError as e:
+                    logger.warning(f"Could not refresh keys of {realm}: {e}")
+                    return None
+            else:
+                realm_keys = cls._keys.get(realm)
+
+        if realm_keys is None:
+            return None
+        return realm_keys.keys_by_kid.get(kid, realm_keys.public_key)
+
+    @classmethod
+    async def refresh_keys_periodically(cls):
+        """Refresh the cached keys of all realms once they exceed the TTL."""
+        while True:
+            for realm, realm_keys in list(cls._keys.items()):
+                if realm_keys.age() < cls._key_ttl:
+                    continue
+                try:
+                    await asyncio.to_thread(cls.refresh_public_keys, realm)
+                except Exception as e:
+                    # keep serving the cached keys
+                    logger.warning(f"Could not refresh keys of {realm}: {e}")
+            await asyncio.sleep(min(cls._key_ttl, 60.))
+
+    @classmethod
+    def start_key_refresh(cls):
+        """Start periodically refreshing the key cache in the background."""
+        if cls._refresh_task is None or cls._refresh_task.done():
+            cls._refresh_task = asyncio.create_task(
+                cls.refresh_keys_periodically()
+            )
+
+    @classmethod
+    async def stop_key_refresh(cls):
+        """Stop refreshing the key cache in the background."""
+        if cls._refresh_task is None:
+            return
+        cls._refresh_task.cancel()
+        try:
+            await cls._refresh_task
+        except asyncio.CancelledError:
+            pass
+        cls._refresh_task = None
@@ -1,10 +1,16 @@
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
 from fastapi import Depends, HTTPException, status, Path
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
-from jose import jwt, JWTError
+from jose import jwt, JWTError, JOSEError
+from jose.exceptions import ExpiredSignatureError, JWTClaimsError
 from pydantic import BaseModel, Field, model_validator
 
 
-from .keycloak import Keycloak
+from .keycloak import Keycloak, normalize_public_key
 
 # required role to access workshop specific resources
 REQUIRED_WORKSHOP_ROLE = "workshop"
@@ -14,6 +20,8 @@ REQUIRED_SHARED_ROLE = "shared"
 REQUIRED_CUSTOMERS_ROLE = "customers"
 # required role for asset data management
 REQUIRED_ASSETS_ROLE = "assets"
+# required role for knowledge graph management, e.g. dropping cached data
+REQUIRED_KNOWLEDGE_ROLE = "knowledge"
 
 
 failed_auth_exception = HTTPException(
@@ -35,6 +43,84 @@ class TokenData(BaseModel):
         return values
 
 
+class VerifiedTokenCache:
+    """
+    Bounded LRU cache of verified tokens. Tokens are cached together with the
+    key used for verification, such that a token is only served from cache
+    as long as the key is in use. Entries are evicted once the token
+    expires.
+    """
+
+    def __init__(self, max_size: int = 1024):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, Tuple[TokenData, float]] = \
+            OrderedDict()
+
+    @staticmethod
+    def _cache_key(token: str, key: str) -> str:
+        return hashlib.sha256(f"{key}\0{token}".encode()).hexdigest()
+
+    def get(self, token: str, key: str) -> Optional[TokenData]:
+        """Get data of a cached token if it is not expired."""
+        cache_key = self._cache_key(token, key)
+        entry = self._entries.get(cache_key)
+        if entry is not None and entry[1] <= time.time():
+            del self._entries[cache_key]
+            entry = None
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(cache_key)
+        self.hits += 1
+        return entry[0]
+
+    def put(
+            self, token: str, key: str, token_data: TokenData, exp: float
+    ) -> None:
+        """Cache data of a verified token that expires at exp."""
+        if self.max_size <= 0:
+            return
+        cache_key = self._cache_key(token, key)
+        self._entries[cache_key] = (token_data, exp)
+        self._entries.move_to_end(cache_key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self) -> dict:
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses
+        }
+
+
+verified_token_cache = VerifiedTokenCache()
+
+
+def _decode_token(token: str, key: str) -> TokenData:
+    """
+    Decode and verify a JWT with the given key. Tokens are served from
+    verified_token_cache if possible.
+    """
+    token_data = verified_token_cache.get(token, key)
+    if token_data is not None:
+        return token_data
+    payload = jwt.decode(token, key, options={"verify_aud": False})
+    token_data = TokenData(**payload)
+    if payload.get("exp") is not None:
+        # tokens without expiration are not cached
+        verified_token_cache.put(token, key, token_data, payload["exp"])
+    return token_data
+
+
 async def require_token(
         credentials: HTTPAuthorizationCredentials = Depends(
             HTTPBearer(bearerFormat="JWT")
@@ -48,11 +134,33 @@ async def verify_token(
         token: str = Depends(require_token),
         jwt_pub_key: str = Depends(Keycloak.get_public_key_for_workshop_realm)
 ) -> TokenData:
-    """Decode and verify a JWT and parse data from payload."""
+    """
+    Decode and verify a JWT and parse data from payload. If the token can not
+    be verified with the active public key, the key referenced by the token
+    header is tried, e.g. to handle key rotations in keycloak.
+    """
     try:
-        payload = jwt.decode(token, jwt_pub_key, options={"verify_aud": False})
-        return TokenData(**payload)
+        return _decode_token(token, jwt_pub_key)
+    except (ExpiredSignatureError, JWTClaimsError):
+        # signature is valid, another key would not change the result
+        raise failed_auth_exception
     except JWTError:
+        pass
+
+    try:
+        kid = jwt.get_unverified_header(token).get("kid")
+    except JWTError:
+        raise failed_auth_exception
+    rotated_pub_key = await Keycloak.get_rotated_public_key_for_workshop_realm(
+        kid=kid
+    )
+    if rotated_pub_key is None or normalize_public_key(
+            rotated_pub_key
+    ) == normalize_public_key(jwt_pub_key):
+        raise failed_auth_exception
+    try:
+        return _decode_token(token, rotated_pub_key)
+    except JOSEError:
         raise failed_auth_exception
 
 
@@ -117,3 +225,14 @@ async def authorized_assets_access(
     """
     if REQUIRED_ASSETS_ROLE not in token_data.roles:
         raise failed_auth_exception
+
+
+async def authorized_knowledge_management(
+        token_data: TokenData = Depends(verify_token)
+):
+    """
+    Authorize management of knowledge resources if the user is assigned the
+    respective role.
+    """
+    if REQUIRED_KNOWLEDGE_ROLE not in token_data.roles:
+        raise failed_auth_exception
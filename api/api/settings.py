@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import Optional, Literal
 
 from pydantic_settings import BaseSettings
 
@@ -14,18 +14,78 @@ class Settings(BaseSettings):
     redis_host: str = "redis"
     redis_port: str = "6379"
 
+    # Dispatching of diagnostic tasks to the broker, see
+    # diagnostics_management.task_dispatcher. Recorded tasks are dispatched
+    # immediately and pending tasks are looked up every
+    # task_dispatch_interval seconds. The n-th retry of a failed dispatch is
+    # delayed by task_dispatch_retry_backoff * 2^(n-1) seconds, at most by
+    # task_dispatch_max_backoff seconds.
+    task_dispatch_interval: float = 5.
+    task_dispatch_batch_size: int = 100
+    task_dispatch_retry_backoff: float = 1.
+    task_dispatch_max_backoff: float = 300.
+
+    # Storage format of new timeseries signals, see
+    # data_management.signal_encoding
+    signal_storage_dtype: Literal["float64", "float32", "int16"] = "float64"
+    signal_storage_compression: Literal["none", "zlib"] = "none"
+
     knowledge_graph_url: Optional[str] = "http://knowledge-graph:3030"
+    knowledge_graph_timeout: float = 10.
+    knowledge_graph_max_connections: int = 10
+    knowledge_graph_max_keepalive_connections: int = 5
+    # Seconds for which knowledge graph query results are served from cache.
+    # Afterwards, they are served for up to knowledge_cache_max_stale
+    # seconds while being refreshed in the background.
+    knowledge_cache_ttl: float = 300.
+    knowledge_cache_max_stale: float = 3600.
+    # Maximum number of memoised lookups, e.g. suspect components of a DTC
+    knowledge_query_cache_size: int = 4096
+    # Maximum number of values looked up with a single query
+    knowledge_query_batch_size: int = 100
 
     keycloak_url: str = "http://keycloak:8080"
     keycloak_workshop_realm: str = "werkstatt-hub"
+    # Seconds after which cached realm keys are refreshed in the background
+    keycloak_key_ttl: float = 300.
+    # Minimum seconds between refreshes caused by unverifiable tokens
+    keycloak_min_key_refresh_interval: float = 10.
+    # Maximum number of verified tokens to cache, 0 disables the cache
+    verified_token_cache_size: int = 1024
+
+    # Executor used to parse uploaded files, see
+    # upload_filereader.parse_executor
+    parse_executor: Literal["process", "thread"] = "process"
+    parse_executor_workers: int = 2
+    # Maximum number of files parsed or waiting for a worker. Further
+    # uploads are rejected with 503.
+    parse_executor_max_pending: int = 8
+
+    # Seconds between runs of the collector reclaiming GridFS files that are
+    # not referenced anymore, see data_management.orphan_collector. 0
+    # disables the collector.
+    orphan_collection_interval: float = 3600.
+    orphan_collection_batch_size: int = 1000
+    # Minimum age in seconds of files to reclaim
+    orphan_min_age: float = 3600.
 
     nautilus_url: str = "http://nautilus:3000/nautilus"
     nautilus_timeout: int = 120
+    # Connection pool of the nautilus client
+    nautilus_max_connections: int = 10
+    nautilus_max_keepalive_connections: int = 5
+    nautilus_keepalive_expiry: float = 30.
+    # Retries of idempotent requests to nautilus, e.g. revocations. The
+    # n-th retry is delayed by nautilus_retry_backoff * 2^(n-1) seconds.
+    nautilus_max_retries: int = 3
+    nautilus_retry_backoff: float = 0.5
 
     api_key_diagnostics: str
 
     api_key_assets: str
 
+    api_key_metrics: str
+
     exclude_diagnostics_router: bool = False
 
     @property
@@ -1,7 +1,13 @@
 __all__ = [
     "filereader_factory",
-    "FileReaderException"
+    "FileReaderException",
+    "OBD_FORMATS",
+    "parse_executor",
+    "ParseExecutorSaturated",
+    "TIMESERIES_FORMATS"
 ]
 
 from .filereader_factory import filereader_factory
 from .filereader import FileReaderException
+from .formats.formats import OBD_FORMATS, TIMESERIES_FORMATS
+from .parse_executor import parse_executor, ParseExecutorSaturated
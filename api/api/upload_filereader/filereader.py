@@ -3,9 +3,20 @@ from typing import BinaryIO, List
 
 
 class FileReader(ABC):
+    # Readers with a higher priority are probed first when detecting the
+    # format of a file. Formats that are easier to recognize come first.
+    probe_priority: int = 0
+
     def read_file(self, file: BinaryIO) -> List[dict]:
         raise NotImplementedError
 
+    def probe(self, file: BinaryIO):
+        """
+        Cheap check if file is in the format of the reader. Only the head
+        of the file is passed. Returns a truthy value if the format matches.
+        """
+        return False
+
 
 class FileReaderException(ValueError):
     pass
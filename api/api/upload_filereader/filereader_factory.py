@@ -1,11 +1,45 @@
+import io
+from typing import BinaryIO, Iterable, Optional
+
 from .formats import formats
 from .filereader import FileReader
 
+# Number of bytes at the start of a file passed to the reader probes
+PROBE_SIZE = 8192
+
 
 class FilereaderFactory:
-    def get_reader(self, format: str) -> FileReader:
+    def get_reader(self, format: str, **options) -> FileReader:
         reader_cls = formats.SUPPORTED_FORMATS[format]
-        return reader_cls()
+        return reader_cls(**options)
+
+    def detect_format(
+            self, file: BinaryIO, file_formats: Optional[Iterable[str]] = None
+    ) -> Optional[str]:
+        """
+        Detect the format of file among file_formats (default: all supported
+        formats) by probing the head of the file with the readers in order of
+        their probe_priority. The file is rewound afterwards. Returns None if
+        no reader recognizes the file.
+        """
+        if file_formats is None:
+            file_formats = formats.SUPPORTED_FORMATS.keys()
+        candidates = sorted(
+            file_formats,
+            key=lambda f: formats.SUPPORTED_FORMATS[f].probe_priority,
+            reverse=True
+        )
+        head = file.read(PROBE_SIZE)
+        file.seek(0)
+        for file_format in candidates:
+            reader = self.get_reader(file_format)
+            try:
+                if reader.probe(io.BytesIO(head)):
+                    return file_format
+            except Exception:
+                # e.g. the head can not be decoded as expected
+                continue
+        return None
 
 
 filereader_factory = FilereaderFactory()
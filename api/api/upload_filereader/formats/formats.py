@@ -9,3 +9,6 @@ SUPPORTED_FORMATS = {
     "VCDS TXT": VCDSTXTReader,
     "Omniview CSV": OmniviewCSVReader
 }
+
+TIMESERIES_FORMATS = ["Picoscope CSV", "Picoscope MAT", "Omniview CSV"]
+OBD_FORMATS = ["VCDS TXT"]
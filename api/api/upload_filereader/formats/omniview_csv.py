@@ -1,6 +1,7 @@
 import codecs
 import csv
 import re
+from array import array
 from typing import BinaryIO, List
 
 from ..filereader import FileReader, FileReaderException
@@ -10,6 +11,30 @@ HEADER_CHECK = re.compile(
 
 
 class OmniviewCSVReader(FileReader):
+    """
+    Reader for Omniview CSV exports.
+
+    Values are parsed in blocks of block_size rows into a float64 buffer. In
+    streaming mode the buffer is returned as `array('d')`, such that memory
+    stays proportional to the signal instead of holding a Python float
+    object per sample.
+    """
+
+    probe_priority = 40
+
+    def __init__(self, streaming: bool = False, block_size: int = 2**16):
+        self.streaming = streaming
+        self.block_size = block_size
+
+    def probe(self, file: BinaryIO) -> bool:
+        reader = csv.reader(codecs.iterdecode(file, 'utf-8'), delimiter=",")
+        try:
+            header = next(reader, [""])
+        except (UnicodeDecodeError, csv.Error):
+            return False
+        finally:
+            file.seek(0)
+        return len(header) == 1 and bool(HEADER_CHECK.match(header[0]))
 
     def read_file(self, file: BinaryIO) -> List[dict]:
         reader = csv.reader(codecs.iterdecode(file, 'utf-8'), delimiter=",")
@@ -20,39 +45,56 @@ class OmniviewCSVReader(FileReader):
                     f"File header does not match Omniview file header but got"
                     f" {header}"
                 )
-        signal = []
+        signal = array("d")
+        block = []
         for i, row in enumerate(reader):
             if len(row) == 0:
                 # Ignore empty last row
                 break
             elif len(row) != 2:
+                # values of previous rows are reported first
+                self.__extend(signal, block)
                 raise FileReaderException(
                     f"Expected two entries per row but got {len(row)}."
                 )
             elif row[0] != str(i):
+                self.__extend(signal, block)
                 raise FileReaderException(
                     f"Expected first column to match row index but got"
                     f" {row[0]} != {str(i)}."
                 )
             else:
-                raw_value = row[1]
-                if raw_value == "":
-                    value = 0
-                else:
-                    value = raw_value
-                try:
-                    signal.append(float(value))
-                except ValueError:
-                    raise FileReaderException(
-                        f"Expected second column to be float value but got"
-                        f" {raw_value}"
-                    )
+                block.append(row[1])
+                if len(block) == self.block_size:
+                    self.__extend(signal, block)
+                    block.clear()
+        self.__extend(signal, block)
         return [
             {
-                "signal": signal,
+                "signal": signal if self.streaming else signal.tolist(),
                 "device_specs": {
                     "type": "omniscope",
                     "device_id": header_check["device_id"]
                 }
             }
         ]
+
+    def __extend(self, signal: array, block: List[str]):
+        try:
+            signal.extend(float(value or 0) for value in block)
+        except ValueError:
+            raw_value = next(
+                value for value in block if not self.__is_float(value)
+            )
+            raise FileReaderException(
+                f"Expected second column to be float value but got"
+                f" {raw_value}"
+            )
+
+    @staticmethod
+    def __is_float(value: str) -> bool:
+        try:
+            float(value or 0)
+        except ValueError:
+            return False
+        return True
@@ -1,7 +1,10 @@
 import codecs
 import csv
+import io
 import re
-from typing import BinaryIO, List, Tuple, Dict
+from typing import BinaryIO, List, Tuple, Dict, Literal, Optional
+
+import numpy as np
 
 from ..filereader import FileReader, FileReaderException
 
@@ -28,14 +31,52 @@ CHANNEL_CHECK = re.compile(
 
 
 class PicoscopeCSVReader(FileReader):
+    """
+    Reader for Picoscope CSV exports.
+
+    The default "numpy" engine parses the numeric block of the file in bulk.
+    The "python" engine parses the file cell by cell. Files the bulk parser
+    does not accept are handed to the "python" engine, such that both
+    engines raise the same errors.
+
+    With as_array, signals are returned as numpy arrays instead of lists.
+    """
+
+    probe_priority = 20
+
+    def __init__(
+            self,
+            engine: Literal["numpy", "python"] = "numpy",
+            as_array: bool = False
+    ):
+        if engine not in ("numpy", "python"):
+            raise ValueError(f"Unknown engine '{engine}'.")
+        self.engine = engine
+        self.as_array = as_array
+
     def read_file(self, file: BinaryIO) -> List[dict]:
         result = []
         validated, delimiter = self.__probe(file)
         if not validated:
             raise FileReaderException("conversion failed: wrong format")
-        data: Dict = self.__csv_to_dict(file, delimiter)
+        data: Optional[Dict] = None
+        if self.engine == "numpy":
+            data = self.__csv_to_arrays(file, delimiter)
+        if data is not None:
+            sampling_rate: int = round(
+                self.__calculate_sampling_rate_vectorised(data['Time'])
+            )
+            if not self.as_array:
+                data = {key: column.tolist() for key, column in data.items()}
+        else:
+            file.seek(0)
+            data = self.__csv_to_dict(file, delimiter)
+            sampling_rate: int = round(
+                self.__calculate_sampling_rate(data)[0]
+            )
+            if self.as_array:
+                data = {key: np.array(column) for key, column in data.items()}
         duration: int = round(self.__calculate_duration(data))
-        sampling_rate: int = round(self.__calculate_sampling_rate(data)[0])
         for key in data.keys():
             if key.startswith('Channel'):
                 result.append({
@@ -49,6 +90,14 @@ class PicoscopeCSVReader(FileReader):
                 })
         return result
 
+    def probe(self, file: BinaryIO) -> bool:
+        try:
+            validated, _ = self.__probe(file)
+        except FileReaderException:
+            file.seek(0)
+            return False
+        return validated
+
     def __translate_header(self, header) -> List[str]:
         translated = []
         for item in header:
@@ -109,6 +158,52 @@ class PicoscopeCSVReader(FileReader):
                     )
         return data
 
+    def __csv_to_arrays(self, file, delimiter) -> Optional[Dict]:
+        """
+        Parse the numeric block in bulk. Returns None if the file needs to be
+        parsed cell by cell, e.g. because it contains invalid values.
+        """
+        lines = file.read().split(b"\n", 2)
+        if len(lines) < 3:
+            return None
+        header = self.__translate_header(next(csv.reader(
+            [lines[0].decode("utf-8").rstrip("\r")], delimiter=delimiter
+        )))
+        conv_header = next(csv.reader(
+            [lines[1].decode("utf-8").rstrip("\r")], delimiter=delimiter
+        ))
+        if len(set(header)) != len(header) or \
+                len(conv_header) < len(header) or \
+                any(unit not in conv_table for unit in conv_header):
+            return None
+
+        block = lines[2]
+        if delimiter != ",":
+            # decimal commas
+            block = block.replace(b",", b".")
+        try:
+            values = np.loadtxt(
+                io.StringIO(block.decode("utf-8")),
+                delimiter=delimiter,
+                comments=None,
+                ndmin=2
+            )
+        except ValueError:
+            # includes UnicodeDecodeError
+            return None
+        if values.shape[0] < 2 or values.shape[1] != len(header):
+            return None
+
+        values *= np.array([conv_table[unit] for unit in conv_header])[
+            :len(header)
+        ]
+        time = values[:, 0]
+        if np.any(np.diff(np.abs(time)) == 0):
+            return None
+        # one contiguous array per column
+        columns = np.ascontiguousarray(values.T)
+        return {column: columns[i] for i, column in enumerate(header)}
+
     def __calculate_duration(self, data: dict) -> float:
         return abs(data['Time'][0]) + data['Time'][-1]
 
@@ -131,3 +226,14 @@ class PicoscopeCSVReader(FileReader):
         sr: float = (sum(sr_arr) / len(sr_arr))
 
         return sr, min(sr_arr) - sr, max(sr_arr) - sr
+
+    def __calculate_sampling_rate_vectorised(self, time: np.ndarray) -> float:
+        last, ent = time[:-1], time[1:]
+        # Check around Time 0 since Picoscope starts with negative time
+        crossing = (last < 0) & (ent >= 0)
+        distance = np.where(
+            crossing,
+            np.abs(last) + np.abs(ent),
+            np.abs(np.abs(last) - np.abs(ent))
+        )
+        return float(np.mean(1.0 / distance))
@@ -1,10 +1,33 @@
 from scipy.io import loadmat
+from scipy.io.matlab import matfile_version
 from typing import BinaryIO, List, Dict
 
 from ..filereader import FileReader, FileReaderException
 
 
 class PicoscopeMATReader(FileReader):
+    """
+    Reader for Picoscope MAT exports.
+
+    With as_array, signals are returned as the numpy arrays loaded from the
+    file instead of lists.
+    """
+
+    probe_priority = 30
+
+    def __init__(self, as_array: bool = False):
+        self.as_array = as_array
+
+    def probe(self, file: BinaryIO) -> bool:
+        # MAT v7.3 files are HDF5 files, which loadmat does not support
+        try:
+            major, _ = matfile_version(file)
+        except Exception:
+            return False
+        finally:
+            file.seek(0)
+        return major in (0, 1)
+
     def read_file(self, file) -> List[Dict]:
         measurement = self.__read_mat(file)
         return measurement
@@ -25,10 +48,11 @@ class PicoscopeMATReader(FileReader):
         if len(channels) == 0:
             raise FileReaderException("conversion error: no channels found")
         for channel in channels:
+            signal = f[channel].ravel()
             result.append({
                 'sampling_rate': sampling_rate,
                 'duration': duration,
-                'signal': f[channel].ravel().tolist(),
+                'signal': signal if self.as_array else signal.tolist(),
                 'device_specs': {
                     "channel": channel,
                     "type": "picoscope"
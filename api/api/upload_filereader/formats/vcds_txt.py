@@ -20,6 +20,8 @@ VCDS_INFO = re.compile(
 
 
 class VCDSTXTReader(FileReader):
+    probe_priority = 10
+
     def read_file(self,
                   file: BinaryIO,
                   enc: str = DEFAULT_FILE_ENCODING) -> List[dict]:
@@ -0,0 +1,227 @@
+import asyncio
+import logging
+import multiprocessing
+import os
+import shutil
+import tempfile
+import time
+from concurrent.futures import (
+    Executor, ProcessPoolExecutor, ThreadPoolExecutor
+)
+from concurrent.futures.process import BrokenProcessPool
+from typing import BinaryIO, List, Literal, Optional, Tuple
+
+from .filereader_factory import filereader_factory
+
+logger = logging.getLogger(__name__)
+
+
+class ParseExecutorSaturated(Exception):
+    """Raised if a file is submitted while all parse slots are in use."""
+
+
+def _read_file(
+        file_format: str, file: BinaryIO | str, reader_options: dict
+) -> Tuple[List[dict], float]:
+    """
+    Read a file or the file at a path in a worker. Returns the result and the
+    parse seconds.
+    """
+    start = time.perf_counter()
+    reader = filereader_factory.get_reader(file_format, **reader_options)
+    if isinstance(file, str):
+        with open(file, "rb") as f:
+            result = reader.read_file(f)
+    else:
+        result = reader.read_file(file)
+    return result, time.perf_counter() - start
+
+
+def _file_path(file: BinaryIO) -> Tuple[str, bool]:
+    """
+    Get a path from which a worker process can read file. Files without a
+    path on disk, e.g. spooled files, are copied to a temporary file
+    chunk by chunk. Returns the path and whether it is a temporary copy.
+    """
+    name = getattr(file, "name", None)
+    if isinstance(name, str) and os.path.isfile(name) and file.tell() == 0:
+        return name, False
+    with tempfile.NamedTemporaryFile(
+            prefix="upload-", delete=False
+    ) as copy:
+        shutil.copyfileobj(file, copy)
+    return copy.name, True
+
+
+def _mp_context():
+    """
+    Workers are not forked from the api process directly, as forking a
+    process with running threads is unsafe.
+    """
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("forkserver")
+    return multiprocessing.get_context("spawn")
+
+
+class ParseExecutor:
+    """
+    Runs the file readers off the event loop.
+
+    Files are parsed in a process pool. Worker processes read the files from
+    disk, such that uploads are never held in memory of the api process as
+    a whole. If no process pool can be used, e.g. because the platform does
+    not support it, a thread pool is used instead. At most max_pending files
+    are parsed or waiting for a worker at the same time. Further files are
+    rejected with ParseExecutorSaturated instead of piling up in memory.
+    """
+
+    def __init__(
+            self,
+            kind: Literal["process", "thread"] = "thread",
+            max_workers: int = 2,
+            max_pending: int = 8
+    ):
+        self.kind = kind
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.pending = 0
+        self.rejected = 0
+        self._executor: Optional[Executor] = None
+        # parse statistics by file format
+        self._format_stats: dict = {}
+
+    def configure(
+            self,
+            kind: Literal["process", "thread"],
+            max_workers: int,
+            max_pending: int
+    ):
+        """Reconfigure the executor. Running parse jobs are not affected."""
+        self.shutdown(wait=False)
+        self.kind = kind
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+
+    def _fall_back_to_threads(self, error: Exception):
+        logger.warning(
+            f"Can not use process pool to parse files: {error}. "
+            f"Falling back to thread pool."
+        )
+        self.kind = "thread"
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.kind == "process":
+                try:
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.max_workers,
+                        mp_context=_mp_context()
+                    )
+                except (OSError, NotImplementedError) as e:
+                    self._fall_back_to_threads(e)
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="parse"
+                )
+        return self._executor
+
+    def start(self, timeout: float = 60.):
+        """
+        Create the executor. Worker processes are only started on demand,
+        hence a process pool is checked by running a single job, such that
+        the fallback to a thread pool happens at startup and not on the
+        first upload.
+        """
+        executor = self._get_executor()
+        if not isinstance(executor, ProcessPoolExecutor):
+            return
+        try:
+            executor.submit(os.getpid).result(timeout=timeout)
+        except (
+                OSError, NotImplementedError, BrokenProcessPool, TimeoutError
+        ) as e:
+            self.shutdown(wait=False)
+            self._fall_back_to_threads(e)
+            self._get_executor()
+
+    async def _run(
+            self, file_format: str, file: BinaryIO, reader_options: dict
+    ) -> Tuple[List[dict], float]:
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor()
+        if isinstance(executor, ThreadPoolExecutor):
+            return await loop.run_in_executor(
+                executor, _read_file, file_format, file, reader_options
+            )
+        # file objects of uploads can not be sent to other processes
+        path, is_copy = await asyncio.to_thread(_file_path, file)
+        try:
+            return await loop.run_in_executor(
+                executor, _read_file, file_format, path, reader_options
+            )
+        except BrokenProcessPool:
+            # e.g. a worker was killed. Start a new pool for the next file.
+            if self._executor is executor:
+                self._executor = None
+            raise
+        finally:
+            if is_copy:
+                os.unlink(path)
+
+    async def read_file(
+            self, file_format: str, file: BinaryIO, **reader_options
+    ) -> List[dict]:
+        """
+        Read a file with the reader for file_format without blocking the
+        event loop. Raises ParseExecutorSaturated if max_pending files are
+        already being parsed.
+        """
+        if self.pending >= self.max_pending:
+            self.rejected += 1
+            raise ParseExecutorSaturated(
+                f"{self.pending} files are already being parsed."
+            )
+        stats = self._format_stats.setdefault(
+            file_format,
+            {"count": 0, "failed": 0, "total_seconds": 0., "max_seconds": 0.}
+        )
+        self.pending += 1
+        try:
+            result, seconds = await self._run(
+                file_format, file, reader_options
+            )
+        except Exception:
+            stats["failed"] += 1
+            raise
+        finally:
+            self.pending -= 1
+        stats["count"] += 1
+        stats["total_seconds"] += seconds
+        stats["max_seconds"] = max(stats["max_seconds"], seconds)
+        return result
+
+    def shutdown(self, wait: bool = True):
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+            self._executor = None
+
+    def stats(self) -> dict:
+        return {
+            "kind": self.kind,
+            "max_workers": self.max_workers,
+            "max_pending": self.max_pending,
+            "pending": self.pending,
+            "rejected": self.rejected,
+            "formats": {
+                file_format: {
+                    **stats,
+                    "mean_seconds": stats["total_seconds"] / stats["count"]
+                    if stats["count"] else 0.
+                }
+                for file_format, stats in self._format_stats.items()
+            }
+        }
+
+
+parse_executor = ParseExecutor()
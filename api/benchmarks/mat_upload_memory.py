@@ -0,0 +1,99 @@
+"""
+Benchmark of the peak memory of processing a Picoscope MAT upload.
+
+Generates a MAT file with 4 channels of 5M float32 samples each and measures
+the peak RSS of reading the file, validating the NewTimeseriesData and
+encoding the signals as done by the GridFSSignalStore. The "list" path
+converts signals to lists of floats as done by earlier versions of the hub,
+the "array" path keeps them as numpy arrays. Each path runs in a fresh
+process. Run from the api directory via
+```
+python -m benchmarks.mat_upload_memory
+```
+"""
+import asyncio
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+
+import numpy as np
+from beanie import PydanticObjectId
+from scipy.io import savemat
+
+from api.data_management import NewTimeseriesData, TimeseriesMetaData
+from api.data_management.signal_encoding import encode_signal
+from api.data_management.timeseries_data import BaseSignalStore, SignalData
+from api.upload_filereader.formats.picoscope_mat import PicoscopeMATReader
+
+CHANNELS = "ABCD"
+LENGTH = 5_000_000
+
+
+class EncodingSignalStore(BaseSignalStore):
+    """Signal store that encodes signals like GridFSSignalStore."""
+
+    def __init__(self):
+        self.store = {}
+
+    async def create(self, signal: SignalData) -> PydanticObjectId:
+        signal_format, chunks = encode_signal(signal)
+        id = PydanticObjectId()
+        self.store[id] = b"".join(chunks)
+        return id
+
+
+def generate_mat(path: str):
+    rng = np.random.default_rng(0)
+    savemat(path, {
+        "Tinterval": 1e-6,
+        "Length": LENGTH,
+        **{
+            c: rng.normal(0, 1, (LENGTH, 1)).astype(np.float32)
+            for c in CHANNELS
+        }
+    })
+
+
+def peak_rss_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1e3
+
+
+async def process_upload(path: str, as_array: bool):
+    TimeseriesMetaData.signal_store = EncodingSignalStore()
+    with open(path, "rb") as f:
+        results = PicoscopeMATReader(as_array=as_array).read_file(f)
+    for data in results:
+        new_data = NewTimeseriesData(
+            component="battery", label="unknown", **data
+        )
+        await new_data.to_timeseries_data()
+
+
+def run(path: str, mode: str):
+    baseline = peak_rss_mb()
+    asyncio.run(process_upload(path, as_array=mode == "array"))
+    print(f"{mode:<8}{peak_rss_mb() - baseline:>16.0f}")
+
+
+def main():
+    if len(sys.argv) == 3:
+        run(sys.argv[1], sys.argv[2])
+        return
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "upload.mat")
+        generate_mat(path)
+        size = os.path.getsize(path) / 1e6
+        print(f"{len(CHANNELS)} channels x {LENGTH} samples, {size:.0f} MB")
+        print(f"{'path':<8}{'peak RSS MB':>16}")
+        for mode in ("list", "array"):
+            subprocess.run(
+                [sys.executable, "-m", "benchmarks.mat_upload_memory",
+                 path, mode],
+                check=True
+            )
+
+
+if __name__ == "__main__":
+    main()
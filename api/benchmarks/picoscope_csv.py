@@ -0,0 +1,81 @@
+"""
+Benchmark of the parsing engines of the Picoscope CSV reader in
+api.upload_filereader.formats.picoscope_csv.
+
+Generates Picoscope CSV exports with English and German (decimal comma)
+formatting and reports the read time of the "python" and "numpy" engines.
+Run from the api directory via
+```
+python -m benchmarks.picoscope_csv
+```
+"""
+import io
+import time
+
+import numpy as np
+
+from api.upload_filereader.formats.picoscope_csv import PicoscopeCSVReader
+
+ROWS = [100_000, 1_000_000]
+CHANNELS = 4
+
+
+def generate_csv(rows: int, channels: int, german: bool) -> bytes:
+    """Noisy sine captures sampled with 40 kHz, starting at negative time."""
+    rng = np.random.default_rng(0)
+    t = (np.arange(rows) - rows // 10) / 40.  # ms
+    values = [t] + [
+        np.sin(2 * np.pi * 0.05 * (i + 1) * t) + rng.normal(0, 0.01, rows)
+        for i in range(channels)
+    ]
+    channel_names = [chr(ord("A") + i) for i in range(channels)]
+    if german:
+        delimiter = ";"
+        header = ["Zeit"] + [f"Kanal {c}" for c in channel_names]
+    else:
+        delimiter = ","
+        header = ["Time"] + [f"Channel {c}" for c in channel_names]
+    units = ["(ms)"] + ["(V)"] * channels
+
+    body = io.StringIO()
+    np.savetxt(body, np.column_stack(values), fmt="%.8f", delimiter=delimiter)
+    block = body.getvalue()
+    if german:
+        block = block.replace(".", ",")
+    return (
+        delimiter.join(header) + "\n" + delimiter.join(units) + "\n\n" + block
+    ).encode("utf-8")
+
+
+def read_time(engine: str, content: bytes, repeat: int = 3) -> float:
+    """Best read time in seconds."""
+    reader = PicoscopeCSVReader(engine=engine)
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        reader.read_file(io.BytesIO(content))
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    header = f"{'file':<32}{'MB':>8}{'python s':>12}{'numpy s':>12}" \
+             f"{'speedup':>10}"
+    print(header)
+    print("-" * len(header))
+    for rows in ROWS:
+        for german in (False, True):
+            content = generate_csv(rows, CHANNELS, german)
+            name = f"{rows} rows {CHANNELS}ch " \
+                   f"{'ger' if german else 'eng'}"
+            python_time = read_time("python", content, repeat=1)
+            numpy_time = read_time("numpy", content)
+            print(
+                f"{name:<32}{len(content) / 1e6:>8.1f}"
+                f"{python_time:>12.2f}{numpy_time:>12.2f}"
+                f"{python_time / numpy_time:>10.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
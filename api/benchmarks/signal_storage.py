@@ -0,0 +1,96 @@
+"""
+Benchmark of the signal storage formats in api.data_management.signal_encoding.
+
+Reports bytes on disk and decode throughput for the example Picoscope files
+used in the test suite. As these files are small, a synthetic capture with
+1M samples at 12 bit ADC resolution is included to show the throughput for
+realistic signal sizes. Run from the api directory via
+```
+python -m benchmarks.signal_storage
+```
+"""
+import os
+import time
+
+import numpy as np
+
+from api.data_management.signal_encoding import (
+    SignalCompression, SignalStorageDtype, decode_signal, encode_signal
+)
+from api.upload_filereader import filereader_factory
+
+FILES_DIR = os.path.join(os.path.dirname(__file__), "..", "tests", "files")
+
+EXAMPLE_FILES = [
+    ("picoscope_4ch.mat", "Picoscope MAT"),
+    ("picoscope_4ch_eng.csv", "Picoscope CSV"),
+    ("picoscope_8ch_ger_comma_decimal.csv", "Picoscope CSV")
+]
+
+FORMATS = [
+    (SignalStorageDtype.float64, SignalCompression.none),
+    (SignalStorageDtype.float64, SignalCompression.zlib),
+    (SignalStorageDtype.float32, SignalCompression.zlib),
+    (SignalStorageDtype.int16, SignalCompression.none),
+    (SignalStorageDtype.int16, SignalCompression.zlib)
+]
+
+
+def read_signals(file_name: str, file_format: str) -> list[np.ndarray]:
+    reader = filereader_factory.get_reader(file_format)
+    with open(os.path.join(FILES_DIR, file_name), "rb") as f:
+        results = reader.read_file(f)
+    return [np.asarray(r["signal"], dtype="<f8") for r in results]
+
+
+def synthetic_capture(length: int = 1_000_000) -> list[np.ndarray]:
+    """Noisy 50 Hz sine in [-5 V, 5 V] quantised with 12 bit resolution."""
+    rng = np.random.default_rng(0)
+    t = np.arange(length) / 1e5
+    signal = 4.5 * np.sin(2 * np.pi * 50 * t) + rng.normal(0, 0.05, length)
+    return [np.round(signal / 10 * 4095) * 10 / 4095]
+
+
+def decode_throughput(signal_format, data: bytes, repeat: int = 5) -> float:
+    """Decoded float64 MB per second."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        decoded = decode_signal(signal_format, data)
+    elapsed = (time.perf_counter() - start) / repeat
+    return decoded.nbytes / 1e6 / elapsed
+
+
+def main():
+    header = f"{'file':<38}{'format':<16}{'bytes':>12}{'ratio':>8}" \
+             f"{'decode MB/s':>14}{'max error':>12}"
+    print(header)
+    print("-" * len(header))
+    examples = [
+        (file_name, read_signals(file_name, file_format))
+        for file_name, file_format in EXAMPLE_FILES
+    ]
+    examples.append(("synthetic 1M samples", synthetic_capture()))
+    for file_name, signals in examples:
+        raw_size = sum(s.nbytes for s in signals)
+        for dtype, compression in FORMATS:
+            size = 0
+            throughputs = []
+            max_error = 0.
+            for signal in signals:
+                signal_format, chunks = encode_signal(
+                    signal, dtype=dtype, compression=compression
+                )
+                data = b"".join(chunks)
+                size += len(data)
+                throughputs.append(decode_throughput(signal_format, data))
+                decoded = decode_signal(signal_format, data)
+                max_error = max(max_error, np.abs(decoded - signal).max())
+            print(
+                f"{file_name:<38}{dtype.value + '/' + compression.value:<16}"
+                f"{size:>12}{raw_size / size:>8.2f}"
+                f"{np.mean(throughputs):>14.0f}{max_error:>12.2e}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -4,13 +4,16 @@ import sys
 
 import httpx
 import pytest
+import rdflib
 from api.data_management import (
     Case,
     Vehicle,
     Customer,
     Workshop,
     Diagnosis,
-    Asset
+    Asset,
+    TimeseriesUpload,
+    TaskDispatch
 )
 from beanie import init_beanie
 from bson import ObjectId
@@ -48,7 +51,8 @@ async def initialized_beanie_context(motor_db):
     context manager to handle test setup and teardown.
     """
     models = [
-        Case, Vehicle, Customer, Workshop, Diagnosis, Asset
+        Case, Vehicle, Customer, Workshop, Diagnosis, Asset, TimeseriesUpload,
+        TaskDispatch
     ]
 
     class InitializedBeanieContext:
@@ -281,6 +285,38 @@ def kg_prefilled(
     httpx.delete(url=f"{kg_url}/$/datasets/{kg_obd_dataset_name}")
 
 
+@pytest.fixture
+def kg_graph(kg_file):
+    """In-memory graph with the test knowledge graph data."""
+    graph = rdflib.Graph()
+    graph.parse(kg_file, format="turtle")
+    return graph
+
+
+@pytest.fixture
+def kg_graph_transport(kg_graph):
+    """
+    Transport answering SPARQL queries with the in-memory test knowledge
+    graph as stand-in for the knowledge graph's http interface. Received
+    queries are recorded in the `queries` attribute.
+    """
+    queries = []
+
+    def handler(request: httpx.Request):
+        query = request.content.decode()
+        queries.append(query)
+        result = kg_graph.query(query)
+        return httpx.Response(
+            200,
+            content=result.serialize(format="json"),
+            headers={"Content-Type": "application/sparql-results+json"}
+        )
+
+    transport = httpx.MockTransport(handler)
+    transport.queries = queries
+    return transport
+
+
 def _create_rsa_key_pair() -> tuple[bytes, bytes]:
     private_key = rsa.generate_private_key(
         public_exponent=65537, key_size=2048
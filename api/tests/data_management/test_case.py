@@ -1,19 +1,25 @@
+import asyncio
 from unittest import mock
 
 import pytest
 from api.data_management import (
     NewCase,
     Case,
+    CaseSummary,
+    Diagnosis,
     Vehicle,
     TimeseriesDataUpdate,
     NewTimeseriesData,
     TimeseriesData,
     TimeseriesDataLabel,
     NewOBDData,
+    OBDData,
     OBDDataUpdate,
     NewSymptom,
+    Symptom,
     SymptomUpdate,
-    SymptomLabel
+    SymptomLabel,
+    case_data_events
 )
 from bson import ObjectId
 from pydantic import ValidationError
@@ -109,6 +115,58 @@ class TestCase:
             all_cases = await Case.find_in_hub()
             assert len(all_cases) == 1
 
+    @pytest.mark.asyncio
+    async def test_find_in_hub_paginated(
+            self, new_case, initialized_beanie_context
+    ):
+        async with initialized_beanie_context:
+            case_ids = []
+            for _ in range(5):
+                case = await Case(workshop_id="1", **new_case).create()
+                case_ids.append(case.id)
+
+            first_page = await Case.find_in_hub(limit=2)
+            assert [c.id for c in first_page] == case_ids[:2]
+
+            next_page = await Case.find_in_hub(
+                limit=2, after=str(first_page[-1].id)
+            )
+            assert [c.id for c in next_page] == case_ids[2:4]
+
+            last_page = await Case.find_in_hub(
+                limit=2, after=str(next_page[-1].id)
+            )
+            assert [c.id for c in last_page] == case_ids[4:]
+
+            # filters are applied in addition to pagination
+            assert await Case.find_in_hub(
+                workshop_id="2", after=str(case_ids[0])
+            ) == []
+
+    @pytest.mark.asyncio
+    async def test_find_in_hub_summary(
+            self, new_case, initialized_beanie_context
+    ):
+        async with initialized_beanie_context:
+            case = Case(workshop_id="1", **new_case)
+            case.obd_data = [
+                OBDData(data_id=i, dtcs=["P0001"]) for i in [0, 1]
+            ]
+            case.symptoms = [
+                Symptom(data_id=0, component="battery", label="defect")
+            ]
+            await case.create()
+
+            summaries = await Case.find_in_hub(view="summary")
+            assert len(summaries) == 1
+            summary = summaries[0]
+            assert isinstance(summary, CaseSummary)
+            assert summary.id == case.id
+            assert summary.vehicle_vin == case.vehicle_vin
+            assert summary.timeseries_data_count == 0
+            assert summary.obd_data_count == 2
+            assert summary.symptoms_count == 1
+
     @pytest.mark.asyncio
     async def test_find_in_hub(
             self, new_case, initialized_beanie_context
@@ -167,7 +225,12 @@ class TestCase:
             ("AB", ["ABC", "ABCD"]),
             ("ABC", ["ABC", "ABCD"]),
             ("ABCD", ["ABCD"]),
-            ("BC", [])
+            ("BC", []),
+            ("Z", ["ZABC"]),
+            ("", ["ABC", "ABCD", "ZABC"]),
+            # the vin is not interpreted as regex
+            ("A.C", []),
+            (".*", [])
         ]
     )
     @pytest.mark.asyncio
@@ -184,6 +247,55 @@ class TestCase:
             retrieved_vins = sorted([_.vehicle_vin for _ in retrieved_cases])
             assert retrieved_vins == expected_vins
 
+    @pytest.mark.parametrize(
+        "filters",
+        [
+            {"workshop_id": "w"},
+            {"workshop_id": "w", "vin": "AB"},
+            {"workshop_id": "w", "obd_data_dtc": "P0001"},
+            {"workshop_id": "w", "timeseries_data_component": "battery"},
+            {"workshop_id": "w", "customer_id": str(ObjectId())},
+            {
+                "workshop_id": "w", "vin": "AB", "obd_data_dtc": "P0001",
+                "timeseries_data_component": "battery"
+            },
+            {"vin": "AB"},
+            {"obd_data_dtc": "P0001"},
+            {"timeseries_data_component": "battery"},
+            {"customer_id": str(ObjectId())}
+        ]
+    )
+    @pytest.mark.parametrize("paginated", [False, True])
+    @pytest.mark.asyncio
+    async def test_find_in_hub_uses_indexes(
+            self, filters, paginated, initialized_beanie_context
+    ):
+        def stages(plan: dict):
+            yield plan["stage"]
+            for child in plan.get("inputStages", []) + [
+                plan[key] for key in ("inputStage", "queryPlan")
+                if key in plan
+            ]:
+                yield from stages(child)
+
+        async with initialized_beanie_context:
+            for i in range(10):
+                await Case(
+                    vehicle_vin=f"AB{i}", workshop_id=f"w{i % 3}",
+                    obd_data=[{"data_id": 0, "dtcs": ["P0001"]}]
+                ).create()
+
+            filter = Case._hub_filter(
+                **filters, after=str(ObjectId()) if paginated else None
+            )
+            cursor = Case.get_motor_collection().find(filter)
+            if paginated:
+                cursor = cursor.sort("_id").limit(31)
+            explanation = await cursor.explain()
+
+            winning_plan = explanation["queryPlanner"]["winningPlan"]
+            assert "COLLSCAN" not in set(stages(winning_plan))
+
     @pytest.mark.parametrize(
         "query_dtc,expected_cases",
         [
@@ -346,6 +458,7 @@ class TestCase:
             # specify non-zero number of previous additions of datasets
             previous_adds = 10
             case.timeseries_data_added = previous_adds
+            await case.create()
 
             # Case.add_timeseries_data calls arguments .to_timeseries_data
             # method. Hence, pass instance of the mock class, to avoid
@@ -369,6 +482,70 @@ class TestCase:
             assert case.timeseries_data_added == previous_adds + 1
             assert case_retrieved.timeseries_data_added == previous_adds + 1
 
+    @mock.patch(
+        "api.data_management.case.TimeseriesData.delete_signal", autospec=True
+    )
+    @pytest.mark.asyncio
+    async def test_add_timeseries_data_many(
+            self, delete_signal, new_case, initialized_beanie_context
+    ):
+        class MockNewTimeseriesData(NewTimeseriesData):
+            """
+            A mock for NewTimeseriesData that does not interact with a
+            signal store and fails for signals containing negative values.
+            """
+
+            async def to_timeseries_data(self):
+                if min(self.signal) < 0:
+                    raise ValueError("Failed to store signal.")
+                meta_data = self.model_dump(exclude={"signal"})
+                meta_data["signal_id"] = ObjectId()
+                return TimeseriesData(**meta_data)
+
+        def new_data(component, signal):
+            return MockNewTimeseriesData(
+                component=component,
+                label="unknown",
+                sampling_rate=1,
+                duration=2,
+                type="oscillogram",
+                signal=signal
+            )
+
+        delete_signal.side_effect = mock.AsyncMock()
+
+        async with initialized_beanie_context:
+            case = Case(workshop_id="1", **new_case)
+            await case.create()
+
+            await case.add_timeseries_data_many(
+                [new_data(f"channel-{i}", [1., 2.]) for i in range(3)]
+            )
+
+            # confirm that all datasets were added with consecutive data_ids
+            case_retrieved = await Case.get(case.id)
+            assert case_retrieved is not None
+            assert [
+                (d.data_id, d.component)
+                for d in case_retrieved.timeseries_data
+            ] == [(i, f"channel-{i}") for i in range(3)]
+            assert [d.signal_id for d in case.timeseries_data] == \
+                   [d.signal_id for d in case_retrieved.timeseries_data]
+            assert case_retrieved.timeseries_data_added == 3
+
+            # if a single signal can not be stored, no dataset is added and
+            # the other signals are deleted
+            with pytest.raises(ValueError):
+                await case.add_timeseries_data_many([
+                    new_data("ok-1", [1., 2.]),
+                    new_data("failing", [-1., 2.]),
+                    new_data("ok-2", [1., 2.])
+                ])
+            case_retrieved = await Case.get(case.id)
+            assert case_retrieved is not None
+            assert len(case_retrieved.timeseries_data) == 3
+            assert delete_signal.side_effect.await_count == 2
+
     @pytest.mark.asyncio
     async def test_add_obd_data(
             self, new_case, initialized_beanie_context
@@ -378,6 +555,7 @@ class TestCase:
             # specify non-zero number of previous additions of datasets
             previous_adds = 10
             case.obd_data_added = previous_adds
+            await case.create()
 
             await case.add_obd_data(
                 NewOBDData(dtcs=["P0001", "U0001"])
@@ -405,6 +583,7 @@ class TestCase:
             # specify non-zero number of previous additions of datasets
             previous_adds = 10
             case.symptoms_added = previous_adds
+            await case.create()
 
             await case.add_symptom(
                 NewSymptom(
@@ -428,6 +607,106 @@ class TestCase:
             assert case.symptoms_added == previous_adds + 1
             assert case_retrieved.symptoms_added == previous_adds + 1
 
+    @pytest.mark.asyncio
+    async def test_add_data_notifies_listeners(
+            self, new_case, initialized_beanie_context
+    ):
+        async with initialized_beanie_context:
+            case = Case(workshop_id="1", **new_case)
+            await case.create()
+            with case_data_events.listen(case.id) as added:
+                await case.add_obd_data(NewOBDData(dtcs=["P0001"]))
+                assert added.is_set()
+
+    @pytest.mark.asyncio
+    async def test_update_data_notifies_listeners(
+            self, new_case, initialized_beanie_context
+    ):
+        async with initialized_beanie_context:
+            case = Case(workshop_id="1", **new_case)
+            await case.create()
+            await case.add_symptom(
+                NewSymptom(component="battery", label=SymptomLabel("ok"))
+            )
+            with case_data_events.listen(case.id) as changed:
+                await case.update_symptom(
+                    0, SymptomUpdate(component="alternator")
+                )
+                assert changed.is_set()
+
+    @pytest.mark.asyncio
+    async def test_add_timeseries_data_is_not_rolled_back_after_adding(
+            self, new_case, timeseries_data, initialized_beanie_context
+    ):
+        async with initialized_beanie_context:
+            case = Case(workshop_id="1", **new_case)
+            await case.create()
+            new_data = mock.AsyncMock(spec=NewTimeseriesData)
+            stored = TimeseriesData(**timeseries_data)
+            new_data.to_timeseries_data.return_value = stored
+            with mock.patch.object(
+                    TimeseriesData, "delete_signal"
+            ) as delete_signal, mock.patch.object(
+                case_data_events, "notify", side_effect=RuntimeError
+            ):
+                with pytest.raises(RuntimeError):
+                    await case.add_timeseries_data_many([new_data])
+            # signals of added datasets are kept
+            delete_signal.assert_not_called()
+            case = await Case.get(case.id)
+            assert len(case.timeseries_data) == 1
+
+    @pytest.mark.asyncio
+    async def test_add_obd_data_concurrently(
+            self, new_case, initialized_beanie_context
+    ):
+        async with initialized_beanie_context:
+            case = Case(workshop_id="1", **new_case)
+            await case.create()
+
+            # add datasets concurrently via independent instances of the case
+            instances = [await Case.get(case.id) for _ in range(10)]
+            await asyncio.gather(*[
+                instance.add_obd_data(NewOBDData(dtcs=[f"P000{i}"]))
+                for i, instance in enumerate(instances)
+            ])
+
+            # confirm that no dataset was lost and data_ids are unique
+            case_retrieved = await Case.get(case.id)
+            assert case_retrieved is not None
+            assert sorted(d.data_id for d in case_retrieved.obd_data) == \
+                   list(range(10))
+            assert case_retrieved.obd_data_added == 10
+
+    @mock.patch(
+        "api.data_management.case.TimeseriesData.delete_signal", autospec=True
+    )
+    @pytest.mark.asyncio
+    async def test_delete_timeseries_data_concurrently(
+            self,
+            delete_signal,
+            new_case,
+            timeseries_data,
+            initialized_beanie_context
+    ):
+        # patch TimeseriesData.delete_signal
+        delete_signal.side_effect = mock.AsyncMock()
+
+        async with initialized_beanie_context:
+            timeseries_data["data_id"] = 0
+            new_case["timeseries_data"] = [timeseries_data]
+            case = Case(workshop_id="1", **new_case)
+            await case.create()
+
+            # delete the same dataset via independent instances of the case
+            instances = [await Case.get(case.id) for _ in range(3)]
+            await asyncio.gather(*[
+                instance.delete_timeseries_data(0) for instance in instances
+            ])
+
+            # confirm that the signal was only deleted once
+            delete_signal.side_effect.assert_awaited_once()
+
     @pytest.mark.asyncio
     async def test_get_timeseries_data_non_existent(
             self, new_case, initialized_beanie_context
@@ -788,3 +1067,67 @@ class TestCase:
 
             # delete_signal should have been awaited for each not entry
             assert delete_signal.await_count == 2
+
+    @mock.patch(
+        "api.data_management.case.SIGNAL_DELETE_CONCURRENCY", 2
+    )
+    @mock.patch(
+        "api.data_management.case.TimeseriesData.delete_signal", autospec=True
+    )
+    @pytest.mark.asyncio
+    async def test_delete_all_timeseries_signals_concurrently(
+            self,
+            delete_signal,
+            new_case,
+            timeseries_data,
+            initialized_beanie_context
+    ):
+        running = 0
+        max_running = 0
+
+        async def mock_delete_signal(self):
+            nonlocal running, max_running
+            running += 1
+            max_running = max(max_running, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            if self.component == "failing":
+                raise RuntimeError("Failed to delete signal.")
+
+        delete_signal.side_effect = mock_delete_signal
+
+        async with initialized_beanie_context:
+            new_case["timeseries_data"] = [
+                {**timeseries_data, "component": component}
+                for component in ["a", "failing", "b", "c", "d"]
+            ]
+            case = Case(workshop_id="1", **new_case)
+            await case.save()
+            await case.delete()
+
+            # all signals are deleted with bounded parallelism
+            assert delete_signal.await_count == 5
+            assert max_running == 2
+            # a signal that can not be deleted does not prevent the deletion
+            # of the case
+            assert await Case.get(case.id) is None
+
+    @pytest.mark.asyncio
+    async def test_delete_diagnosis(
+            self, new_case, initialized_beanie_context
+    ):
+        async with initialized_beanie_context:
+            case = Case(workshop_id="1", **new_case)
+            await case.create()
+            other_case = Case(workshop_id="1", **new_case)
+            await other_case.create()
+            diag = await Diagnosis(case_id=case.id).create()
+            other_diag = await Diagnosis(case_id=other_case.id).create()
+            case.diagnosis_id = diag.id
+            await case.save()
+
+            await case.delete()
+
+            # only the diagnosis of the deleted case is removed
+            assert await Diagnosis.get(diag.id) is None
+            assert await Diagnosis.get(other_diag.id) is not None
@@ -0,0 +1,134 @@
+import asyncio
+from unittest import mock
+
+import pytest
+from api.data_management import CaseDataEvents
+from bson import ObjectId
+from redis import RedisError
+
+
+@pytest.fixture
+def redis():
+    """Redis client mock recording the published messages."""
+    redis = mock.MagicMock()
+    redis.publish = mock.AsyncMock()
+    return redis
+
+
+class TestCaseDataEvents:
+
+    @pytest.mark.asyncio
+    async def test_publish(self):
+        events = CaseDataEvents()
+        case_id = ObjectId()
+        with events.listen(case_id) as added, \
+                events.listen(ObjectId()) as other_added:
+            await events.publish(case_id)
+            assert added.is_set()
+            assert not other_added.is_set()
+        assert events.stats()["published"] == 1
+
+    @pytest.mark.asyncio
+    async def test_listen(self):
+        events = CaseDataEvents()
+        case_id = ObjectId()
+        with events.listen(case_id), events.listen(case_id):
+            assert events.stats()["listeners"] == 2
+        assert events.stats()["listeners"] == 0
+        # publishing without listeners has no effect
+        await events.publish(case_id)
+
+    @pytest.mark.asyncio
+    async def test_publish_via_redis(self, redis):
+        events = CaseDataEvents()
+        events._redis = redis
+        case_id = ObjectId()
+        with events.listen(case_id) as added:
+            await events.publish(case_id)
+            redis.publish.assert_awaited_once_with(
+                CaseDataEvents.channel, str(case_id)
+            )
+            # listeners are notified once the message is received
+            assert not added.is_set()
+            events._notify(str(case_id))
+            assert added.is_set()
+
+    @pytest.mark.asyncio
+    async def test_publish_redis_not_available(self, redis):
+        redis.publish.side_effect = RedisError("not available")
+        events = CaseDataEvents()
+        events._redis = redis
+        case_id = ObjectId()
+        with events.listen(case_id) as added:
+            await events.publish(case_id)
+            # listeners of this process are notified nevertheless
+            assert added.is_set()
+        assert events.stats()["failed_publications"] == 1
+
+    @pytest.mark.asyncio
+    async def test_publish_never_raises(self, redis):
+        redis.publish.side_effect = RuntimeError("unexpected")
+        events = CaseDataEvents()
+        events._redis = redis
+        case_id = ObjectId()
+        with events.listen(case_id) as added:
+            await events.publish(case_id)
+            assert added.is_set()
+        assert events.stats()["failed_publications"] == 1
+
+    @pytest.mark.asyncio
+    async def test_notify(self):
+        events = CaseDataEvents()
+        case_id = ObjectId()
+        with events.listen(case_id) as added:
+            # listeners are notified immediately without redis
+            events.notify(case_id)
+            assert added.is_set()
+
+    @pytest.mark.asyncio
+    async def test_notify_via_redis(self, redis):
+        published = asyncio.Event()
+
+        async def publish(*args):
+            await published.wait()
+
+        redis.publish.side_effect = publish
+        redis.aclose = mock.AsyncMock()
+        events = CaseDataEvents()
+        events._redis = redis
+        case_id = ObjectId()
+        # the caller does not wait for the publication
+        events.notify(case_id)
+        await asyncio.sleep(0)
+        redis.publish.assert_called_once_with(
+            CaseDataEvents.channel, str(case_id)
+        )
+        # pending publications are completed on stop
+        stop = asyncio.create_task(events.stop())
+        await asyncio.sleep(0)
+        assert not stop.done()
+        published.set()
+        await stop
+        assert events.stats()["published"] == 1
+
+    @pytest.mark.asyncio
+    async def test_receive(self, redis):
+        case_id = ObjectId()
+
+        async def listen():
+            yield {"type": "subscribe", "data": 1}
+            yield {"type": "message", "data": str(case_id).encode()}
+            await asyncio.Event().wait()
+
+        pubsub = redis.pubsub.return_value.__aenter__.return_value
+        pubsub.subscribe = mock.AsyncMock()
+        pubsub.listen = listen
+        events = CaseDataEvents()
+        events._redis = redis
+        redis.aclose = mock.AsyncMock()
+        with events.listen(case_id) as added:
+            events.start()
+            await asyncio.wait_for(added.wait(), 1)
+            await events.stop()
+        pubsub.subscribe.assert_awaited_once_with(CaseDataEvents.channel)
+        assert events.stats()["received"] == 1
@@ -1,3 +1,5 @@
+from unittest import mock
+
 import pytest
 
 from api.data_management import Customer, Case
@@ -17,3 +19,37 @@ class TestCustomer:
             await case.sync()
             assert case.customer_id is None, \
                 "Deleted customer's ID should be removed from case."
+
+    @pytest.mark.asyncio
+    async def test__remove_id_from_cases_many(
+            self, initialized_beanie_context
+    ):
+        async with initialized_beanie_context:
+            customer = await Customer(first_name="f", last_name="l").create()
+            other_customer = await Customer(
+                first_name="o", last_name="l"
+            ).create()
+            for i in range(5):
+                await Case(
+                    customer_id=customer.id, vehicle_vin=f"v{i}",
+                    workshop_id=f"w{i % 2}"
+                ).create()
+            other_case = await Case(
+                customer_id=other_customer.id, vehicle_vin="v",
+                workshop_id="w0"
+            ).create()
+
+            with mock.patch.object(
+                Case, "set", autospec=True
+            ) as case_set:
+                await customer.delete()
+                # cases are updated in bulk instead of one by one
+                case_set.assert_not_called()
+
+            assert await Case.find(
+                {"customer_id": customer.id}
+            ).count() == 0
+            assert await Case.find({"customer_id": None}).count() == 5
+            await other_case.sync()
+            assert other_case.customer_id == other_customer.id, \
+                "Cases of other customers should not be modified."
@@ -1,4 +1,5 @@
 import pytest
+from bson import ObjectId
 
 from api.data_management import (
     Case,
@@ -27,11 +28,13 @@ class TestDiagnosis:
             # Both cases of workshop "1" have a diagnosis
             assert case_11.id
             diag_11 = await Diagnosis(  # noqa F841
-                case_id=case_11.id, status=DiagnosisStatus("scheduled")
+                case_id=case_11.id, workshop_id="1",
+                status=DiagnosisStatus("scheduled")
             ).insert()
             assert case_12.id
             diag_12 = await Diagnosis(
-                case_id=case_12.id, status=DiagnosisStatus("finished")
+                case_id=case_12.id, workshop_id="1",
+                status=DiagnosisStatus("finished")
             ).insert()
 
             workshop_1_result = await Diagnosis.find_in_hub(workshop_id="1")
@@ -48,3 +51,29 @@ class TestDiagnosis:
             workshop_2_result = await Diagnosis.find_in_hub(workshop_id="2")
             assert workshop_2_result == [], \
                 "Expected 0 diagnoses for workshop 2."
+
+    @pytest.mark.asyncio
+    async def test_find_in_hub_paginated(self, initialized_beanie_context):
+        async with initialized_beanie_context:
+            diagnoses = [
+                await Diagnosis(
+                    case_id=ObjectId(), workshop_id="1",
+                    status=DiagnosisStatus("finished")
+                ).insert()
+                for _ in range(5)
+            ]
+            await Diagnosis(
+                case_id=ObjectId(), workshop_id="2",
+                status=DiagnosisStatus("finished")
+            ).insert()
+
+            first_page = await Diagnosis.find_in_hub(workshop_id="1", limit=2)
+            assert [d.id for d in first_page] == [d.id for d in diagnoses[:2]]
+
+            next_page = await Diagnosis.find_in_hub(
+                workshop_id="1",
+                status=DiagnosisStatus("finished"),
+                limit=2,
+                after=str(first_page[-1].id)
+            )
+            assert [d.id for d in next_page] == [d.id for d in diagnoses[2:4]]
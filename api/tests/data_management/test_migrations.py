@@ -0,0 +1,33 @@
+import pytest
+from api.data_management import Case, Diagnosis
+from api.data_management.migrations import set_diagnosis_workshop_ids
+from bson import ObjectId
+
+
+@pytest.mark.asyncio
+async def test_set_diagnosis_workshop_ids(initialized_beanie_context):
+    async with initialized_beanie_context:
+        cases = [
+            await Case(workshop_id=f"w{i % 2}", vehicle_vin="v").insert()
+            for i in range(5)
+        ]
+        # diagnoses stored before the workshop_id was part of the schema
+        await Diagnosis.get_motor_collection().insert_many([
+            {"case_id": case.id, "state_machine_log": [], "todos": []}
+            for case in cases
+        ])
+        # diagnosis without case
+        orphan = await Diagnosis.get_motor_collection().insert_one(
+            {"case_id": ObjectId(), "state_machine_log": [], "todos": []}
+        )
+
+        assert await set_diagnosis_workshop_ids(batch_size=2) == 5
+
+        for case in cases:
+            diag = await Diagnosis.find_one({"case_id": case.id})
+            assert diag.workshop_id == case.workshop_id
+        assert (await Diagnosis.get(orphan.inserted_id)).workshop_id is None
+        assert len(await Diagnosis.find_in_hub(workshop_id="w0")) == 3
+
+        # nothing left to migrate
+        assert await set_diagnosis_workshop_ids() == 0
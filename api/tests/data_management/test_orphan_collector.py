@@ -0,0 +1,126 @@
+from datetime import datetime, timedelta, UTC
+
+import pytest
+from api.data_management import (
+    Case, Diagnosis, DiagnosisLogEntry, OrphanCollector, TimeseriesUpload
+)
+from bson import ObjectId
+
+
+@pytest.fixture
+def new_case():
+    return {"workshop_id": "1", "vehicle_vin": "test-vin"}
+
+
+async def insert_file(motor_db, bucket_name: str, age: timedelta) -> ObjectId:
+    """Insert a GridFS file with a single chunk into a bucket."""
+    file_id = ObjectId()
+    await motor_db[f"{bucket_name}.files"].insert_one({
+        "_id": file_id,
+        "length": 1,
+        "chunkSize": 261120,
+        "uploadDate": datetime.now(UTC) - age,
+        "filename": ""
+    })
+    await motor_db[f"{bucket_name}.chunks"].insert_one(
+        {"files_id": file_id, "n": 0, "data": b"\x00"}
+    )
+    return file_id
+
+
+async def file_ids(motor_db, bucket_name: str) -> set:
+    return set(
+        await motor_db[f"{bucket_name}.files"].distinct("_id")
+    ) | set(
+        await motor_db[f"{bucket_name}.chunks"].distinct("files_id")
+    )
+
+
+@pytest.mark.asyncio
+async def test_collect(
+        new_case, timeseries_meta_data, motor_db, initialized_beanie_context
+):
+    old = timedelta(hours=2)
+    async with initialized_beanie_context:
+        for bucket_name in ["signals", "attachments", "uploads"]:
+            await motor_db.drop_collection(f"{bucket_name}.files")
+            await motor_db.drop_collection(f"{bucket_name}.chunks")
+
+        # signals referenced by a case directly and as decimation level
+        signal_id = await insert_file(motor_db, "signals", old)
+        level_id = await insert_file(motor_db, "signals", old)
+        case = Case(
+            **new_case,
+            timeseries_data=[{
+                **timeseries_meta_data,
+                "signal_id": signal_id,
+                "signal_levels": [
+                    {"factor": 10, "length": 1, "signal_id": level_id}
+                ]
+            }]
+        )
+        await case.create()
+        # attachment referenced by a diagnosis
+        attachment_id = await insert_file(motor_db, "attachments", old)
+        await Diagnosis(
+            case_id=case.id,
+            state_machine_log=[
+                DiagnosisLogEntry(message="msg", attachment=attachment_id)
+            ]
+        ).create()
+        # chunk of an upload in progress
+        chunk_id = await insert_file(motor_db, "uploads", old)
+        await TimeseriesUpload(
+            file_format="Picoscope MAT",
+            size=2,
+            channels={"A": {"component": "battery"}},
+            workshop_id="1",
+            case_id=case.id,
+            received=1,
+            chunks=[{"offset": 0, "length": 1, "file_id": chunk_id}]
+        ).create()
+        # recently stored files are not referenced yet
+        new_signal_id = await insert_file(
+            motor_db, "signals", timedelta(seconds=0)
+        )
+        # orphans
+        orphaned_signals = [
+            await insert_file(motor_db, "signals", old) for _ in range(5)
+        ]
+        await insert_file(motor_db, "attachments", old)
+        # chunk of an expired upload
+        await insert_file(motor_db, "uploads", old)
+
+        collector = OrphanCollector()
+        collector.configure(
+            db=motor_db, interval=0, batch_size=2, min_age=3600
+        )
+        result = await collector.collect()
+
+        assert result == {
+            "signals": len(orphaned_signals), "attachments": 1, "uploads": 1
+        }
+        assert await file_ids(motor_db, "signals") == {
+            signal_id, level_id, new_signal_id
+        }
+        assert await file_ids(motor_db, "attachments") == {attachment_id}
+        assert await file_ids(motor_db, "uploads") == {chunk_id}
+        assert collector.stats()["runs"] == 1
+        assert collector.stats()["reclaimed"] == result
+
+        # nothing left to reclaim
+        assert await collector.collect() == {
+            "signals": 0, "attachments": 0, "uploads": 0
+        }
+
+        for bucket_name in ["signals", "attachments", "uploads"]:
+            await motor_db.drop_collection(f"{bucket_name}.files")
+            await motor_db.drop_collection(f"{bucket_name}.chunks")
+
+
+@pytest.mark.asyncio
+async def test_collect_not_configured():
+    collector = OrphanCollector()
+    with pytest.raises(AttributeError):
+        await collector.collect()
+    assert collector.stats()["failed_runs"] == 1
@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+from api.data_management.signal_decimation import (
+    decimate, level_envelope, min_max_envelope
+)
+
+
+def test_min_max_envelope_short_signal_unchanged():
+    signal = np.arange(10.)
+    envelope, bucket_size = min_max_envelope(signal, max_points=10)
+    assert bucket_size == 1
+    np.testing.assert_array_equal(envelope, signal)
+
+
+@pytest.mark.parametrize("length", [101, 150, 1999, 10_000])
+@pytest.mark.parametrize("max_points", [2, 11, 100])
+def test_min_max_envelope_length(length, max_points):
+    signal = np.random.default_rng(0).normal(size=length)
+    envelope, bucket_size = min_max_envelope(signal, max_points=max_points)
+    assert envelope.size <= max_points
+    assert envelope.size == 2 * -(-length // bucket_size)
+    # global extrema are preserved
+    assert envelope.min() == signal.min()
+    assert envelope.max() == signal.max()
+
+
+def test_min_max_envelope_keeps_order_of_occurrence():
+    signal = np.array([0., 5., -5., 0., 0., -3., 3., 0.])
+    envelope, bucket_size = min_max_envelope(signal, max_points=4)
+    assert bucket_size == 4
+    assert envelope.tolist() == [5., -5., -3., 3.]
+
+
+@pytest.mark.parametrize("length", [30, 31, 39])
+def test_decimate(length):
+    signal = np.arange(float(length))
+    level = decimate(signal, factor=10)
+    assert level.shape == (-(-length // 10), 3)
+    np.testing.assert_array_equal(level[0], [0., 9., 4.5])
+    # last block may hold less samples
+    last_block = signal[(len(level) - 1) * 10:]
+    np.testing.assert_array_equal(
+        level[-1], [last_block.min(), last_block.max(), last_block.mean()]
+    )
+
+
+def test_level_envelope_matches_signal_envelope():
+    signal = np.random.default_rng(0).normal(size=10_000)
+    level = decimate(signal, factor=10)
+    envelope, bucket_size = level_envelope(level, max_points=100)
+    expected_envelope, expected_bucket_size = min_max_envelope(
+        signal, max_points=100
+    )
+    assert bucket_size * 10 == expected_bucket_size
+    # extrema per bucket are identical, only order within a bucket may differ
+    np.testing.assert_array_equal(
+        np.sort(envelope.reshape(-1, 2), axis=1),
+        np.sort(expected_envelope.reshape(-1, 2), axis=1)
+    )
@@ -0,0 +1,109 @@
+import numpy as np
+import pytest
+from api.data_management.signal_encoding import (
+    SignalCompression,
+    SignalFormat,
+    SignalStorageDtype,
+    decode_chunk,
+    decode_signal,
+    encode_signal
+)
+
+
+@pytest.fixture
+def signal():
+    """Sine wave sampled with 12 bit resolution in range [-5 V, 5 V]."""
+    t = np.linspace(0, 1, 10_000)
+    signal = 5 * np.sin(2 * np.pi * 50 * t)
+    return np.round(signal / 10 * 4095) * 10 / 4095
+
+
+@pytest.mark.parametrize("compression", ["none", "zlib"])
+@pytest.mark.parametrize("chunk_length", [1, 1000, 3333, 2**16])
+def test_float64_roundtrip_is_lossless(signal, compression, chunk_length):
+    signal_format, chunks = encode_signal(
+        signal,
+        dtype=SignalStorageDtype.float64,
+        compression=SignalCompression(compression),
+        chunk_length=chunk_length
+    )
+    decoded = decode_signal(signal_format, b"".join(chunks))
+    assert decoded.dtype == np.dtype("<f8")
+    np.testing.assert_array_equal(decoded, signal)
+
+
+@pytest.mark.parametrize("compression", ["none", "zlib"])
+def test_float32_roundtrip(signal, compression):
+    signal_format, chunks = encode_signal(
+        signal,
+        dtype=SignalStorageDtype.float32,
+        compression=SignalCompression(compression)
+    )
+    decoded = decode_signal(signal_format, b"".join(chunks))
+    np.testing.assert_allclose(decoded, signal, rtol=1e-6)
+
+
+@pytest.mark.parametrize("compression", ["none", "zlib"])
+def test_int16_roundtrip(signal, compression):
+    signal_format, chunks = encode_signal(
+        signal,
+        dtype=SignalStorageDtype.int16,
+        compression=SignalCompression(compression),
+        chunk_length=1000
+    )
+    decoded = decode_signal(signal_format, b"".join(chunks))
+    # quantisation error is bounded by half of the quantisation step
+    max_error = (signal.max() - signal.min()) / (2 * 32767) / 2
+    np.testing.assert_allclose(decoded, signal, rtol=0, atol=max_error)
+
+
+def test_int16_falls_back_to_float64_with_non_finite_values():
+    signal = [0., np.nan, 1.]
+    signal_format, chunks = encode_signal(
+        signal, dtype=SignalStorageDtype.int16
+    )
+    assert signal_format.dtype == SignalStorageDtype.float64
+    decoded = decode_signal(signal_format, b"".join(chunks))
+    np.testing.assert_array_equal(decoded, signal)
+
+
+@pytest.mark.parametrize("dtype", ["float64", "float32", "int16"])
+def test_constant_and_empty_signals(dtype):
+    for signal in [[], [42.], [42.] * 100]:
+        signal_format, chunks = encode_signal(
+            signal, dtype=SignalStorageDtype(dtype)
+        )
+        assert signal_format.length == len(signal)
+        decoded = decode_signal(signal_format, b"".join(chunks))
+        assert decoded.tolist() == signal
+
+
+def test_zlib_reduces_size_of_adc_signal(signal):
+    _, raw_chunks = encode_signal(
+        signal, compression=SignalCompression.none
+    )
+    _, compressed_chunks = encode_signal(
+        signal, compression=SignalCompression.zlib
+    )
+    raw_size = sum(len(c) for c in raw_chunks)
+    compressed_size = sum(len(c) for c in compressed_chunks)
+    assert raw_size == signal.size * 8
+    assert compressed_size < raw_size
+
+
+def test_chunks_decode_independently(signal):
+    signal_format, chunks = encode_signal(
+        signal, dtype=SignalStorageDtype.int16, chunk_length=1000
+    )
+    assert signal_format.chunk_count == len(chunks) == 10
+    decoded = decode_chunk(signal_format, chunks[3])
+    assert decoded.size == signal_format.chunk_sample_count(3)
+    np.testing.assert_allclose(
+        decoded, signal[3000:4000], rtol=0, atol=1e-3
+    )
+
+
+def test_signal_format_survives_json_roundtrip(signal):
+    signal_format, _ = encode_signal(signal, dtype=SignalStorageDtype.int16)
+    metadata = signal_format.model_dump(mode="json")
+    assert SignalFormat(**metadata) == signal_format
@@ -1,5 +1,7 @@
+from array import array
 from typing import List
 
+import numpy as np
 import pytest
 from api.data_management.timeseries_data import (
     BaseSignalStore, GridFSSignalStore, NewTimeseriesData, TimeseriesData,
@@ -19,6 +21,90 @@ class TestGridFSSignalStore:
         retrieved_signal = await signal_store.get(signal_id)
         assert signal == retrieved_signal
 
+    @pytest.mark.parametrize("dtype", ["float64", "float32", "int16"])
+    @pytest.mark.parametrize("compression", ["none", "zlib"])
+    @pytest.mark.asyncio
+    async def test_create_and_get_with_storage_format(
+            self, signal_bucket, dtype, compression
+    ):
+        signal_store = GridFSSignalStore(
+            signal_bucket,
+            dtype=dtype,
+            compression=compression,
+            chunk_length=2
+        )
+        signal = [-1., 0., 1., 0.5, -0.5]
+        signal_id = await signal_store.create(signal)
+        retrieved_signal = await signal_store.get(signal_id)
+        np.testing.assert_allclose(retrieved_signal, signal, atol=1e-4)
+        # streaming decodes the stored chunks as well
+        length, chunks = await signal_store.stream(signal_id)
+        signal_bytes = b"".join([chunk async for chunk in chunks])
+        assert length == len(signal)
+        np.testing.assert_allclose(
+            np.frombuffer(signal_bytes, dtype="<f8"), signal, atol=1e-4
+        )
+
+    @pytest.mark.parametrize(
+        "start,stop,step",
+        [
+            (None, None, None), (3, 7, None), (0, 10, 3), (5, None, 2),
+            (8, 100, None), (20, 30, None)
+        ]
+    )
+    @pytest.mark.parametrize("compression", ["none", "zlib"])
+    @pytest.mark.asyncio
+    async def test_get_range(
+            self, signal_bucket, start, stop, step, compression
+    ):
+        signal_store = GridFSSignalStore(
+            signal_bucket, compression=compression, chunk_length=3
+        )
+        signal = [float(i) for i in range(10)]
+        signal_id = await signal_store.create(signal)
+        retrieved_range = await signal_store.get_range(
+            signal_id, start=start, stop=stop, step=step
+        )
+        assert retrieved_range.tolist() == signal[start:stop:step]
+
+    @pytest.mark.asyncio
+    async def test_get_range_legacy_float64_signal(self, signal_bucket):
+        signal = [float(i) for i in range(10)]
+        signal_id = await signal_bucket.upload_from_stream(
+            filename="",
+            source=np.array(signal, dtype="<f8").tobytes()
+        )
+        signal_store = GridFSSignalStore(signal_bucket)
+        retrieved_range = await signal_store.get_range(
+            signal_id, start=2, stop=9, step=3
+        )
+        assert retrieved_range.tolist() == signal[2:9:3]
+
+    @pytest.mark.asyncio
+    async def test_get_and_stream_legacy_float64_signal(self, signal_bucket):
+        # seed test bucket with plain float64 bytes without format metadata
+        signal = [-1., 0., 1.]
+        signal_id = await signal_bucket.upload_from_stream(
+            filename="",
+            source=np.array(signal, dtype="<f8").tobytes()
+        )
+        signal_store = GridFSSignalStore(signal_bucket)
+        assert await signal_store.get(signal_id) == signal
+        length, chunks = await signal_store.stream(signal_id)
+        signal_bytes = b"".join([chunk async for chunk in chunks])
+        assert length == len(signal)
+        assert np.frombuffer(signal_bytes, dtype="<f8").tolist() == signal
+
+    @pytest.mark.asyncio
+    async def test_stream(self, signal_bucket):
+        signal_store = GridFSSignalStore(signal_bucket)
+        signal = [-1., 0., 1]
+        signal_id = await signal_store.create(signal)
+        length, chunks = await signal_store.stream(signal_id)
+        signal_bytes = b"".join([chunk async for chunk in chunks])
+        assert length == len(signal)
+        assert np.frombuffer(signal_bytes, dtype="<f8").tolist() == signal
+
     @pytest.mark.asyncio
     async def test_delete(self, signal_bucket):
         # seed test bucket with empty bytes and keep id
@@ -51,10 +137,28 @@ class MockSignalStore(BaseSignalStore):
     async def get(self, id: str) -> List[float]:
         return self.store[id]
 
+    async def get_range(
+            self, id: str, start=None, stop=None, step=None
+    ) -> np.ndarray:
+        return np.asarray(self.store[id], dtype=float)[start:stop:step]
+
     async def delete(self, id: str):
         self.store.pop(id)
 
 
+class FailingSignalStore(MockSignalStore):
+    """Mock signal store that fails once it holds `capacity` signals."""
+
+    def __init__(self, capacity: int):
+        super().__init__()
+        self.capacity = capacity
+
+    async def create(self, signal: List[float]) -> PydanticObjectId:
+        if len(self.store) >= self.capacity:
+            raise ConnectionError("signal store not available")
+        return PydanticObjectId(await super().create(signal))
+
+
 class TestTimeseriesData:
 
     def test_validation_fails_without_signal_id(self, timeseries_meta_data):
@@ -112,6 +216,43 @@ class TestNewTimeseriesData:
     def test_validation_succeeds_with_signal(self, new_timeseries_data):
         NewTimeseriesData(**new_timeseries_data)
 
+    def test_signal_buffer_is_kept(self, new_timeseries_data):
+        signal = array("d", [0., 1., 2.])
+        new_timeseries_data["signal"] = signal
+        new_timeseries_data = NewTimeseriesData(**new_timeseries_data)
+        assert new_timeseries_data.signal is signal
+
+    def test_float64_array_is_kept(self, new_timeseries_data):
+        signal = np.arange(6, dtype=np.float64).reshape(-1, 1)
+        new_timeseries_data["signal"] = signal
+        new_timeseries_data = NewTimeseriesData(**new_timeseries_data)
+        assert new_timeseries_data.signal.shape == (6,)
+        assert np.shares_memory(new_timeseries_data.signal, signal)
+
+    @pytest.mark.parametrize("dtype", ["<f4", ">f8", "<i2"])
+    def test_numeric_array_is_converted(self, dtype, new_timeseries_data):
+        signal = np.arange(6, dtype=dtype)
+        new_timeseries_data["signal"] = signal
+        new_timeseries_data = NewTimeseriesData(**new_timeseries_data)
+        assert new_timeseries_data.signal.dtype == np.dtype("<f8")
+        assert new_timeseries_data.signal.tolist() == signal.tolist()
+
+    def test_validation_fails_with_non_numeric_array(
+            self, new_timeseries_data
+    ):
+        new_timeseries_data["signal"] = np.array(["0", "1"])
+        with pytest.raises(ValidationError):
+            NewTimeseriesData(**new_timeseries_data)
+
+    def test_other_signal_types_are_validated(self, new_timeseries_data):
+        new_timeseries_data["signal"] = array("q", [0, 1, 2])
+        assert isinstance(
+            NewTimeseriesData(**new_timeseries_data).signal, list
+        )
+        new_timeseries_data["signal"] = "0, 1, 2"
+        with pytest.raises(ValidationError):
+            NewTimeseriesData(**new_timeseries_data)
+
     @pytest.mark.asyncio
     async def test_to_timeseries_data(self, new_timeseries_data):
         # configure class to use MockSignalStore
@@ -130,3 +271,78 @@ class TestNewTimeseriesData:
         ids_in_store = list(signal_store.store.keys())
         assert len(ids_in_store) == 1
         assert timeseries_data.signal_id == ids_in_store[0]
+
+    @pytest.mark.asyncio
+    async def test_to_timeseries_data_stores_signal_levels(
+            self, new_timeseries_data
+    ):
+        # configure class to use MockSignalStore
+        signal_store = MockSignalStore()
+        TimeseriesMetaData.signal_store = signal_store
+
+        # a signal with 150 samples gets levels with factors 10 and 100
+        new_timeseries_data["signal"] = list(range(150))
+        new_timeseries_data = NewTimeseriesData(**new_timeseries_data)
+        timeseries_data = await new_timeseries_data.to_timeseries_data()
+
+        assert [
+            (level.factor, level.length)
+            for level in timeseries_data.signal_levels
+        ] == [(10, 15), (100, 2)]
+        assert len(signal_store.store) == 3
+
+        # levels can be retrieved as arrays with columns min, max, mean
+        level = await timeseries_data.get_signal_level(100)
+        np.testing.assert_array_equal(
+            level, [[0., 99., 49.5], [100., 149., 124.5]]
+        )
+        assert await timeseries_data.get_signal_level(1000) is None
+
+        # deleting the signal also deletes all levels
+        await timeseries_data.delete_signal()
+        assert signal_store.store == {}
+
+    @pytest.mark.parametrize("capacity", [0, 1, 2])
+    @pytest.mark.asyncio
+    async def test_to_timeseries_data_store_fails(
+            self, capacity, new_timeseries_data
+    ):
+        # storing the signal or any of its levels fails
+        signal_store = FailingSignalStore(capacity=capacity)
+        TimeseriesMetaData.signal_store = signal_store
+        new_timeseries_data["signal"] = list(range(150))
+        new_timeseries_data = NewTimeseriesData(**new_timeseries_data)
+
+        with pytest.raises(ConnectionError):
+            await new_timeseries_data.to_timeseries_data()
+        # stored signal and levels are deleted again
+        assert signal_store.store == {}
+
+    @pytest.mark.asyncio
+    async def test_get_signal_range_envelope_from_signal_level(
+            self, new_timeseries_data
+    ):
+        signal_store = MockSignalStore()
+        TimeseriesMetaData.signal_store = signal_store
+        new_timeseries_data["signal"] = np.sin(np.arange(10_000)).tolist()
+        new_timeseries_data = NewTimeseriesData(**new_timeseries_data)
+        timeseries_data = await new_timeseries_data.to_timeseries_data()
+        raw_signal_id = timeseries_data.signal_id
+
+        # signal access with step can not use levels
+        signal, sample_distance = await timeseries_data.get_signal_range(
+            step=2
+        )
+        assert signal.size == 5_000
+        assert sample_distance == 2
+
+        # make raw signal unavailable to confirm that envelopes with
+        # buckets of at least 100 samples are computed from levels
+        signal_store.store.pop(raw_signal_id)
+        envelope, sample_distance = await timeseries_data.get_signal_range(
+            max_points=100
+        )
+        assert envelope.size == 100
+        assert sample_distance == 100
+        assert envelope.max() == max(new_timeseries_data.signal)
+        assert envelope.min() == min(new_timeseries_data.signal)
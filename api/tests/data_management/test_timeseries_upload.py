@@ -0,0 +1,161 @@
+import asyncio
+import os
+
+import pytest
+import pytest_asyncio
+from api.data_management import (
+    NewTimeseriesUpload,
+    TimeseriesUpload,
+    UploadOffsetMismatch,
+    UploadSizeExceeded
+)
+from api.upload_filereader.parse_executor import _file_path
+from bson import ObjectId
+from motor import motor_asyncio
+from pydantic import ValidationError
+
+
+@pytest_asyncio.fixture
+async def upload_bucket(motor_db):
+    test_bucket_name = "uploads-pytest"  # dedicated test bucket
+    test_bucket = motor_asyncio.AsyncIOMotorGridFSBucket(
+        motor_db, bucket_name=test_bucket_name
+    )
+    TimeseriesUpload.bucket = test_bucket
+    yield test_bucket
+
+    TimeseriesUpload.bucket = None
+    await motor_db.drop_collection(f"{test_bucket_name}.files")
+    await motor_db.drop_collection(f"{test_bucket_name}.chunks")
+
+
+@pytest.fixture
+def new_upload():
+    return {
+        "file_format": "Picoscope MAT",
+        "size": 10,
+        "channels": {"A": {"component": "battery"}}
+    }
+
+
+async def content(*parts: bytes):
+    for part in parts:
+        yield part
+
+
+class TestNewTimeseriesUpload:
+
+    def test_validation_succeeds(self, new_upload):
+        NewTimeseriesUpload(**new_upload)
+
+    def test_picoscope_requires_channels(self, new_upload):
+        new_upload["channels"] = {}
+        with pytest.raises(ValidationError):
+            NewTimeseriesUpload(**new_upload)
+
+    def test_omniview_requires_description(self, new_upload):
+        new_upload["file_format"] = "Omniview CSV"
+        with pytest.raises(ValidationError):
+            NewTimeseriesUpload(**new_upload)
+        new_upload.update(component="battery", sampling_rate=1, duration=1)
+        NewTimeseriesUpload(**new_upload)
+
+
+class TestTimeseriesUpload:
+
+    @pytest.mark.asyncio
+    async def test_add_chunks_and_open_file(
+            self, new_upload, upload_bucket, initialized_beanie_context
+    ):
+        async with initialized_beanie_context:
+            upload = TimeseriesUpload(
+                workshop_id="1", case_id=ObjectId(), **new_upload
+            )
+            await upload.create()
+            await upload.add_chunk(0, content(b"0123", b"45"))
+            await upload.add_chunk(6, content(b"6789"))
+            assert upload.complete
+
+            # state is persisted
+            upload = await TimeseriesUpload.get(upload.id)
+            assert upload.received == 10
+            assert [(c.offset, c.length) for c in upload.chunks] == \
+                   [(0, 6), (6, 4)]
+
+            file = await upload.open_file()
+            assert file.read() == b"0123456789"
+            # parse workers read the assembled file without another copy
+            file.seek(0)
+            assert _file_path(file) == (file.name, False)
+            file.close()
+            assert not os.path.exists(file.name)
+
+            await upload.discard()
+            assert await TimeseriesUpload.get(upload.id) is None
+            assert await upload_bucket.find().to_list(None) == []
+
+    @pytest.mark.asyncio
+    async def test_add_chunk_rejected(
+            self, new_upload, upload_bucket, initialized_beanie_context
+    ):
+        async with initialized_beanie_context:
+            upload = TimeseriesUpload(
+                workshop_id="1", case_id=ObjectId(), **new_upload
+            )
+            await upload.create()
+            with pytest.raises(UploadOffsetMismatch) as excinfo:
+                await upload.add_chunk(4, content(b"0123"))
+            assert excinfo.value.expected_offset == 0
+            with pytest.raises(UploadSizeExceeded):
+                await upload.add_chunk(0, content(b"0123456789", b"a"))
+            assert upload.received == 0
+            assert await upload_bucket.find().to_list(None) == []
+
+    @pytest.mark.asyncio
+    async def test_add_chunk_concurrently(
+            self, new_upload, upload_bucket, initialized_beanie_context
+    ):
+        async with initialized_beanie_context:
+            upload = TimeseriesUpload(
+                workshop_id="1", case_id=ObjectId(), **new_upload
+            )
+            await upload.create()
+            # two requests send a chunk at the same offset
+            first = await TimeseriesUpload.get(upload.id)
+            second = await TimeseriesUpload.get(upload.id)
+            results = await asyncio.gather(
+                first.add_chunk(0, content(b"01234")),
+                second.add_chunk(0, content(b"01234")),
+                return_exceptions=True
+            )
+            assert sum(
+                isinstance(r, UploadOffsetMismatch) for r in results
+            ) == 1
+
+            # only the accepted chunk is stored
+            upload = await TimeseriesUpload.get(upload.id)
+            assert upload.received == 5
+            assert len(await upload_bucket.find().to_list(None)) == 1
+
+    @pytest.mark.asyncio
+    async def test_finalization_is_claimed_once(
+            self, new_upload, initialized_beanie_context
+    ):
+        async with initialized_beanie_context:
+            upload = TimeseriesUpload(
+                workshop_id="1", case_id=ObjectId(), **new_upload
+            )
+            await upload.create()
+            # two requests finalize the upload
+            first = await TimeseriesUpload.get(upload.id)
+            second = await TimeseriesUpload.get(upload.id)
+            results = await asyncio.gather(
+                first.start_finalization(), second.start_finalization()
+            )
+            assert sorted(results) == [False, True]
+            assert (await TimeseriesUpload.get(upload.id)).state == \
+                "finalizing"
+
+            # finalization can be retried once the claim is released
+            await first.cancel_finalization()
+            assert await second.start_finalization()
@@ -0,0 +1,136 @@
+import httpx
+import pytest
+import pytest_asyncio
+from api.data_management import Publication
+from api.dataspace_management import Nautilus
+from api.dataspace_management.nautilus import LatencyHistogram
+
+
+@pytest.fixture
+def publication():
+    return Publication(
+        did="some-did", asset_key="some-key", asset_url="http://some-url"
+    )
+
+
+@pytest_asyncio.fixture
+async def nautilus_requests():
+    """
+    Configure Nautilus with a mock transport. Responses are taken from the
+    returned list and all received requests are recorded.
+    """
+    class NautilusRequests:
+        responses = []
+        received = []
+
+    def handler(request: httpx.Request):
+        NautilusRequests.received.append(request)
+        response = NautilusRequests.responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    Nautilus.configure(
+        url="http://nautilus",
+        timeout=1,
+        api_key_assets="key",
+        max_retries=2,
+        retry_backoff=0.
+    )
+    Nautilus.open_client(transport=httpx.MockTransport(handler))
+    Nautilus._latencies = {}
+    yield NautilusRequests
+    await Nautilus.close_client()
+    Nautilus.configure(url=None, timeout=None, api_key_assets=None)
+
+
+class TestNautilus:
+
+    @pytest.mark.asyncio
+    async def test_revoke_publication_retried(
+            self, nautilus_requests, publication
+    ):
+        nautilus_requests.responses = [
+            httpx.ConnectError("Connection refused"),
+            httpx.Response(status_code=503),
+            httpx.Response(status_code=200)
+        ]
+        retries = Nautilus.stats()["retries"]
+
+        success, info = await Nautilus().revoke_publication(
+            publication=publication, nautilus_private_key="42"
+        )
+
+        assert success, info
+        assert len(nautilus_requests.received) == 3
+        assert Nautilus.stats()["retries"] == retries + 2
+        revoke_latencies = Nautilus.stats()["latencies"]["revoke"]
+        assert revoke_latencies["count"] == 3
+        assert revoke_latencies["failed"] == 2
+
+    @pytest.mark.asyncio
+    async def test_revoke_publication_retries_exhausted(
+            self, nautilus_requests, publication
+    ):
+        nautilus_requests.responses = [
+            httpx.TimeoutException("Timeout") for _ in range(3)
+        ]
+
+        success, info = await Nautilus().revoke_publication(
+            publication=publication, nautilus_private_key="42"
+        )
+
+        assert not success
+        assert info == "Connection timeout."
+        assert len(nautilus_requests.received) == 3
+
+    @pytest.mark.asyncio
+    async def test_revoke_publication_client_error_not_retried(
+            self, nautilus_requests, publication
+    ):
+        nautilus_requests.responses = [
+            httpx.Response(status_code=404, text="Unknown did.")
+        ]
+
+        success, info = await Nautilus().revoke_publication(
+            publication=publication, nautilus_private_key="42"
+        )
+
+        assert not success
+        assert info == "Unknown did."
+        assert len(nautilus_requests.received) == 1
+
+    @pytest.mark.asyncio
+    async def test_requests_share_client(
+            self, nautilus_requests, publication
+    ):
+        nautilus_requests.responses = [
+            httpx.Response(status_code=200) for _ in range(2)
+        ]
+        client = Nautilus._client
+
+        for _ in range(2):
+            await Nautilus().revoke_publication(
+                publication=publication, nautilus_private_key="42"
+            )
+
+        assert Nautilus._client is client
+        assert nautilus_requests.received[0].url == \
+               "http://nautilus/revoke/PONTUSXDEV/some-did"
+        assert nautilus_requests.received[0].headers["priv_key"] == "42"
+
+
+class TestLatencyHistogram:
+
+    def test_observe(self):
+        histogram = LatencyHistogram(buckets=(0.1, 1.))
+        for seconds in [0.05, 0.1, 0.5, 2.]:
+            histogram.observe(seconds)
+        histogram.observe(3., failed=True)
+
+        assert histogram.stats() == {
+            "count": 5,
+            "failed": 1,
+            "sum_seconds": 5.65,
+            "buckets": {"0.1": 2, "1.0": 3, "+Inf": 5}
+        }
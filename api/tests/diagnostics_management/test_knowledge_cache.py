@@ -0,0 +1,123 @@
+import asyncio
+from unittest import mock
+
+import pytest
+from api.diagnostics_management.knowledge_cache import KnowledgeCache
+
+
+class Loader:
+    """Awaitable loader counting its calls."""
+
+    def __init__(self, *values):
+        self.values = list(values)
+        self.calls = 0
+        self.release = asyncio.Event()
+        self.release.set()
+
+    async def __call__(self):
+        self.calls += 1
+        await self.release.wait()
+        value = self.values.pop(0)
+        if isinstance(value, Exception):
+            raise value
+        return value
+
+
+class TestKnowledgeCache:
+
+    @pytest.mark.asyncio
+    async def test_get_fresh(self):
+        cache = KnowledgeCache(ttl=60., max_stale=60.)
+        load = Loader(["a"], ["b"])
+        assert await cache.get("key", load) == ["a"]
+        assert await cache.get("key", load) == ["a"]
+        assert load.calls == 1
+        assert cache.stats()["misses"] == 1
+        assert cache.stats()["hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_get_stale_while_revalidate(self):
+        cache = KnowledgeCache(ttl=60., max_stale=60.)
+        load = Loader(["a"], ["b"])
+        with mock.patch("time.monotonic", return_value=0.):
+            await cache.get("key", load)
+        with mock.patch("time.monotonic", return_value=90.):
+            # stale value is returned while refreshing in the background
+            assert await cache.get("key", load) == ["a"]
+            await asyncio.sleep(0)
+            assert await cache.get("key", load) == ["b"]
+        assert load.calls == 2
+        assert cache.stats()["stale_hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_get_expired(self):
+        cache = KnowledgeCache(ttl=60., max_stale=60.)
+        load = Loader(["a"], ["b"])
+        with mock.patch("time.monotonic", return_value=0.):
+            await cache.get("key", load)
+        with mock.patch("time.monotonic", return_value=121.):
+            assert await cache.get("key", load) == ["b"]
+        assert cache.stats()["misses"] == 2
+
+    @pytest.mark.asyncio
+    async def test_failed_refresh_keeps_stale_value(self):
+        cache = KnowledgeCache(ttl=60., max_stale=60.)
+        load = Loader(["a"], ConnectionError("kg down"))
+        with mock.patch("time.monotonic", return_value=0.):
+            await cache.get("key", load)
+        with mock.patch("time.monotonic", return_value=90.):
+            assert await cache.get("key", load) == ["a"]
+            await asyncio.sleep(0)
+            await asyncio.sleep(0)
+            assert await cache.get("key", Loader(["b"])) == ["a"]
+        assert cache.stats()["failed_refreshes"] == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_load_is_raised_and_not_cached(self):
+        cache = KnowledgeCache()
+        with pytest.raises(ConnectionError):
+            await cache.get("key", Loader(ConnectionError("kg down")))
+        assert await cache.get("key", Loader(["a"])) == ["a"]
+
+    @pytest.mark.asyncio
+    async def test_concurrent_loads_are_coalesced(self):
+        cache = KnowledgeCache()
+        load = Loader(["a"], ["b"])
+        load.release.clear()
+        results = asyncio.gather(*[cache.get("key", load) for _ in range(5)])
+        await asyncio.sleep(0)
+        load.release.set()
+        assert await results == [["a"]] * 5
+        assert load.calls == 1
+
+    @pytest.mark.asyncio
+    async def test_invalidate(self):
+        cache = KnowledgeCache()
+        load = Loader(["a"], ["b"])
+        await cache.get("key", load)
+        cache.invalidate()
+        assert cache.stats()["size"] == 0
+        assert await cache.get("key", load) == ["b"]
+
+    @pytest.mark.asyncio
+    async def test_invalidate_discards_running_load(self):
+        cache = KnowledgeCache()
+        load = Loader(["outdated"])
+        load.release.clear()
+        result = asyncio.ensure_future(cache.get("key", load))
+        await asyncio.sleep(0)
+        cache.invalidate()
+        load.release.set()
+        assert await result == ["outdated"]
+        assert await cache.get("key", Loader(["a"])) == ["a"]
+
+    @pytest.mark.asyncio
+    async def test_stop_cancels_loads(self):
+        cache = KnowledgeCache()
+        load = Loader(["a"])
+        load.release.clear()
+        result = asyncio.ensure_future(cache.get("key", load))
+        await asyncio.sleep(0)
+        await cache.stop()
+        with pytest.raises(asyncio.CancelledError):
+            await result
@@ -0,0 +1,149 @@
+import httpx
+import pytest
+import pytest_asyncio
+from api.diagnostics_management import KnowledgeGraph, knowledge_cache
+from api.diagnostics_management.knowledge_queries import (
+    KnowledgeQueries, PreparedQuery, SuspectComponent, sparql_literal
+)
+
+KG_OBD_URL = "http://kg/OBD"
+
+
+@pytest_asyncio.fixture
+async def kg_client(kg_graph_transport):
+    """Answer queries with the in-memory test knowledge graph."""
+    KnowledgeGraph.open_client(transport=kg_graph_transport)
+    knowledge_cache.invalidate()
+    yield kg_graph_transport
+    knowledge_cache.invalidate()
+    await KnowledgeGraph.close_client()
+
+
+@pytest.mark.parametrize(
+    "value,literal",
+    [
+        ("P0123", "\"P0123\""),
+        ("a\"b", "\"a\\\"b\""),
+        ("a\\b", "\"a\\\\b\""),
+        ("a\nb", "\"a\\nb\"")
+    ]
+)
+def test_sparql_literal(value, literal):
+    assert sparql_literal(value) == literal
+
+
+class TestPreparedQuery:
+
+    def test_bind(self):
+        query = PreparedQuery(
+            name="test", parameter="x", query="SELECT ?x WHERE { %VALUES% }"
+        )
+        assert query.bind(["a", "b"]).endswith(
+            "SELECT ?x WHERE { VALUES ?x { \"a\" \"b\" } }"
+        )
+
+    def test_missing_placeholder(self):
+        with pytest.raises(ValueError):
+            PreparedQuery(name="test", parameter="x", query="SELECT ?x {}")
+
+
+class TestKnowledgeQueries:
+
+    @pytest.mark.asyncio
+    async def test_suspect_components(self, kg_client):
+        result = await KnowledgeQueries().suspect_components(
+            KG_OBD_URL, ["P0123", "P0000"]
+        )
+        assert result == {
+            "P0123": [
+                SuspectComponent(
+                    name="boost_pressure_control_valve",
+                    priority=0,
+                    use_oscilloscope=True
+                )
+            ],
+            "P0000": []
+        }
+
+    @pytest.mark.asyncio
+    async def test_affecting_components(self, kg_client):
+        result = await KnowledgeQueries().affecting_components(
+            KG_OBD_URL,
+            ["boost_pressure_control_valve", "boost_pressure_solenoid_valve"]
+        )
+        assert result == {
+            "boost_pressure_control_valve": ["boost_pressure_solenoid_valve"],
+            "boost_pressure_solenoid_valve": []
+        }
+
+    @pytest.mark.asyncio
+    async def test_lookups_are_batched(self, kg_client):
+        queries = KnowledgeQueries(batch_size=2)
+        await queries.suspect_components(
+            KG_OBD_URL, ["P0001", "P0002", "P0003", "P0001"]
+        )
+        # one query for the dataset version and two batches of dtcs
+        assert len(kg_client.queries) == 3
+        assert queries.stats()["queries"] == 2
+        assert "\"P0001\" \"P0002\"" in kg_client.queries[1]
+        assert "\"P0003\"" in kg_client.queries[2]
+
+    @pytest.mark.asyncio
+    async def test_lookups_are_memoised(self, kg_client):
+        queries = KnowledgeQueries()
+        await queries.suspect_components(KG_OBD_URL, ["P0123"])
+        result = await queries.suspect_components(
+            KG_OBD_URL, ["P0123", "P0000"]
+        )
+        assert [c.name for c in result["P0123"]] == [
+            "boost_pressure_control_valve"
+        ]
+        assert queries.stats()["hits"] == 1
+        assert queries.stats()["misses"] == 2
+        # only the unknown dtc is looked up again
+        assert "\"P0123\"" not in kg_client.queries[-1]
+        assert "\"P0000\"" in kg_client.queries[-1]
+
+    @pytest.mark.asyncio
+    async def test_new_dataset_version_is_not_served_from_cache(
+            self, kg_client, kg_graph
+    ):
+        queries = KnowledgeQueries()
+        await queries.suspect_components(KG_OBD_URL, ["P0123"])
+        # reload knowledge graph without the associations of dtc P0123
+        kg_graph.update(
+            "DELETE WHERE { ?dtc "
+            "<http://www.semanticweb.org/diag_ontology#hasAssociation> ?a }"
+        )
+        knowledge_cache.invalidate()
+        result = await queries.suspect_components(KG_OBD_URL, ["P0123"])
+        assert result == {"P0123": []}
+
+    @pytest.mark.asyncio
+    async def test_values_are_escaped(self, kg_client):
+        result = await KnowledgeQueries().suspect_components(
+            KG_OBD_URL, ["P0123\" } ?dtc_entry ?p ?o . {"]
+        )
+        assert result == {"P0123\" } ?dtc_entry ?p ?o . {": []}
+
+    @pytest.mark.asyncio
+    async def test_cache_size_is_bounded(self, kg_client):
+        queries = KnowledgeQueries(max_size=2)
+        await queries.suspect_components(KG_OBD_URL, ["a", "b", "c"])
+        assert queries.stats()["size"] == 2
+
+    @pytest.mark.asyncio
+    async def test_kg_not_available(self):
+        KnowledgeGraph.open_client(
+            transport=httpx.MockTransport(
+                lambda request: httpx.Response(503)
+            )
+        )
+        knowledge_cache.invalidate()
+        try:
+            with pytest.raises(httpx.HTTPStatusError):
+                await KnowledgeQueries().suspect_components(
+                    KG_OBD_URL, ["P0123"]
+                )
+        finally:
+            await KnowledgeGraph.close_client()
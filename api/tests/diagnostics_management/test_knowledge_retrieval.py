@@ -1,14 +1,26 @@
+import httpx
+import pytest
+import pytest_asyncio
+from api.diagnostics_management import KnowledgeGraph, knowledge_cache
 from api.diagnostics_management.knowledge_retrieval import (
-    get_components_from_knowledge_graph
+    fetch_components, get_components_from_knowledge_graph
 )
-import pytest
+
+
+@pytest_asyncio.fixture(autouse=True)
+async def close_kg_client():
+    """Pooled connections are bound to the event loop of a test."""
+    knowledge_cache.invalidate()
+    yield
+    knowledge_cache.invalidate()
+    await KnowledgeGraph.close_client()
 
 
 @pytest.mark.asyncio
 async def test_list_vehicle_components(
         kg_url, kg_obd_dataset_name, kg_components, kg_prefilled
 ):
-    retrieved_components = get_components_from_knowledge_graph(
+    retrieved_components = await get_components_from_knowledge_graph(
         f"{kg_url}/{kg_obd_dataset_name}"
     )
     assert sorted(retrieved_components) == sorted(kg_components)
@@ -16,7 +28,7 @@ async def test_list_vehicle_components(
 
 @pytest.mark.asyncio
 async def test_list_vehicle_components_invalid_kg_in_url(kg_obd_dataset_name):
-    retrieved_components = get_components_from_knowledge_graph(
+    retrieved_components = await get_components_from_knowledge_graph(
         f"http://no-kg-hosted-here:4242/{kg_obd_dataset_name}"
     )
     assert retrieved_components == []
@@ -24,7 +36,42 @@ async def test_list_vehicle_components_invalid_kg_in_url(kg_obd_dataset_name):
 
 @pytest.mark.asyncio
 async def test_list_vehicle_components_invalid_dataset_in_url(kg_url):
-    retrieved_components = get_components_from_knowledge_graph(
+    retrieved_components = await get_components_from_knowledge_graph(
         f"{kg_url}/no-dataset-here"
     )
     assert retrieved_components == []
+
+
+@pytest.mark.asyncio
+async def test_fetch_components_uses_shared_client(kg_obd_dataset_name):
+    received = []
+
+    def handler(request: httpx.Request):
+        received.append(request)
+        return httpx.Response(
+            200,
+            json={"results": {"bindings": [{"name": {"value": "battery"}}]}}
+        )
+
+    KnowledgeGraph.open_client(transport=httpx.MockTransport(handler))
+    components = await fetch_components(f"http://kg/{kg_obd_dataset_name}")
+    await fetch_components(f"http://kg/{kg_obd_dataset_name}")
+    assert components == ["battery"]
+    assert len(received) == 2
+    assert str(received[0].url) == f"http://kg/{kg_obd_dataset_name}/sparql"
+    assert received[0].headers["Content-Type"] == "application/sparql-query"
+    assert b"SuspectComponent" in received[0].content
+
+
+@pytest.mark.asyncio
+async def test_fetch_components_unexpected_response(kg_obd_dataset_name):
+    KnowledgeGraph.open_client(
+        transport=httpx.MockTransport(
+            lambda request: httpx.Response(200, json={"no": "results"})
+        )
+    )
+    with pytest.raises(KeyError):
+        await fetch_components(f"http://kg/{kg_obd_dataset_name}")
+    assert await get_components_from_knowledge_graph(
+        f"http://kg/{kg_obd_dataset_name}"
+    ) == []
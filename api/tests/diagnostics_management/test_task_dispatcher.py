@@ -0,0 +1,230 @@
+import asyncio
+from datetime import datetime, timedelta, UTC
+from unittest import mock
+
+import pytest
+from api.data_management import Case, Diagnosis, TaskDispatch
+from api.diagnostics_management import TaskDispatcher
+from bson import ObjectId
+
+TASK_NAME = "diagnostics.tasks.diagnose"
+
+
+@pytest.fixture
+def celery():
+    """Celery mock recording the published tasks."""
+    celery = mock.MagicMock()
+    celery.published = []
+
+    def send_task(name, args, producer, retry):
+        celery.published.append((name, args))
+
+    celery.send_task.side_effect = send_task
+    return celery
+
+
+@pytest.fixture
+def dispatcher(celery):
+    dispatcher = TaskDispatcher()
+    dispatcher.configure(
+        celery=celery,
+        interval=60.,
+        batch_size=10,
+        retry_backoff=1.,
+        max_backoff=10.
+    )
+    return dispatcher
+
+
+async def create_diagnosis(linked: bool = True) -> ObjectId:
+    """Create a diagnosis and its case, which links the diagnosis."""
+    case = Case(workshop_id="1", vehicle_vin="test-vin")
+    await case.create()
+    diagnosis = Diagnosis(case_id=case.id)
+    await diagnosis.create()
+    if linked:
+        case.diagnosis_id = diagnosis.id
+        await case.save()
+    return diagnosis.id
+
+
+async def record_dispatch(diagnosis_id, **kwargs) -> TaskDispatch:
+    dispatch = TaskDispatch(
+        task_name=TASK_NAME, diagnosis_id=diagnosis_id, **kwargs
+    )
+    await dispatch.insert()
+    return dispatch
+
+
+class TestTaskDispatcher:
+
+    @pytest.mark.asyncio
+    async def test_dispatch_due(
+            self, dispatcher, celery, initialized_beanie_context
+    ):
+        async with initialized_beanie_context:
+            diagnosis_ids = [await create_diagnosis() for _ in range(3)]
+            for diagnosis_id in diagnosis_ids:
+                await record_dispatch(diagnosis_id)
+
+            assert await dispatcher.dispatch_due() == 3
+
+            assert celery.published == [
+                (TASK_NAME, (str(diagnosis_id),))
+                for diagnosis_id in diagnosis_ids
+            ]
+            # all tasks are published over a single connection
+            celery.producer_or_acquire.assert_called_once()
+            assert await TaskDispatch.find_all().count() == 0
+            assert dispatcher.stats()["dispatched"] == 3
+
+    @pytest.mark.asyncio
+    async def test_dispatch_due_in_batches(
+            self, dispatcher, celery, initialized_beanie_context
+    ):
+        dispatcher.batch_size = 2
+        async with initialized_beanie_context:
+            for _ in range(3):
+                await record_dispatch(await create_diagnosis())
+
+            assert await dispatcher.dispatch_due() == 2
+            assert await dispatcher.dispatch_due() == 1
+            assert await dispatcher.dispatch_due() == 0
+            assert len(celery.published) == 3
+
+    @pytest.mark.asyncio
+    async def test_dispatch_due_broker_unavailable(
+            self, dispatcher, celery, initialized_beanie_context
+    ):
+        celery.producer_or_acquire.side_effect = ConnectionError(
+            "broker unavailable"
+        )
+        async with initialized_beanie_context:
+            dispatch = await record_dispatch(await create_diagnosis())
+
+            assert await dispatcher.dispatch_due() == 1
+
+            # dispatch is kept for a retry after backoff
+            dispatch = await TaskDispatch.get(dispatch.id)
+            assert dispatch.attempts == 1
+            assert dispatch.last_error == "broker unavailable"
+            assert dispatch.claim is None
+            assert dispatch.next_attempt.replace(tzinfo=UTC) > \
+                datetime.now(UTC)
+            assert dispatcher.stats()["failed_attempts"] == 1
+            # not due before the backoff passed
+            assert await dispatcher.dispatch_due() == 0
+
+            celery.producer_or_acquire.side_effect = None
+            await dispatch.set({TaskDispatch.next_attempt: datetime.now(UTC)})
+            assert await dispatcher.dispatch_due() == 1
+            assert len(celery.published) == 1
+            assert await TaskDispatch.find_all().count() == 0
+
+    @pytest.mark.asyncio
+    async def test_dispatch_due_single_task_fails(
+            self, dispatcher, celery, initialized_beanie_context
+    ):
+        def send_task(name, args, producer, retry):
+            if len(celery.send_task.mock_calls) == 1:
+                raise ConnectionError("publish failed")
+            celery.published.append((name, args))
+
+        celery.send_task.side_effect = send_task
+        async with initialized_beanie_context:
+            failing = await record_dispatch(await create_diagnosis())
+            await record_dispatch(await create_diagnosis())
+
+            await dispatcher.dispatch_due()
+
+            assert len(celery.published) == 1
+            remaining = await TaskDispatch.find_all().to_list()
+            assert [dispatch.id for dispatch in remaining] == [failing.id]
+            assert remaining[0].attempts == 1
+
+    @pytest.mark.asyncio
+    async def test_dispatch_due_diagnosis_not_created(
+            self, dispatcher, celery, initialized_beanie_context
+    ):
+        async with initialized_beanie_context:
+            # diagnosis might still be created
+            pending = await record_dispatch(ObjectId())
+            # diagnosis creation failed
+            await record_dispatch(
+                ObjectId(),
+                created=datetime.now(UTC) - timedelta(minutes=5)
+            )
+
+            await dispatcher.dispatch_due()
+
+            assert celery.published == []
+            remaining = await TaskDispatch.find_all().to_list()
+            assert [dispatch.id for dispatch in remaining] == [pending.id]
+            assert remaining[0].claim is None
+            assert dispatcher.stats()["dropped"] == 1
+
+    @pytest.mark.asyncio
+    async def test_dispatch_due_diagnosis_not_linked(
+            self, dispatcher, celery, initialized_beanie_context
+    ):
+        async with initialized_beanie_context:
+            # diagnosis exists, but the case does not link it yet
+            pending = await record_dispatch(
+                await create_diagnosis(linked=False)
+            )
+            # linking the diagnosis failed
+            await record_dispatch(
+                await create_diagnosis(linked=False),
+                created=datetime.now(UTC) - timedelta(minutes=5)
+            )
+
+            await dispatcher.dispatch_due()
+
+            # the diagnostics service could not find the case
+            assert celery.published == []
+            remaining = await TaskDispatch.find_all().to_list()
+            assert [dispatch.id for dispatch in remaining] == [pending.id]
+            assert dispatcher.stats()["dropped"] == 1
+
+    @pytest.mark.asyncio
+    async def test_dispatch_due_skips_claimed(
+            self, dispatcher, celery, initialized_beanie_context
+    ):
+        async with initialized_beanie_context:
+            # claimed by another instance of the api
+            await record_dispatch(
+                await create_diagnosis(),
+                claim="other",
+                next_attempt=datetime.now(UTC) + timedelta(seconds=60)
+            )
+
+            assert await dispatcher.dispatch_due() == 0
+            assert celery.published == []
+
+    @pytest.mark.asyncio
+    async def test_dispatch_due_celery_not_configured(
+            self, initialized_beanie_context
+    ):
+        with pytest.raises(AttributeError):
+            await TaskDispatcher().dispatch_due()
+
+    @pytest.mark.asyncio
+    async def test_wakeup(
+            self, dispatcher, celery, initialized_beanie_context
+    ):
+        async with initialized_beanie_context:
+            dispatcher.start()
+            try:
+                await asyncio.sleep(0.05)
+                runs = dispatcher.stats()["runs"]
+                await record_dispatch(await create_diagnosis())
+                dispatcher.wakeup()
+                # dispatched without waiting for the interval
+                for _ in range(100):
+                    if celery.published:
+                        break
+                    await asyncio.sleep(0.01)
+                assert len(celery.published) == 1
+                assert dispatcher.stats()["runs"] > runs
+            finally:
+                await dispatcher.stop()
@@ -1,5 +1,6 @@
 import pytest
-from api.diagnostics_management import tasks
+from api.data_management import TaskDispatch
+from api.diagnostics_management import tasks, task_dispatcher
 from bson import ObjectId
 from celery import Celery
 
@@ -27,21 +28,30 @@ class TestDiagnosticTaskManager:
     async def test_call(
             self,
             DiagnosticTaskManager,
+            initialized_beanie_context,
             monkeypatch
     ):
         DiagnosticTaskManager.set_celery(Celery())
-        send_task_args = []
 
         def mock_send_task(self, name, args):
-            send_task_args.append(name)
-            send_task_args.append(args)
+            raise Exception("Tasks are not expected to be sent directly")
 
         monkeypatch.setattr(Celery, "send_task", mock_send_task)
-
-        diag_id = ObjectId()
-        await DiagnosticTaskManager()(diag_id)
-
-        # confirm expected call to Celery.send_task
-        assert send_task_args[0] == \
-               DiagnosticTaskManager._diagnostic_task_name
-        assert send_task_args[1] == (str(diag_id),)
+        wakeups = []
+        monkeypatch.setattr(
+            task_dispatcher, "wakeup", lambda: wakeups.append(True)
+        )
+
+        async with initialized_beanie_context:
+            diag_id = ObjectId()
+            await DiagnosticTaskManager()(diag_id)
+
+            # confirm the dispatch was recorded for the task dispatcher
+            dispatches = await TaskDispatch.find_all().to_list()
+            assert len(dispatches) == 1
+            assert dispatches[0].task_name == \
+                DiagnosticTaskManager._diagnostic_task_name
+            assert dispatches[0].diagnosis_id == diag_id
+            assert dispatches[0].attempts == 0
+            # the dispatcher is woken up once the case links the diagnosis
+            assert wakeups == []
@@ -1,14 +1,14 @@
 import os
+from contextlib import asynccontextmanager
 from datetime import datetime, timedelta, UTC
-from unittest.mock import AsyncMock
 from zipfile import ZipFile
 
 import httpx
 import pytest
+import pytest_asyncio
 from api.data_management import (
     Asset, AssetDefinition, Publication
 )
-from api.dataspace_management import nautilus
 from api.routers import assets
 from api.routers.assets import Nautilus
 from api.security.keycloak import Keycloak
@@ -215,6 +215,25 @@ async def test_get_asset(
     assert response.json()["_id"] == asset_id
 
 
+@asynccontextmanager
+async def nautilus_mock_transport(handler):
+    """
+    Configure Nautilus to send all requests to handler instead of an
+    external nautilus instance.
+    """
+    Nautilus.configure(
+        url="http://nothing-here",
+        timeout=None,
+        api_key_assets=None,
+        retry_backoff=0.
+    )
+    Nautilus.open_client(transport=httpx.MockTransport(handler))
+    yield
+    # Clean up
+    await Nautilus.close_client()
+    Nautilus.configure(url=None, timeout=None, api_key_assets=None)
+
+
 @pytest.fixture
 def patch_nautilus_to_fail_revocation(
         authenticated_async_client, monkeypatch
@@ -261,39 +280,18 @@ async def test_delete_asset(
         assert asset_db is None
 
 
-@pytest.fixture
-def patch_nautilus_to_avoid_external_revocation_request(
-        authenticated_async_client, monkeypatch
+@pytest_asyncio.fixture
+async def patch_nautilus_to_avoid_external_revocation_request(
+        authenticated_async_client
 ):
     """
     Patch Nautilus to avoid external request for asset revocation
     """
-    # Configure url to avoid failure of Nautilus constructor
-    Nautilus.configure(
-        url="http://nothing-here",
-        timeout=None,
-        api_key_assets=None
-    )
-
-    # Create mock for the httpx.AsyncClient.post method
-    mock_post = AsyncMock(spec=httpx.AsyncClient.post)
-    mock_post.return_value = httpx.Response(
-        status_code=200,
-        request=httpx.Request("POST", "http://nothing-here")
-    )
-
-    # Patch httpx.AsyncClient.post in the nautilus module to avoid external
-    # request
-    monkeypatch.setattr(
-        nautilus.httpx.AsyncClient,
-        "post",
-        mock_post
-    )
-
-    yield
+    def handler(request: httpx.Request):
+        return httpx.Response(status_code=200)
 
-    # Clean up
-    Nautilus.configure(url=None, timeout=None, api_key_assets=None)
+    async with nautilus_mock_transport(handler):
+        yield
 
 
 @pytest.mark.asyncio
@@ -452,38 +450,19 @@ async def test_publish_asset_already_published(
     assert response.json() == asset.publication.model_dump()
 
 
-@pytest.fixture
-def patch_nautilus_to_avoid_external_request(
-        authenticated_async_client, monkeypatch
+@pytest_asyncio.fixture
+async def patch_nautilus_to_avoid_external_request(
+        authenticated_async_client
 ):
     """
     Patch Nautilus to just return a publication without first attempting any
     external http requests.
     """
-    # Configure url to avoid failure of Nautilus constructor
-    Nautilus.configure(
-        url="http://nothing-here",
-        timeout=None,
-        api_key_assets=None
-    )
+    def handler(request: httpx.Request):
+        return httpx.Response(status_code=201, json={"assetdid": "newdid"})
 
-    # Create mock of httpx.AsyncClient
-    class MockAsyncClient:
-        async def post(self, url, headers, timeout, json):
-            return httpx.Response(
-                status_code=201,
-                request=httpx.Request("post", url),
-                json={"assetdid": "newdid"}
-            )
-
-    # Patch httpx.AsyncClient.post in the nautilus module to avoid external
-    # request
-    monkeypatch.setattr(
-        nautilus.httpx, "AsyncClient",  MockAsyncClient
-    )
-    yield
-    # Clean up
-    Nautilus.configure(url=None, timeout=None, api_key_assets=None)
+    async with nautilus_mock_transport(handler):
+        yield
 
 
 @pytest.mark.asyncio
@@ -516,33 +495,20 @@ async def test_publish_asset(
         )
 
 
-@pytest.fixture
-def patch_nautilus_to_timeout_communication(
-        authenticated_async_client, monkeypatch
+@pytest_asyncio.fixture
+async def patch_nautilus_to_timeout_communication(
+        authenticated_async_client
 ):
     """
     Patch Nautilus such that external publication request times out.
     """
-    # Configure url to avoid failure of Nautilus constructor
-    Nautilus.configure(
-        url="http://nothing-here",
-        timeout=None,
-        api_key_assets=None
-    )
-
-    # Patch httpx.AsyncClient.post in the nautilus module to timeout
-    class MockAsyncClient:
-        async def post(self, url, headers, timeout, json):
-            raise httpx.TimeoutException(
-                "Simulated timeout during dataset publication"
-            )
+    def handler(request: httpx.Request):
+        raise httpx.TimeoutException(
+            "Simulated timeout during dataset publication"
+        )
 
-    monkeypatch.setattr(
-        nautilus.httpx, "AsyncClient", MockAsyncClient
-    )
-    yield
-    # Clean up
-    Nautilus.configure(url=None, timeout=None, api_key_assets=None)
+    async with nautilus_mock_transport(handler):
+        yield
 
 
 @pytest.mark.asyncio
@@ -569,37 +535,19 @@ async def test_publish_asset_with_communication_timeout(
                                              "nautilus: Connection timeout.")
 
 
-@pytest.fixture(params=[400, 401, 500, 501])
-def patch_nautilus_to_fail_http_communication(
-        authenticated_async_client, monkeypatch, request
+@pytest_asyncio.fixture(params=[400, 401, 500, 501])
+async def patch_nautilus_to_fail_http_communication(
+        authenticated_async_client, request
 ):
     """
     Patch Nautilus such that external publication request fails with
     non-success http status code.
     """
-    # Configure url to avoid failure of Nautilus constructor
-    Nautilus.configure(
-        url="http://nothing-here",
-        timeout=None,
-        api_key_assets=None
-    )
+    def handler(nautilus_request: httpx.Request):
+        return httpx.Response(status_code=request.param, text="Failed.")
 
-    # Patch httpx.AsyncClient.post in the nautilus module to avoid external
-    # request and to respond with non-success http code
-    class MockAsyncClient:
-        async def post(self, url, headers, timeout, json):
-            return httpx.Response(
-                status_code=request.param,
-                text="Failed.",
-                request=httpx.Request("post", url)
-            )
-
-    monkeypatch.setattr(
-        nautilus.httpx, "AsyncClient", MockAsyncClient
-    )
-    yield
-    # Clean up
-    Nautilus.configure(url=None, timeout=None, api_key_assets=None)
+    async with nautilus_mock_transport(handler):
+        yield
 
 
 @pytest.mark.asyncio
@@ -1,8 +1,10 @@
+import asyncio
+
 import pytest
 from api.data_management import (
     Case, NewOBDData, NewSymptom, NewTimeseriesData,
     TimeseriesMetaData, Action, AttachmentBucket, Diagnosis,
-    SymptomLabel
+    SymptomLabel, SymptomUpdate
 )
 from api.data_management.timeseries_data import GridFSSignalStore
 from api.routers import diagnostics
@@ -103,6 +105,50 @@ async def test_get_obd_data_no_data(
         assert response.json() == []
 
 
+@pytest.mark.asyncio
+async def test_get_obd_data_wait(
+        diag_id, case_id, data_context, initialized_beanie_context
+):
+    async with initialized_beanie_context, data_context:
+        async def add_obd_data():
+            await asyncio.sleep(0.1)
+            case = await Case.get(case_id)
+            await case.add_obd_data(NewOBDData(dtcs=["P1234"]))
+
+        # request is answered as soon as data is added
+        add = asyncio.create_task(add_obd_data())
+        response = await client.get(
+            f"/{diag_id}/obd_data", params={"wait": 10}, timeout=5
+        )
+        await add
+        assert response.status_code == 200
+        assert response.json()[0]["dtcs"] == ["P1234"]
+
+
+@pytest.mark.asyncio
+async def test_get_obd_data_wait_timeout(
+        diag_id, data_context, initialized_beanie_context
+):
+    async with initialized_beanie_context, data_context:
+        response = await client.get(
+            f"/{diag_id}/obd_data", params={"wait": 0.1}
+        )
+        assert response.status_code == 200
+        assert response.json() == []
+
+
+@pytest.mark.parametrize("wait", [-1, diagnostics.MAX_DATA_WAIT + 1])
+@pytest.mark.asyncio
+async def test_get_obd_data_invalid_wait(
+        wait, diag_id, data_context, initialized_beanie_context
+):
+    async with initialized_beanie_context, data_context:
+        response = await client.get(
+            f"/{diag_id}/obd_data", params={"wait": wait}
+        )
+        assert response.status_code == 422
+
+
 @pytest.mark.asyncio
 async def test_get_obd_data_404(diag_id, initialized_beanie_context):
     async with initialized_beanie_context:
@@ -229,6 +275,60 @@ async def test_get_symptoms_no_data(
         assert response.json() == []
 
 
+@pytest.mark.asyncio
+async def test_get_symptoms_wait(
+        diag_id, case_id, data_context, initialized_beanie_context
+):
+    async with initialized_beanie_context, data_context:
+        async def add_symptoms():
+            await asyncio.sleep(0.1)
+            case = await Case.get(case_id)
+            # symptom of another component does not answer the request
+            await case.add_symptom(
+                NewSymptom(component="other", label=SymptomLabel("ok"))
+            )
+            await asyncio.sleep(0.1)
+            await case.add_symptom(
+                NewSymptom(component="battery", label=SymptomLabel("defect"))
+            )
+
+        add = asyncio.create_task(add_symptoms())
+        response = await client.get(
+            f"/{diag_id}/symptoms",
+            params={"component": "battery", "wait": 10},
+            timeout=5
+        )
+        await add
+        assert response.status_code == 200
+        assert [s["label"] for s in response.json()] == ["defect"]
+
+
+@pytest.mark.asyncio
+async def test_get_symptoms_wait_for_update(
+        diag_id, case_id, data_context, initialized_beanie_context
+):
+    async with initialized_beanie_context, data_context:
+        case = await Case.get(case_id)
+        await case.add_symptom(
+            NewSymptom(component="other", label=SymptomLabel("defect"))
+        )
+
+        async def relabel_symptom():
+            await asyncio.sleep(0.1)
+            await case.update_symptom(0, SymptomUpdate(component="battery"))
+
+        # request is answered as soon as a symptom of the component exists
+        relabel = asyncio.create_task(relabel_symptom())
+        response = await client.get(
+            f"/{diag_id}/symptoms",
+            params={"component": "battery", "wait": 10},
+            timeout=5
+        )
+        await relabel
+        assert response.status_code == 200
+        assert [s["label"] for s in response.json()] == ["defect"]
+
+
 @pytest.mark.asyncio
 async def test_get_symptoms_404(diag_id, initialized_beanie_context):
     async with initialized_beanie_context:
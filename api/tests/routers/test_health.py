@@ -1,10 +1,59 @@
-from api.routers.health import router
+from api.routers import health
+from fastapi import FastAPI
 from fastapi.testclient import TestClient
 
-client = TestClient(router)
+app = FastAPI()
+app.include_router(health.router)
+
+client = TestClient(app)
+
+test_api_key = "metrics key"
+health.api_key_auth.valid_key = test_api_key
 
 
 def test_ping():
     response = client.get("/ping")
     assert response.status_code == 200
     assert response.json() == {"msg": "ok"}
+
+
+def test_metrics_requires_api_key():
+    response = client.get("/metrics")
+    assert response.status_code == 403
+    response = client.get(
+        "/metrics", headers={"x-api-key": test_api_key[1:]}
+    )
+    assert response.status_code == 401
+
+
+def test_metrics():
+    response = client.get("/metrics", headers={"x-api-key": test_api_key})
+    assert response.status_code == 200
+    assert set(response.json()["verified_token_cache"]) == {
+        "size", "max_size", "hits", "misses"
+    }
+    assert set(response.json()["parse_executor"]) == {
+        "kind", "max_workers", "max_pending", "pending", "rejected", "formats"
+    }
+    assert set(response.json()["orphan_collector"]) == {
+        "interval", "runs", "failed_runs", "last_run", "last_run_seconds",
+        "reclaimed"
+    }
+    assert set(response.json()["nautilus"]) == {
+        "max_connections", "max_keepalive_connections", "retries",
+        "latencies"
+    }
+    assert set(response.json()["knowledge_cache"]) == {
+        "size", "ttl", "max_stale", "hits", "stale_hits", "misses",
+        "failed_refreshes"
+    }
+    assert set(response.json()["knowledge_queries"]) == {
+        "size", "max_size", "hits", "misses", "queries"
+    }
+    assert set(response.json()["task_dispatcher"]) == {
+        "interval", "batch_size", "runs", "failed_runs", "last_run",
+        "dispatched", "failed_attempts", "dropped"
+    }
+    assert set(response.json()["case_data_events"]) == {
+        "listeners", "published", "received", "failed_publications"
+    }
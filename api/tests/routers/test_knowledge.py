@@ -1,7 +1,10 @@
 from datetime import datetime, timedelta, UTC
 
+import httpx
 import pytest
-from api.diagnostics_management import KnowledgeGraph
+from api.diagnostics_management import (
+    KnowledgeGraph, knowledge_cache, knowledge_queries
+)
 from api.routers import knowledge
 from api.security.keycloak import Keycloak
 from fastapi import FastAPI
@@ -34,21 +37,30 @@ def signed_jwt(jwt_payload, rsa_private_key_pem: bytes):
 
 
 @pytest.fixture
-def app(kg_url, kg_obd_dataset_name, kg_prefilled):
+def app(kg_url, kg_obd_dataset_name):
     app = FastAPI()
     app.include_router(knowledge.router)
+    app.add_event_handler("shutdown", KnowledgeGraph.close_client)
 
-    # All tests use the prefilled test knowledge graph
+    # Tests use the test knowledge graph, see kg_prefilled
     KnowledgeGraph.set_kg_url(kg_url)
     KnowledgeGraph.obd_dataset_name = kg_obd_dataset_name
+    knowledge_cache.invalidate()
+    knowledge_queries.invalidate()
 
     yield app
 
+    knowledge_cache.invalidate()
+    knowledge_queries.invalidate()
+
 
 @pytest.fixture
 def unauthenticated_client(app):
     """Unauthenticated client, e.g. no bearer token in header."""
-    yield TestClient(app)
+    # All requests are handled in the same event loop to reuse the pooled
+    # knowledge graph connections
+    with TestClient(app) as client:
+        yield client
 
 
 @pytest.fixture
@@ -85,13 +97,169 @@ def test_list_vehicle_components_kg_not_available(authenticated_client):
 
 
 def test_list_vehicle_components(
-        authenticated_client, kg_components
+        authenticated_client, kg_components, kg_prefilled
 ):
     response = authenticated_client.get("/components")
     assert response.status_code == 200
     assert sorted(response.json()) == sorted(kg_components)
 
 
+@pytest.fixture
+def kg_requests():
+    """
+    Answer SPARQL queries with a mock transport. Components are taken from
+    the returned object and all received requests are recorded.
+    """
+    class KGRequests:
+        status_code = 200
+        components = []
+        received = []
+
+    def handler(request: httpx.Request):
+        KGRequests.received.append(request)
+        if KGRequests.status_code != 200:
+            return httpx.Response(KGRequests.status_code)
+        bindings = [
+            {"name": {"type": "literal", "value": component}}
+            for component in KGRequests.components
+        ]
+        return httpx.Response(200, json={"results": {"bindings": bindings}})
+
+    KnowledgeGraph.open_client(transport=httpx.MockTransport(handler))
+    return KGRequests
+
+
+@pytest.fixture
+def knowledge_admin_jwt(rsa_private_key_pem: bytes):
+    """JWT of a user with the role to manage knowledge resources."""
+    return jws.sign(
+        {
+            "exp": (datetime.now(UTC) + timedelta(60)).timestamp(),
+            "preferred_username": "some-knowledge-admin",
+            "realm_access": {"roles": ["shared", "knowledge"]}
+        },
+        rsa_private_key_pem,
+        algorithm="RS256"
+    )
+
+
+def test_list_vehicle_components_cached(authenticated_client, kg_requests):
+    kg_requests.components = ["battery"]
+    for _ in range(3):
+        response = authenticated_client.get("/components")
+        assert response.status_code == 200
+        assert response.json() == ["battery"]
+    assert len(kg_requests.received) == 1
+
+
+def test_invalidate_knowledge_cache(
+        authenticated_client, kg_requests, knowledge_admin_jwt
+):
+    kg_requests.components = ["battery"]
+    authenticated_client.get("/components")
+    kg_requests.components = ["battery", "alternator"]
+
+    # workshop and shared users can not drop the cache
+    response = authenticated_client.delete("/cache")
+    assert response.status_code == 401
+    response = authenticated_client.get("/components")
+    assert response.json() == ["battery"]
+
+    response = authenticated_client.delete(
+        "/cache", headers={"Authorization": f"Bearer {knowledge_admin_jwt}"}
+    )
+    assert response.status_code == 204
+    response = authenticated_client.get("/components")
+    assert response.json() == ["battery", "alternator"]
+    assert len(kg_requests.received) == 2
+
+
+def test_list_vehicle_components_failure_not_cached(
+        authenticated_client, kg_requests
+):
+    kg_requests.status_code = 500
+    response = authenticated_client.get("/components")
+    assert response.status_code == 200
+    assert response.json() == []
+    kg_requests.status_code = 200
+    kg_requests.components = ["battery"]
+    response = authenticated_client.get("/components")
+    assert response.json() == ["battery"]
+
+
+def test_list_suspect_components(authenticated_client, kg_graph_transport):
+    KnowledgeGraph.open_client(transport=kg_graph_transport)
+    response = authenticated_client.get(
+        "/suspect_components", params={"dtc": ["P0123", "P0000"]}
+    )
+    assert response.status_code == 200
+    assert response.json() == {
+        "P0123": [
+            {
+                "name": "boost_pressure_control_valve",
+                "priority": 0,
+                "use_oscilloscope": True
+            }
+        ],
+        "P0000": []
+    }
+    # dataset version and all dtcs in a single query
+    assert len(kg_graph_transport.queries) == 2
+
+
+def test_list_suspect_components_no_kg_configured(authenticated_client):
+    KnowledgeGraph.set_kg_url(None)
+    response = authenticated_client.get(
+        "/suspect_components", params={"dtc": ["P0123"]}
+    )
+    assert response.status_code == 200
+    assert response.json() == {"P0123": []}
+
+
+def test_list_suspect_components_kg_not_available(
+        authenticated_client, kg_requests
+):
+    kg_requests.status_code = 503
+    response = authenticated_client.get(
+        "/suspect_components", params={"dtc": ["P0123"]}
+    )
+    assert response.status_code == 503
+
+
+def test_list_suspect_components_missing_dtc(authenticated_client):
+    response = authenticated_client.get("/suspect_components")
+    assert response.status_code == 422
+
+
+def test_list_affecting_components(
+        authenticated_client, kg_graph_transport
+):
+    KnowledgeGraph.open_client(transport=kg_graph_transport)
+    response = authenticated_client.get(
+        "/components/affected_by",
+        params={"component": ["boost_pressure_control_valve"]}
+    )
+    assert response.status_code == 200
+    assert response.json() == {
+        "boost_pressure_control_valve": ["boost_pressure_solenoid_valve"]
+    }
+
+
+def test_invalidate_knowledge_cache_drops_lookups(
+        authenticated_client, kg_graph_transport, knowledge_admin_jwt
+):
+    KnowledgeGraph.open_client(transport=kg_graph_transport)
+    params = {"dtc": ["P0123"]}
+    authenticated_client.get("/suspect_components", params=params)
+    authenticated_client.get("/suspect_components", params=params)
+    assert len(kg_graph_transport.queries) == 2
+    authenticated_client.delete(
+        "/cache", headers={"Authorization": f"Bearer {knowledge_admin_jwt}"}
+    )
+    authenticated_client.get("/suspect_components", params=params)
+    assert len(kg_graph_transport.queries) == 4
+
+
 @pytest.mark.parametrize(
     "route", knowledge.router.routes, ids=lambda r: r.name
 )
@@ -1,10 +1,13 @@
+import io
 from datetime import datetime, timedelta, UTC
 
 from httpx import (
     AsyncClient,
-    ASGITransport
+    ASGITransport,
+    URL
 )
 
+import numpy as np
 import pytest
 from api.data_management import (
     Case, NewTimeseriesData, TimeseriesMetaData, GridFSSignalStore, NewOBDData,
@@ -311,6 +314,39 @@ async def test_list_cases_with_unmatched_filters(
         assert response.json() == []
 
 
+@pytest.mark.asyncio
+async def test_list_cases_paginated(
+        authenticated_async_client, initialized_beanie_context, data_context,
+        case_id, case_data
+):
+    # ids of additional cases are greater than case_id
+    additional_case_ids = [str(ObjectId()) for _ in range(2)]
+    async with initialized_beanie_context, data_context:
+        for additional_case_id in additional_case_ids:
+            await Case(**{**case_data, "_id": additional_case_id}).create()
+        response = await authenticated_async_client.get(
+            "/cases", params={"page_size": 2}
+        )
+        assert response.status_code == 200
+        assert [c["_id"] for c in response.json()] == \
+               [case_id, additional_case_ids[0]]
+
+        # follow link to the next page
+        next_link = URL(response.links["next"]["url"])
+        response = await authenticated_async_client.get(
+            "/cases", params=next_link.params
+        )
+        assert response.status_code == 200
+        assert [c["_id"] for c in response.json()] == \
+               [additional_case_ids[1]]
+        assert "next" not in response.links
+
+
+def test_list_cases_invalid_cursor(authenticated_client):
+    response = authenticated_client.get("/cases", params={"cursor": "1"})
+    assert response.status_code == 400
+
+
 def test_get_case_invalid_id(authenticated_client):
     # Invalid case_id format is passed
     response = authenticated_client.get("/cases/invalidid")
@@ -411,6 +447,60 @@ async def test_get_timeseries_data_signal(
     assert response.json() == timeseries_data["signal"]
 
 
+@pytest.mark.parametrize(
+    "accept", ["application/octet-stream", "application/x-npy"]
+)
+@pytest.mark.asyncio
+async def test_get_timeseries_data_signal_binary(
+        authenticated_async_client, case_id, timeseries_data,
+        initialized_beanie_context, data_context, accept
+):
+    data_id = 0  # id in data_context
+    async with initialized_beanie_context, data_context:
+        response = await authenticated_async_client.get(
+            f"/cases/{case_id}/timeseries_data/{data_id}/signal",
+            headers={"Accept": accept}
+        )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == accept
+    assert response.headers["x-signal-dtype"] == "<f8"
+    signal_length = len(timeseries_data["signal"])
+    assert response.headers["x-signal-length"] == str(signal_length)
+    if accept == "application/x-npy":
+        signal = np.load(io.BytesIO(response.content))
+    else:
+        signal = np.frombuffer(response.content, dtype="<f8")
+    assert signal.tolist() == timeseries_data["signal"]
+
+
+@pytest.mark.parametrize(
+    "params,expected_signal,expected_headers",
+    [
+        ({"start": 1}, [1., 2.], {"x-signal-start": "1"}),
+        ({"step": 2}, [0., 2.], {"x-signal-sample-distance": "2.0"}),
+        ({"max_points": 2}, [0., 2.], {"x-signal-sample-distance": "1.5"})
+    ]
+)
+@pytest.mark.asyncio
+async def test_get_timeseries_data_signal_section(
+        authenticated_async_client, case_id, timeseries_data,
+        initialized_beanie_context, data_context, params, expected_signal,
+        expected_headers
+):
+    data_id = 0  # id in data_context
+    async with initialized_beanie_context, data_context:
+        response = await authenticated_async_client.get(
+            f"/cases/{case_id}/timeseries_data/{data_id}/signal",
+            params=params
+        )
+
+    assert response.status_code == 200
+    assert response.json() == expected_signal
+    for header, value in expected_headers.items():
+        assert response.headers[header] == value
+
+
 @pytest.mark.asyncio
 async def test_get_timeseries_data_signal_not_found(
         authenticated_async_client, case_id, timeseries_data,
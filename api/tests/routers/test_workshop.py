@@ -1,10 +1,14 @@
+import io
+from array import array
 from collections import namedtuple
 from contextlib import asynccontextmanager
 from datetime import datetime, timedelta, UTC
 from tempfile import TemporaryFile
+from typing import List
 from unittest import mock
 
 import bson
+import numpy as np
 import pytest
 from api.data_management import (
     TimeseriesData,
@@ -13,18 +17,24 @@ from api.data_management import (
     NewOBDData,
     Symptom,
     Case,
+    CaseSummary,
     Vehicle,
     Customer,
     Workshop,
     Diagnosis,
-    DiagnosisStatus
+    DiagnosisStatus,
+    TaskDispatch,
+    TimeseriesUpload
 )
+from api.diagnostics_management import task_dispatcher
 from api.routers.workshop import (
     router, case_from_workshop, DiagnosticTaskManager
 )
 from api.security.keycloak import Keycloak
+from api.upload_filereader import ParseExecutorSaturated
 from beanie import init_beanie
 from bson import ObjectId
+from celery import Celery
 from fastapi import FastAPI, HTTPException
 from fastapi.testclient import TestClient
 from httpx import (
@@ -90,7 +100,7 @@ def app(motor_db):
     app.include_router(router)
 
     models = [
-        Case, Vehicle, Customer, Workshop, Diagnosis
+        Case, Vehicle, Customer, Workshop, Diagnosis, TimeseriesUpload
     ]
 
     async def init_mongo():
@@ -159,7 +169,10 @@ def test_list_cases(find_in_hub, authenticated_client, workshop_id):
             workshop_id,
             vin,
             obd_data_dtc,
-            timeseries_data_component
+            timeseries_data_component,
+            limit,
+            after,
+            view
     ):
         return []
 
@@ -177,7 +190,10 @@ def test_list_cases(find_in_hub, authenticated_client, workshop_id):
         vin=None,
         workshop_id=workshop_id,
         obd_data_dtc=None,
-        timeseries_data_component=None
+        timeseries_data_component=None,
+        limit=None,
+        after=None,
+        view="full"
     )
 
 
@@ -190,7 +206,10 @@ def test_list_cases_with_filters(
             workshop_id,
             vin,
             obd_data_dtc,
-            timeseries_data_component
+            timeseries_data_component,
+            limit,
+            after,
+            view
     ):
         return []
 
@@ -220,10 +239,103 @@ def test_list_cases_with_filters(
         vin=vin,
         workshop_id=workshop_id,
         obd_data_dtc=obd_data_dtc,
-        timeseries_data_component=timeseries_data_component
+        timeseries_data_component=timeseries_data_component,
+        limit=None,
+        after=None,
+        view="full"
     )
 
 
+@mock.patch("api.routers.workshop.Case.find_in_hub", autospec=True)
+def test_list_cases_paginated(
+        find_in_hub, authenticated_client, workshop_id, case_data
+):
+    cases = [
+        Case.model_construct(**{**case_data, "id": ObjectId()})
+        for _ in range(3)
+    ]
+
+    async def mock_find_in_hub(
+            customer_id,
+            workshop_id,
+            vin,
+            obd_data_dtc,
+            timeseries_data_component,
+            limit,
+            after,
+            view
+    ):
+        return cases[:limit]
+
+    # patch Case.find_in_hub to use mock_find_in_hub
+    find_in_hub.side_effect = mock_find_in_hub
+
+    cursor = str(ObjectId())
+    response = authenticated_client.get(
+        f"/{workshop_id}/cases", params={"page_size": 2, "cursor": cursor}
+    )
+
+    # confirm expected response and usage of db interface
+    assert response.status_code == 200
+    assert [c["_id"] for c in response.json()] == [
+        str(c.id) for c in cases[:2]
+    ]
+    assert "timeseries_data" in response.json()[0]
+    assert find_in_hub.call_args.kwargs["limit"] == 3
+    assert find_in_hub.call_args.kwargs["after"] == cursor
+    next_link = response.links["next"]["url"]
+    assert f"cursor={cases[1].id}" in next_link
+    assert "page_size=2" in next_link
+    assert "cursor" not in response.links["first"]["url"]
+
+
+@mock.patch("api.routers.workshop.Case.find_in_hub", autospec=True)
+def test_list_cases_summary(
+        find_in_hub, authenticated_client, workshop_id, case_data
+):
+    async def mock_find_in_hub(
+            customer_id,
+            workshop_id,
+            vin,
+            obd_data_dtc,
+            timeseries_data_component,
+            limit,
+            after,
+            view
+    ):
+        return [
+            CaseSummary(
+                timestamp=datetime.now(UTC),
+                obd_data_count=2,
+                **case_data
+            )
+        ]
+
+    # patch Case.find_in_hub to use mock_find_in_hub
+    find_in_hub.side_effect = mock_find_in_hub
+
+    response = authenticated_client.get(
+        f"/{workshop_id}/cases", params={"view": "summary"}
+    )
+
+    # confirm expected response and usage of db interface
+    assert response.status_code == 200
+    response_data = response.json()
+    assert len(response_data) == 1
+    assert response_data[0]["_id"] == case_data["_id"]
+    assert response_data[0]["obd_data_count"] == 2
+    assert response_data[0]["symptoms_count"] == 0
+    assert "obd_data" not in response_data[0]
+    assert find_in_hub.call_args.kwargs["view"] == "summary"
+
+
+def test_list_cases_invalid_cursor(authenticated_client, workshop_id):
+    response = authenticated_client.get(
+        f"/{workshop_id}/cases", params={"cursor": "invalid"}
+    )
+    assert response.status_code == 400
+
+
 def test_add_case(authenticated_client, workshop_id):
     new_case = {
         "vehicle_vin": "test-vin",
@@ -430,9 +542,28 @@ def mock_add_timeseries_data(signal_id):
     return add_timeseries_data
 
 
-@mock.patch("api.routers.workshop.Case.add_timeseries_data", autospec=True)
+def mock_add_timeseries_data_many(signal_id):
+    """
+    Create a test mock for Case.add_timeseries_data_many that does not
+    require setup of storage backend and uses a fixed signal_id.
+    """
+    add_timeseries_data = mock_add_timeseries_data(signal_id)
+
+    async def add_timeseries_data_many(
+            self, new_data: List[NewTimeseriesData]
+    ):
+        for data in new_data:
+            await add_timeseries_data(self, data)
+        return self
+
+    return add_timeseries_data_many
+
+
+@mock.patch(
+    "api.routers.workshop.Case.add_timeseries_data_many", autospec=True
+)
 def test_add_timeseries_data(
-        add_timeseries_data,
+        add_timeseries_data_many,
         case_data,
         new_timeseries_data,
         authenticated_client,
@@ -445,8 +576,8 @@ def test_add_timeseries_data(
         case_from_workshop
     ] = lambda case_id, workshop_id: Case(**case_data)
 
-    # patch Case.add_timeseries_data to call mock instead
-    add_timeseries_data.side_effect = mock_add_timeseries_data(
+    # patch Case.add_timeseries_data_many to call mock instead
+    add_timeseries_data_many.side_effect = mock_add_timeseries_data_many(
         signal_id=timeseries_signal_id
     )
 
@@ -473,9 +604,11 @@ def test_add_timeseries_data(
         ("picoscope_4ch_mat_file", "Picoscope MAT")
     ]
 )
-@mock.patch("api.routers.workshop.Case.add_timeseries_data", autospec=True)
+@mock.patch(
+    "api.routers.workshop.Case.add_timeseries_data_many", autospec=True
+)
 def test_upload_picoscope_data_single_channel(
-        add_timeseries_data,
+        add_timeseries_data_many,
         file,
         file_format,
         case_data,
@@ -494,8 +627,8 @@ def test_upload_picoscope_data_single_channel(
         case_from_workshop
     ] = lambda case_id, workshop_id: Case(**case_data)
 
-    # patch Case.add_timeseries_data to call mock instead
-    add_timeseries_data.side_effect = mock_add_timeseries_data(
+    # patch Case.add_timeseries_data_many to call mock instead
+    add_timeseries_data_many.side_effect = mock_add_timeseries_data_many(
         signal_id=timeseries_signal_id
     )
 
@@ -517,6 +650,9 @@ def test_upload_picoscope_data_single_channel(
     assert len(timeseries_data) == 1
     assert timeseries_data[0]["device_specs"]["channel"] == channel
     assert timeseries_data[0]["component"] == component
+    # signals are passed on as float64 arrays
+    new_timeseries_data = add_timeseries_data_many.await_args.args[1]
+    assert new_timeseries_data[0].signal.dtype == np.float64
 
 
 @pytest.mark.parametrize(
@@ -528,9 +664,11 @@ def test_upload_picoscope_data_single_channel(
         ("picoscope_4ch_mat_file", "Picoscope MAT")
     ]
 )
-@mock.patch("api.routers.workshop.Case.add_timeseries_data", autospec=True)
+@mock.patch(
+    "api.routers.workshop.Case.add_timeseries_data_many", autospec=True
+)
 def test_upload_picoscope_data_multi_channel(
-        add_timeseries_data,
+        add_timeseries_data_many,
         file,
         file_format,
         case_data,
@@ -549,8 +687,8 @@ def test_upload_picoscope_data_multi_channel(
         case_from_workshop
     ] = lambda case_id, workshop_id: Case(**case_data)
 
-    # patch Case.add_timeseries_data to call mock instead
-    add_timeseries_data.side_effect = mock_add_timeseries_data(
+    # patch Case.add_timeseries_data_many to call mock instead
+    add_timeseries_data_many.side_effect = mock_add_timeseries_data_many(
         signal_id=timeseries_signal_id
     )
 
@@ -647,6 +785,48 @@ def test_upload_picoscope_data_wrong_file(
     assert response.status_code == 400
 
 
+@pytest.mark.parametrize(
+    "route,file_format",
+    [
+        ("timeseries_data/upload/picoscope", "Picoscope CSV"),
+        ("timeseries_data/upload/omniview", "Omniview CSV"),
+        ("obd_data/upload/vcds", "VCDS TXT")
+    ]
+)
+@mock.patch(
+    "api.routers.workshop.parse_executor.read_file", autospec=True
+)
+def test_upload_parse_executor_saturated(
+        read_file, route, file_format, case_data, authenticated_client
+):
+    workshop_id = case_data["workshop_id"]
+    case_id = case_data["_id"]
+
+    authenticated_client.app.dependency_overrides[
+        case_from_workshop
+    ] = lambda case_id, workshop_id: Case(**case_data)
+
+    read_file.side_effect = ParseExecutorSaturated
+
+    with authenticated_client as client:
+        response = client.post(
+            f"/{workshop_id}/cases/{case_id}/{route}",
+            files={"upload": ("filename", TemporaryFile())},
+            data={
+                "component": "battery",
+                "component_A": "battery",
+                "sampling_rate": 1,
+                "duration": 1,
+                "file_format": file_format
+            }
+        )
+
+    # confirm that the upload is rejected with a hint when to retry
+    assert response.status_code == 503
+    assert int(response.headers["Retry-After"]) > 0
+    assert read_file.await_args.args[0] == file_format
+
+
 @mock.patch("api.routers.workshop.Case.add_obd_data", autospec=True)
 def test_upload_vcds_data(
         add_obd_data, case_data, obd_data, vcds_txt_file, authenticated_client
@@ -672,6 +852,30 @@ def test_upload_vcds_data(
     assert len(response.json()["obd_data"]) == 1
 
 
+@mock.patch("api.routers.workshop.Case.add_obd_data", autospec=True)
+def test_upload_obd_data_detect_format(
+        add_obd_data, case_data, vcds_txt_file, authenticated_client
+):
+    workshop_id = case_data["workshop_id"]
+    case_id = case_data["_id"]
+
+    authenticated_client.app.dependency_overrides[
+        case_from_workshop
+    ] = lambda case_id, workshop_id: Case(**case_data)
+
+    add_obd_data.side_effect = mock_add_obd_data()
+
+    with authenticated_client as client:
+        response = client.post(
+            f"/{workshop_id}/cases/{case_id}/obd_data/upload",
+            files={"upload": ("filename", vcds_txt_file)}
+        )
+
+    # confirm expected status code and response shape
+    assert response.status_code == 201
+    assert response.json()["obd_data"][0]["obd_specs"]["device"] == "VCDS"
+
+
 @pytest.mark.parametrize(
     "file,device_id",
     [
@@ -718,6 +922,387 @@ def test_upload_omniview_data(
     assert timeseries_data[0]["device_specs"]["type"] == "omniscope"
     assert timeseries_data[0]["device_specs"]["device_id"] == device_id
     assert timeseries_data[0]["component"] == component
+    # the signal is passed on as float64 buffer
+    new_timeseries_data = add_timeseries_data.await_args.args[1]
+    assert isinstance(new_timeseries_data.signal, array)
+
+
+@pytest.mark.parametrize(
+    "file,file_format,channel",
+    [
+        ("picoscope_4ch_eng_csv_file", "Picoscope CSV", "B"),
+        ("picoscope_8ch_ger_comma_decimal_csv_file", "Picoscope CSV", "C"),
+        ("picoscope_4ch_mat_file", "Picoscope MAT", "D"),
+        ("omniview_csv_file", "Omniview CSV", None)
+    ]
+)
+@mock.patch(
+    "api.routers.workshop.Case.add_timeseries_data_many", autospec=True
+)
+def test_upload_timeseries_data_detect_format(
+        add_timeseries_data_many,
+        file,
+        file_format,
+        channel,
+        case_data,
+        authenticated_client,
+        timeseries_signal_id,
+        request
+):
+    file = request.getfixturevalue(file)
+
+    workshop_id = case_data["workshop_id"]
+    case_id = case_data["_id"]
+
+    authenticated_client.app.dependency_overrides[
+        case_from_workshop
+    ] = lambda case_id, workshop_id: Case(**case_data)
+
+    add_timeseries_data_many.side_effect = mock_add_timeseries_data_many(
+        signal_id=timeseries_signal_id
+    )
+
+    # upload file without specifying the format
+    component = "maf_sensor"
+    with authenticated_client as client:
+        response = client.post(
+            f"/{workshop_id}/cases/{case_id}/timeseries_data/upload",
+            files={"upload": ("filename", file)},
+            data={
+                f"component_{channel}": component,
+                "component": component,
+                "sampling_rate": 1,
+                "duration": 1
+            }
+        )
+
+    # confirm expected status code and response data
+    assert response.status_code == 201
+    timeseries_data = response.json()["timeseries_data"]
+    assert len(timeseries_data) == 1
+    assert timeseries_data[0]["component"] == component
+    if file_format == "Omniview CSV":
+        assert timeseries_data[0]["device_specs"]["type"] == "omniscope"
+    else:
+        assert timeseries_data[0]["device_specs"]["channel"] == channel
+
+
+def test_upload_timeseries_data_omniview_missing_description(
+        omniview_csv_file, case_data, authenticated_client
+):
+    workshop_id = case_data["workshop_id"]
+    case_id = case_data["_id"]
+
+    authenticated_client.app.dependency_overrides[
+        case_from_workshop
+    ] = lambda case_id, workshop_id: Case(**case_data)
+
+    # sampling_rate and duration are missing
+    with authenticated_client as client:
+        response = client.post(
+            f"/{workshop_id}/cases/{case_id}/timeseries_data/upload",
+            files={"upload": ("filename", omniview_csv_file)},
+            data={"component": "battery"}
+        )
+
+    assert response.status_code == 400
+
+
+@pytest.mark.parametrize(
+    "route,file",
+    [
+        ("timeseries_data/upload", "vcds_txt_file"),
+        ("obd_data/upload", "picoscope_1ch_eng_csv_file"),
+        ("obd_data/upload", "omniview_csv_file")
+    ]
+)
+def test_upload_undetected_format(
+        route, file, case_data, authenticated_client, request
+):
+    file = request.getfixturevalue(file)
+
+    workshop_id = case_data["workshop_id"]
+    case_id = case_data["_id"]
+
+    authenticated_client.app.dependency_overrides[
+        case_from_workshop
+    ] = lambda case_id, workshop_id: Case(**case_data)
+
+    with authenticated_client as client:
+        response = client.post(
+            f"/{workshop_id}/cases/{case_id}/{route}",
+            files={"upload": ("filename", file)},
+            data={"component_A": "battery"}
+        )
+
+    # confirm that the file is rejected as its format is not supported
+    assert response.status_code == 400
+    assert "Could not detect the format" in response.json()["detail"]
+
+
+class MockGridIn:
+    def __init__(self, bucket):
+        self._id = ObjectId()
+        self._bucket = bucket
+        self._data = b""
+
+    async def write(self, data: bytes):
+        self._data += data
+
+    async def close(self):
+        self._bucket.files[self._id] = self._data
+
+    async def abort(self):
+        pass
+
+
+class MockGridOut:
+    def __init__(self, data: bytes):
+        self._data = data
+
+    async def readchunk(self) -> bytes:
+        chunk, self._data = self._data[:64], self._data[64:]
+        return chunk
+
+
+class MockGridFSBucket:
+    """In-memory mock of the GridFS bucket used for chunked uploads."""
+
+    def __init__(self):
+        self.files = {}
+
+    def open_upload_stream(self, filename, metadata=None):
+        return MockGridIn(self)
+
+    async def open_download_stream(self, file_id):
+        return MockGridOut(self.files[file_id])
+
+    async def delete(self, file_id):
+        self.files.pop(file_id)
+
+
+@pytest.fixture
+def upload_bucket():
+    bucket = MockGridFSBucket()
+    TimeseriesUpload.bucket = bucket
+    yield bucket
+    TimeseriesUpload.bucket = None
+
+
+@pytest.fixture
+def new_picoscope_upload(picoscope_4ch_eng_csv_file):
+    content = picoscope_4ch_eng_csv_file.read()
+    return content, {
+        "file_format": "Picoscope CSV",
+        "filename": "capture.csv",
+        "size": len(content),
+        "channels": {"B": {"component": "battery"}}
+    }
+
+
+@mock.patch(
+    "api.routers.workshop.Case.add_timeseries_data_many", autospec=True
+)
+def test_chunked_timeseries_upload(
+        add_timeseries_data_many,
+        new_picoscope_upload,
+        upload_bucket,
+        case_data,
+        authenticated_client,
+        timeseries_signal_id
+):
+    workshop_id = case_data["workshop_id"]
+    case_id = case_data["_id"]
+    authenticated_client.app.dependency_overrides[
+        case_from_workshop
+    ] = lambda case_id, workshop_id: Case(**case_data)
+    add_timeseries_data_many.side_effect = mock_add_timeseries_data_many(
+        signal_id=timeseries_signal_id
+    )
+    content, new_upload = new_picoscope_upload
+    uploads_url = f"/{workshop_id}/cases/{case_id}/timeseries_data/uploads"
+
+    with authenticated_client as client:
+        response = client.post(uploads_url, json=new_upload)
+        assert response.status_code == 201
+        assert response.json()["received"] == 0
+        upload_url = f"{uploads_url}/{response.json()['_id']}"
+
+        # send the file in three chunks
+        chunk_size = len(content) // 3 + 1
+        for offset in range(0, len(content), chunk_size):
+            response = client.put(
+                upload_url,
+                params={"offset": offset},
+                content=content[offset:offset + chunk_size]
+            )
+            assert response.status_code == 200
+        assert len(upload_bucket.files) == 3
+
+        # state of the upload can be retrieved
+        response = client.get(upload_url)
+        assert response.status_code == 200
+        assert response.json()["received"] == len(content)
+
+        # finalize adds the described channel to the case
+        response = client.post(f"{upload_url}/finalize")
+        assert response.status_code == 201
+        timeseries_data = response.json()["timeseries_data"]
+        assert len(timeseries_data) == 1
+        assert timeseries_data[0]["device_specs"]["channel"] == "B"
+        assert timeseries_data[0]["component"] == "battery"
+
+        # upload and chunks are deleted afterwards
+        assert client.get(upload_url).status_code == 404
+        assert upload_bucket.files == {}
+
+
+def test_chunked_timeseries_upload_resume(
+        new_picoscope_upload, upload_bucket, case_data, authenticated_client
+):
+    workshop_id = case_data["workshop_id"]
+    case_id = case_data["_id"]
+    authenticated_client.app.dependency_overrides[
+        case_from_workshop
+    ] = lambda case_id, workshop_id: Case(**case_data)
+    content, new_upload = new_picoscope_upload
+    uploads_url = f"/{workshop_id}/cases/{case_id}/timeseries_data/uploads"
+
+    with authenticated_client as client:
+        response = client.post(uploads_url, json=new_upload)
+        upload_url = f"{uploads_url}/{response.json()['_id']}"
+        client.put(upload_url, params={"offset": 0}, content=content[:100])
+
+        # a repeated or skipped chunk is rejected with the expected offset
+        for offset in (0, 200):
+            response = client.put(
+                upload_url, params={"offset": offset}, content=content[:100]
+            )
+            assert response.status_code == 409
+            assert response.headers["Upload-Offset"] == "100"
+
+        # an incomplete upload can not be finalized
+        response = client.post(f"{upload_url}/finalize")
+        assert response.status_code == 409
+        assert response.headers["Upload-Offset"] == "100"
+
+        # more data than announced is rejected
+        response = client.put(
+            upload_url, params={"offset": 100}, content=content
+        )
+        assert response.status_code == 413
+        assert client.get(upload_url).json()["received"] == 100
+
+        # an upload can be aborted
+        response = client.delete(upload_url)
+        assert response.status_code == 200
+        assert client.get(upload_url).status_code == 404
+        assert upload_bucket.files == {}
+
+
+def test_chunked_timeseries_upload_unreadable_file(
+        upload_bucket, case_data, authenticated_client
+):
+    workshop_id = case_data["workshop_id"]
+    case_id = case_data["_id"]
+    authenticated_client.app.dependency_overrides[
+        case_from_workshop
+    ] = lambda case_id, workshop_id: Case(**case_data)
+    uploads_url = f"/{workshop_id}/cases/{case_id}/timeseries_data/uploads"
+    content = b"not an omniview file"
+
+    with authenticated_client as client:
+        response = client.post(
+            uploads_url,
+            json={
+                "file_format": "Omniview CSV",
+                "size": len(content),
+                "component": "battery",
+                "sampling_rate": 1,
+                "duration": 1
+            }
+        )
+        upload_url = f"{uploads_url}/{response.json()['_id']}"
+        client.put(upload_url, params={"offset": 0}, content=content)
+        response = client.post(f"{upload_url}/finalize")
+
+        # unreadable uploads are discarded
+        assert response.status_code == 400
+        assert client.get(upload_url).status_code == 404
+        assert upload_bucket.files == {}
+
+
+def test_chunked_timeseries_upload_finalize_once(
+        new_picoscope_upload, upload_bucket, case_data, authenticated_client
+):
+    workshop_id = case_data["workshop_id"]
+    case_id = case_data["_id"]
+    authenticated_client.app.dependency_overrides[
+        case_from_workshop
+    ] = lambda case_id, workshop_id: Case(**case_data)
+    content, new_upload = new_picoscope_upload
+    uploads_url = f"/{workshop_id}/cases/{case_id}/timeseries_data/uploads"
+
+    with authenticated_client as client:
+        response = client.post(uploads_url, json=new_upload)
+        upload_id = response.json()["_id"]
+        upload_url = f"{uploads_url}/{upload_id}"
+        client.put(upload_url, params={"offset": 0}, content=content)
+
+        # the parse executor is saturated
+        with mock.patch(
+                "api.routers.workshop.parse_executor.read_file",
+                side_effect=ParseExecutorSaturated
+        ):
+            response = client.post(f"{upload_url}/finalize")
+        assert response.status_code == 503
+        # the upload is kept to retry the finalization
+        assert client.get(upload_url).json()["state"] == "open"
+        assert len(upload_bucket.files) == 1
+
+        # the upload is being finalized by a concurrent request
+        client.portal.call(
+            lambda: TimeseriesUpload.find_one(
+                TimeseriesUpload.id == ObjectId(upload_id)
+            ).update({"$set": {"state": "finalizing"}})
+        )
+        with mock.patch(
+                "api.routers.workshop.Case.add_timeseries_data_many",
+                autospec=True
+        ) as add_timeseries_data_many:
+            response = client.post(f"{upload_url}/finalize")
+        assert response.status_code == 409
+        add_timeseries_data_many.assert_not_called()
+        assert len(upload_bucket.files) == 1
+
+
+@pytest.mark.parametrize(
+    "new_upload",
+    [
+        {"file_format": "Picoscope MAT", "size": 10},
+        {"file_format": "Omniview CSV", "size": 10, "component": "battery"},
+        {
+            "file_format": "Picoscope MAT",
+            "size": 0,
+            "channels": {"A": {"component": "battery"}}
+        }
+    ]
+)
+def test_chunked_timeseries_upload_invalid(
+        new_upload, case_data, authenticated_client
+):
+    workshop_id = case_data["workshop_id"]
+    case_id = case_data["_id"]
+    authenticated_client.app.dependency_overrides[
+        case_from_workshop
+    ] = lambda case_id, workshop_id: Case(**case_data)
+
+    with authenticated_client as client:
+        response = client.post(
+            f"/{workshop_id}/cases/{case_id}/timeseries_data/uploads",
+            json=new_upload
+        )
+    assert response.status_code == 422
 
 
 def test_get_timeseries_data_not_found(case_data, authenticated_client):
@@ -817,20 +1402,68 @@ def test_get_timeseries_data_signal(
     assert response.json() == test_signal
 
 
-def create_mock_save():
-    """
-    Create the closure mock_save that can be used to patch Case.save.
-    The second return value saved_cases can be used to confirm correct
-    usage of Case.save, e.g. after updating instance attributes and correct
-    response data, e.g. representations of saved state.
-    """
-    saved_cases = []
+@pytest.mark.parametrize(
+    "accept", ["application/octet-stream", "application/x-npy"]
+)
+@mock.patch(
+    "api.routers.workshop.TimeseriesData.stream_signal", autospec=True
+)
+def test_get_timeseries_data_signal_binary(
+        stream_signal, case_data, timeseries_data, authenticated_client, accept
+):
+    workshop_id = case_data["workshop_id"]
+    case_id = case_data["_id"]
 
-    async def mock_save(self):
-        saved_cases.append(self)
-        return self
+    # add a single timeseries data set to the case
+    data_id = 30
+    timeseries_data["data_id"] = data_id
+    case_data["timeseries_data"] = [timeseries_data]
+
+    authenticated_client.app.dependency_overrides[
+        case_from_workshop
+    ] = lambda case_id, workshop_id: Case(**case_data)
+
+    test_signal = np.array([0., 1., 2.], dtype="<f8")
 
-    return mock_save, saved_cases
+    async def mock_stream_signal(self):
+        async def chunks():
+            # split signal bytes into multiple chunks
+            yield test_signal[:2].tobytes()
+            yield test_signal[2:].tobytes()
+        return len(test_signal), chunks()
+
+    # patch TimeseriesData.stream_signal to use mock_stream_signal
+    stream_signal.side_effect = mock_stream_signal
+
+    # request binary signal from timeseries_data with data_id
+    with authenticated_client as client:
+        response = client.get(
+            f"/{workshop_id}/cases/{case_id}/timeseries_data/{data_id}/signal",
+            headers={"Accept": accept}
+        )
+
+    # confirm expected status code, headers and response data
+    assert response.status_code == 200
+    assert response.headers["content-type"] == accept
+    assert response.headers["x-signal-dtype"] == "<f8"
+    assert response.headers["x-signal-length"] == "3"
+    assert response.headers["content-length"] == str(len(response.content))
+    if accept == "application/x-npy":
+        signal = np.load(io.BytesIO(response.content))
+    else:
+        signal = np.frombuffer(response.content, dtype="<f8")
+    assert signal.tolist() == test_signal.tolist()
+
+
+def create_mock_collection(find_one_and_update_result=None):
+    """
+    Create a mock of the motor collection used by Case, e.g. to confirm
+    atomic updates of cases without database access.
+    """
+    collection = mock.AsyncMock()
+    collection.find_one_and_update.return_value = find_one_and_update_result
+    collection.update_one.return_value = mock.MagicMock(matched_count=1)
+    return collection
 
 
 def test_update_timeseries_data_not_found(case_data, authenticated_client):
@@ -853,9 +1486,8 @@ def test_update_timeseries_data_not_found(case_data, authenticated_client):
     assert response.status_code == 404
 
 
-@mock.patch("api.routers.workshop.Case.save", autospec=True)
 def test_update_timeseries_data(
-        save, case_data, timeseries_data, authenticated_client
+        case_data, timeseries_data, authenticated_client
 ):
     workshop_id = case_data["workshop_id"]
     case_id = case_data["_id"]
@@ -874,12 +1506,13 @@ def test_update_timeseries_data(
         case_from_workshop
     ] = lambda case_id, workshop_id: Case(**case_data)
 
-    # patch Case.save to use mock_save
-    mock_save, saved_cases = create_mock_save()
-    save.side_effect = mock_save
+    # patch the collection of Case to confirm atomic updates
+    collection = create_mock_collection()
 
     # request update of timeseries_data with data_id, which should exist
-    with authenticated_client as client:
+    with authenticated_client as client, mock.patch.object(
+            Case, "get_motor_collection", return_value=collection
+    ):
         response = client.put(
             f"/{workshop_id}/cases/{case_id}/timeseries_data/{data_id}",
             json={"label": new_label}
@@ -888,11 +1521,11 @@ def test_update_timeseries_data(
     # confirm expected status code and expected new label
     assert response.status_code == 200
     assert response.json()["label"] == new_label
-    # confirm case was saved
-    assert len(saved_cases) == 1
-    # confirm response data represents case.timeseries_datas after saving
-    assert TimeseriesData(**response.json()) == \
-           saved_cases[0].timeseries_data[0]
+    # confirm only the label was updated in the database
+    collection.update_one.assert_awaited_once_with(
+        {"_id": ObjectId(case_id), "timeseries_data.data_id": data_id},
+        {"$set": {"timeseries_data.$.label": new_label}}
+    )
 
 
 def test_delete_timeseries_data_not_found(case_data, authenticated_client):
@@ -988,8 +1621,7 @@ def mock_add_obd_data():
     return add_obd_data
 
 
-@mock.patch("api.routers.workshop.Case.save", autospec=True)
-def test_add_obd_data(save, case_data, obd_data, authenticated_client):
+def test_add_obd_data(case_data, obd_data, authenticated_client):
     workshop_id = case_data["workshop_id"]
     case_id = case_data["_id"]
 
@@ -997,11 +1629,14 @@ def test_add_obd_data(save, case_data, obd_data, authenticated_client):
         case_from_workshop
     ] = lambda case_id, workshop_id: Case(**case_data)
 
-    # patch Case.save to use mock_save
-    mock_save, saved_cases = create_mock_save()
-    save.side_effect = mock_save
+    # patch the collection of Case to confirm atomic updates
+    collection = create_mock_collection(
+        find_one_and_update_result={"obd_data_added": 1}
+    )
 
-    with authenticated_client as client:
+    with authenticated_client as client, mock.patch.object(
+            Case, "get_motor_collection", return_value=collection
+    ):
         response = client.post(
             f"/{workshop_id}/cases/{case_id}/obd_data",
             json=obd_data
@@ -1010,10 +1645,13 @@ def test_add_obd_data(save, case_data, obd_data, authenticated_client):
     # confirm expected status code and response shape
     assert response.status_code == 201
     assert len(response.json()["obd_data"]) == 1
-    # confirm case was saved
-    assert len(saved_cases) == 1
-    # confirm response data represents case after saving
-    assert Case(**response.json()) == saved_cases[0]
+    # confirm data_id was reserved and obd_data was appended in the database
+    assert collection.find_one_and_update.await_args.args[1] == {
+        "$inc": {"obd_data_added": 1}
+    }
+    pushed_obd_data = collection.update_one.await_args.args[1]["$push"]
+    assert pushed_obd_data["obd_data"]["$each"][0]["data_id"] == 0
+    assert response.json()["obd_data"][0]["data_id"] == 0
 
 
 def test_upload_vcds_data_wrong_file(
@@ -1101,8 +1739,7 @@ def test_update_obd_data_not_found(case_data, authenticated_client):
     assert response.status_code == 404
 
 
-@mock.patch("api.routers.workshop.Case.save", autospec=True)
-def test_update_obd_data(save, case_data, obd_data, authenticated_client):
+def test_update_obd_data(case_data, obd_data, authenticated_client):
     workshop_id = case_data["workshop_id"]
     case_id = case_data["_id"]
 
@@ -1119,12 +1756,13 @@ def test_update_obd_data(save, case_data, obd_data, authenticated_client):
         case_from_workshop
     ] = lambda case_id, workshop_id: Case(**case_data)
 
-    # patch Case.save to use mock_save
-    mock_save, saved_cases = create_mock_save()
-    save.side_effect = mock_save
+    # patch the collection of Case to confirm atomic updates
+    collection = create_mock_collection()
 
     # request update of obd_data with data_id, which should exist
-    with authenticated_client as client:
+    with authenticated_client as client, mock.patch.object(
+            Case, "get_motor_collection", return_value=collection
+    ):
         response = client.put(
             f"/{workshop_id}/cases/{case_id}/obd_data/{data_id}",
             json={"obd_specs": new_obd_specs}
@@ -1134,10 +1772,11 @@ def test_update_obd_data(save, case_data, obd_data, authenticated_client):
     # obd_data
     assert response.status_code == 200
     assert response.json()["obd_specs"] == new_obd_specs
-    # confirm case was saved
-    assert len(saved_cases) == 1
-    # confirm response data represents case.obd_data after saving
-    assert OBDData(**response.json()) == saved_cases[0].obd_data[0]
+    # confirm only the obd specs were updated in the database
+    collection.update_one.assert_awaited_once_with(
+        {"_id": ObjectId(case_id), "obd_data.data_id": data_id},
+        {"$set": {"obd_data.$.obd_specs": new_obd_specs}}
+    )
 
 
 def test_delete_obd_data_not_found(case_data, authenticated_client):
@@ -1160,8 +1799,7 @@ def test_delete_obd_data_not_found(case_data, authenticated_client):
     assert response.status_code == 200
 
 
-@mock.patch("api.routers.workshop.Case.save", autospec=True)
-def test_delete_obd_data(save, case_data, obd_data, authenticated_client):
+def test_delete_obd_data(case_data, obd_data, authenticated_client):
     workshop_id = case_data["workshop_id"]
     case_id = case_data["_id"]
 
@@ -1174,12 +1812,13 @@ def test_delete_obd_data(save, case_data, obd_data, authenticated_client):
         case_from_workshop
     ] = lambda case_id, workshop_id: Case(**case_data)
 
-    # patch Case.save to use mock_save
-    mock_save, saved_cases = create_mock_save()
-    save.side_effect = mock_save
+    # patch the collection of Case to confirm atomic updates
+    collection = create_mock_collection()
 
     # request deletion of obd_data with data_id, which should exist
-    with authenticated_client as client:
+    with authenticated_client as client, mock.patch.object(
+            Case, "get_motor_collection", return_value=collection
+    ):
         response = client.delete(
             f"/{workshop_id}/cases/{case_id}/obd_data/{data_id}"
         )
@@ -1188,10 +1827,11 @@ def test_delete_obd_data(save, case_data, obd_data, authenticated_client):
     # obd_data
     assert response.status_code == 200
     assert response.json()["obd_data"] == []
-    # confirm case was saved
-    assert len(saved_cases) == 1
-    # confirm response data represents case after saving
-    assert Case(**response.json()) == saved_cases[0]
+    # confirm obd_data was removed in the database
+    collection.update_one.assert_awaited_once_with(
+        {"_id": ObjectId(case_id)},
+        {"$pull": {"obd_data": {"data_id": data_id}}}
+    )
 
 
 def test_list_symptoms(case_data, symptom, authenticated_client):
@@ -1216,8 +1856,7 @@ def test_list_symptoms(case_data, symptom, authenticated_client):
     assert len(response.json()) == repeats
 
 
-@mock.patch("api.routers.workshop.Case.save", autospec=True)
-def test_add_symptom(save, case_data, symptom, authenticated_client):
+def test_add_symptom(case_data, symptom, authenticated_client):
     workshop_id = case_data["workshop_id"]
     case_id = case_data["_id"]
 
@@ -1225,11 +1864,14 @@ def test_add_symptom(save, case_data, symptom, authenticated_client):
         case_from_workshop
     ] = lambda case_id, workshop_id: Case(**case_data)
 
-    # patch Case.save to use mock_save
-    mock_save, saved_cases = create_mock_save()
-    save.side_effect = mock_save
+    # patch the collection of Case to confirm atomic updates
+    collection = create_mock_collection(
+        find_one_and_update_result={"symptoms_added": 1}
+    )
 
-    with authenticated_client as client:
+    with authenticated_client as client, mock.patch.object(
+            Case, "get_motor_collection", return_value=collection
+    ):
         response = client.post(
             f"/{workshop_id}/cases/{case_id}/symptoms",
             json=symptom
@@ -1238,10 +1880,12 @@ def test_add_symptom(save, case_data, symptom, authenticated_client):
     # confirm expected status code and response shape
     assert response.status_code == 201
     assert len(response.json()["symptoms"]) == 1
-    # confirm case was saved
-    assert len(saved_cases) == 1
-    # confirm response data represents case after saving
-    assert Case(**response.json()) == saved_cases[0]
+    # confirm data_id was reserved and symptom was appended in the database
+    assert collection.find_one_and_update.await_args.args[1] == {
+        "$inc": {"symptoms_added": 1}
+    }
+    pushed_symptom = collection.update_one.await_args.args[1]["$push"]
+    assert pushed_symptom["symptoms"]["$each"][0]["data_id"] == 0
 
 
 def test_get_symptom_not_found(case_data, authenticated_client):
@@ -1307,8 +1951,7 @@ def test_update_symptom_not_found(case_data, authenticated_client):
     assert response.status_code == 404
 
 
-@mock.patch("api.routers.workshop.Case.save", autospec=True)
-def test_update_symptom(save, case_data, symptom, authenticated_client):
+def test_update_symptom(case_data, symptom, authenticated_client):
     workshop_id = case_data["workshop_id"]
     case_id = case_data["_id"]
 
@@ -1326,12 +1969,13 @@ def test_update_symptom(save, case_data, symptom, authenticated_client):
         case_from_workshop
     ] = lambda case_id, workshop_id: Case(**case_data)
 
-    # patch Case.save to use mock_save
-    mock_save, saved_cases = create_mock_save()
-    save.side_effect = mock_save
+    # patch the collection of Case to confirm atomic updates
+    collection = create_mock_collection()
 
     # request update of symptom with data_id, which should exist
-    with authenticated_client as client:
+    with authenticated_client as client, mock.patch.object(
+            Case, "get_motor_collection", return_value=collection
+    ):
         response = client.put(
             f"/{workshop_id}/cases/{case_id}/symptoms/{data_id}",
             json={"label": new_label}
@@ -1340,10 +1984,11 @@ def test_update_symptom(save, case_data, symptom, authenticated_client):
     # confirm expected status code and expected new label
     assert response.status_code == 200
     assert response.json()["label"] == new_label
-    # confirm case was saved
-    assert len(saved_cases) == 1
-    # confirm response data represents case.symptoms after saving
-    assert Symptom(**response.json()) == saved_cases[0].symptoms[0]
+    # confirm only the label was updated in the database
+    collection.update_one.assert_awaited_once_with(
+        {"_id": ObjectId(case_id), "symptoms.data_id": data_id},
+        {"$set": {"symptoms.$.label": new_label}}
+    )
 
 
 def test_delete_symptom_not_found(case_data, authenticated_client):
@@ -1366,8 +2011,7 @@ def test_delete_symptom_not_found(case_data, authenticated_client):
     assert response.status_code == 200
 
 
-@mock.patch("api.routers.workshop.Case.save", autospec=True)
-def test_delete_symptom(save, case_data, symptom, authenticated_client):
+def test_delete_symptom(case_data, symptom, authenticated_client):
     workshop_id = case_data["workshop_id"]
     case_id = case_data["_id"]
 
@@ -1380,12 +2024,13 @@ def test_delete_symptom(save, case_data, symptom, authenticated_client):
         case_from_workshop
     ] = lambda case_id, workshop_id: Case(**case_data)
 
-    # patch Case.save to use mock_save
-    mock_save, saved_cases = create_mock_save()
-    save.side_effect = mock_save
+    # patch the collection of Case to confirm atomic updates
+    collection = create_mock_collection()
 
     # request deletion of symptom with data_id, which should exist
-    with authenticated_client as client:
+    with authenticated_client as client, mock.patch.object(
+            Case, "get_motor_collection", return_value=collection
+    ):
         response = client.delete(
             f"/{workshop_id}/cases/{case_id}/symptoms/{data_id}"
         )
@@ -1394,10 +2039,11 @@ def test_delete_symptom(save, case_data, symptom, authenticated_client):
     # obd_data
     assert response.status_code == 200
     assert response.json()["symptoms"] == []
-    # confirm case was saved
-    assert len(saved_cases) == 1
-    # confirm response data represents case after saving
-    assert Case(**response.json()) == saved_cases[0]
+    # confirm symptom was removed in the database
+    collection.update_one.assert_awaited_once_with(
+        {"_id": ObjectId(case_id)},
+        {"$pull": {"symptoms": {"data_id": data_id}}}
+    )
 
 
 def test_get_diagnosis_no_diag(case_data, authenticated_client):
@@ -1552,6 +2198,53 @@ async def test_start_diagnosis(
         assert case_db
         assert diag
         assert case_db.diagnosis_id == diag.id
+        # the workshop of the case is stored with the diagnosis
+        assert diag.workshop_id == workshop_id
+
+
+@pytest.mark.asyncio
+async def test_start_diagnosis_records_task_dispatch(
+        case_data, authenticated_async_client, initialized_beanie_context
+):
+    async with initialized_beanie_context:
+        workshop_id = case_data["workshop_id"]
+        case_id = case_data["_id"]
+        await Case(**case_data).create()
+
+        # record the order of linking the diagnosis and waking up the
+        # dispatcher
+        events = []
+        save = Case.save
+
+        async def recorded_save(self, *args, **kwargs):
+            result = await save(self, *args, **kwargs)
+            events.append("case saved")
+            return result
+
+        # broker is not available
+        DiagnosticTaskManager.set_celery(
+            Celery(broker="redis://no-broker-here:6379")
+        )
+        try:
+            with mock.patch.object(Case, "save", recorded_save), \
+                    mock.patch.object(
+                        task_dispatcher,
+                        "wakeup",
+                        lambda: events.append("dispatcher woken up")
+                    ):
+                response = await authenticated_async_client.post(
+                    f"{workshop_id}/cases/{case_id}/diag"
+                )
+        finally:
+            DiagnosticTaskManager.set_celery(None)
+
+        # diagnosis is started and the task is dispatched later on
+        assert response.status_code == 201
+        dispatches = await TaskDispatch.find_all().to_list()
+        assert len(dispatches) == 1
+        assert str(dispatches[0].diagnosis_id) == response.json()["_id"]
+        # the dispatcher is woken up once the case links the diagnosis
+        assert events == ["case saved", "dispatcher woken up"]
 
 
 @pytest.mark.asyncio
@@ -1617,11 +2310,13 @@ async def test_list_diagnoses(
         assert case_1.id
         diag_1 = await Diagnosis(  # noqa F841
             case_id=case_1.id,
+            workshop_id=workshop_id,
             status=DiagnosisStatus("scheduled")
         ).insert()  # noqa F841
         assert case_2.id
         diag_2 = await Diagnosis(
             case_id=case_2.id,
+            workshop_id=workshop_id,
             status=DiagnosisStatus("finished")
         ).insert()
 
@@ -1641,6 +2336,49 @@ async def test_list_diagnoses(
         assert response.json()[0]["_id"] == str(diag_2.id)
 
 
+@pytest.mark.asyncio
+async def test_list_diagnoses_paginated(
+        authenticated_async_client,
+        initialized_beanie_context,
+        workshop_id
+):
+    async with initialized_beanie_context:
+        diagnoses = [
+            await Diagnosis(
+                case_id=ObjectId(), workshop_id=workshop_id
+            ).insert()
+            for _ in range(3)
+        ]
+        # diagnosis of another workshop
+        await Diagnosis(case_id=ObjectId(), workshop_id="other").insert()
+
+        response = await authenticated_async_client.get(
+            f"{workshop_id}/diagnoses", params={"page_size": 2}
+        )
+        assert response.status_code == 200
+        assert [d["_id"] for d in response.json()] == [
+            str(d.id) for d in diagnoses[:2]
+        ]
+        next_link = response.links["next"]["url"]
+        assert f"cursor={diagnoses[1].id}" in next_link
+
+        # continue with the next page
+        response = await authenticated_async_client.get(
+            f"{workshop_id}/diagnoses",
+            params={"page_size": 2, "cursor": str(diagnoses[1].id)}
+        )
+        assert response.status_code == 200
+        assert [d["_id"] for d in response.json()] == [str(diagnoses[2].id)]
+        assert "next" not in response.links
+
+
+def test_list_diagnoses_invalid_cursor(authenticated_client, workshop_id):
+    response = authenticated_client.get(
+        f"/{workshop_id}/diagnoses", params={"cursor": "invalid"}
+    )
+    assert response.status_code == 400
+
+
 @pytest.mark.parametrize("route", router.routes, ids=lambda r: r.name)
 def test_missing_bearer_token(route, workshop_id, unauthenticated_client):
     """Endpoints should not be accessible without a bearer token."""
@@ -1,6 +1,10 @@
 import pytest
 
-from api.routers.utils.pagination import last_page_index, link_header
+from collections import namedtuple
+
+from api.routers.utils.pagination import (
+    last_page_index, link_header, cursor_page, cursor_link_header
+)
 
 
 @pytest.mark.parametrize(
@@ -120,3 +124,47 @@ def test_link_header_invalid_page_size_value(page_size):
 def test_link_header_invalid_document_count_value():
     with pytest.raises(ValueError):
         link_header(page=0, page_size=1, document_count=-1, url="http://")
+
+
+Document = namedtuple("Document", ["id"])
+
+
+def test_cursor_page():
+    documents = [Document(id=i) for i in range(3)]
+    assert cursor_page(documents, page_size=2) == (documents[:2], "1")
+
+
+@pytest.mark.parametrize("document_count", [0, 1, 2])
+def test_cursor_page_last_page(document_count):
+    documents = [Document(id=i) for i in range(document_count)]
+    assert cursor_page(documents, page_size=2) == (documents, None)
+
+
+@pytest.mark.parametrize("page_size", [-1, 0])
+def test_cursor_page_invalid_page_size_value(page_size):
+    with pytest.raises(ValueError):
+        cursor_page([], page_size=page_size)
+
+
+def test_cursor_link_header():
+    header = cursor_link_header(
+        next_cursor="abc", page_size=2, url="http://base?vin=X&cursor=123"
+    )
+    assert header == \
+           '<http://base?vin=X&page_size=2&cursor=abc>; rel="next", ' \
+           '<http://base?vin=X&page_size=2>; rel="first"'
+
+
+def test_cursor_link_header_no_next_page():
+    header = cursor_link_header(
+        next_cursor=None, page_size=2, url="http://base?page_size=2"
+    )
+    assert header == '<http://base?page_size=2>; rel="first"'
+
+
+@pytest.mark.parametrize("page_size", [1.0, "1"], ids=["float", "str"])
+def test_cursor_link_header_invalid_page_size_type(page_size):
+    with pytest.raises(TypeError):
+        cursor_link_header(
+            next_cursor=None, page_size=page_size, url="http://"
+        )
@@ -1,7 +1,13 @@
+import asyncio
+import time
+
 import pytest
 
 import httpx
 from api.security.keycloak import Keycloak
+from api.security.token_auth import verify_token
+from fastapi import HTTPException
+from jose import jwk, jws
 
 
 @pytest.fixture
@@ -20,15 +26,39 @@ def raw_public_key():
            "test key line 2"
 
 
+@pytest.fixture
+def jwks():
+    """Response content of the keycloak JWKS endpoint."""
+    return {"keys": []}
+
+
+@pytest.fixture()
+def requested_urls():
+    """Records urls requested via httpx.get."""
+    return []
+
+
 @pytest.fixture()
 def patch_successful_http_request(
-        monkeypatch, keycloak_url, workshop_realm, raw_public_key
+        monkeypatch,
+        keycloak_url,
+        workshop_realm,
+        raw_public_key,
+        jwks,
+        requested_urls
 ):
+    realm_url = f"{keycloak_url}/realms/{workshop_realm}"
+
     def mock_get(url):
-        assert url == f"{keycloak_url}/realms/{workshop_realm}"
+        requested_urls.append(url)
+        assert url in [realm_url, f"{realm_url}/protocol/openid-connect/certs"]
+        if url == realm_url:
+            content = {"public_key": raw_public_key}
+        else:
+            content = jwks
         return httpx.Response(
             status_code=200,
-            json={"public_key": raw_public_key},
+            json=content,
             request=httpx.Request(url=url, method="GET")
         )
     monkeypatch.setattr(httpx, "get", mock_get)
@@ -53,6 +83,9 @@ def delete_configuration():
     yield
     Keycloak._url = None
     Keycloak._workshop_realm = None
+    Keycloak._keys = {}
+    Keycloak._last_forced_refresh = {}
+    Keycloak._refresh_lock = None
 
 
 class TestKeycloak:
@@ -89,3 +122,106 @@ class TestKeycloak:
         assert lines[0] == "-----BEGIN PUBLIC KEY-----"
         assert lines[-1] == "-----END PUBLIC KEY-----"
         assert "\n".join(lines[1:-1]) == raw_public_key
+
+    def test_get_public_key_for_workshop_realm_is_cached(
+            self,
+            keycloak_url,
+            workshop_realm,
+            requested_urls,
+            patch_successful_http_request
+    ):
+        Keycloak.configure(keycloak_url, workshop_realm)
+        requests_after_configure = len(requested_urls)
+        for _ in range(3):
+            assert Keycloak.get_public_key_for_workshop_realm()
+        # keys are only retrieved during configuration
+        assert len(requested_urls) == requests_after_configure
+
+    def test_get_signature_keys(
+            self,
+            keycloak_url,
+            workshop_realm,
+            rsa_public_key_pem,
+            jwks,
+            patch_successful_http_request
+    ):
+        signature_key = jwk.construct(rsa_public_key_pem, "RS256").to_dict()
+        encryption_key = {**signature_key, "use": "enc"}
+        jwks["keys"] = [
+            {**signature_key, "kid": "sig-key", "use": "sig"},
+            {**encryption_key, "kid": "enc-key"}
+        ]
+        Keycloak.configure(keycloak_url, workshop_realm)
+        keys = Keycloak.get_signature_keys(workshop_realm)
+        assert list(keys) == ["sig-key"]
+        assert keys["sig-key"] == rsa_public_key_pem.decode()
+
+    @pytest.mark.asyncio
+    async def test_get_rotated_public_key_for_workshop_realm(
+            self,
+            keycloak_url,
+            workshop_realm,
+            rsa_public_key_pem,
+            jwks,
+            requested_urls,
+            patch_successful_http_request
+    ):
+        Keycloak.configure(keycloak_url, workshop_realm)
+        # key is rotated in keycloak after configuration
+        jwks["keys"] = [{
+            **jwk.construct(rsa_public_key_pem, "RS256").to_dict(),
+            "kid": "new-key"
+        }]
+        requested_urls.clear()
+
+        # concurrent requests cause a single refresh
+        rotated_keys = await asyncio.gather(*[
+            Keycloak.get_rotated_public_key_for_workshop_realm(kid="new-key")
+            for _ in range(5)
+        ])
+        assert rotated_keys == [rsa_public_key_pem.decode()] * 5
+        assert len(requested_urls) == 2
+
+        # unknown key ids do not cause another refresh within the minimum
+        # refresh interval ...
+        await Keycloak.get_rotated_public_key_for_workshop_realm(kid="other")
+        assert len(requested_urls) == 2
+
+        # ... but after it
+        Keycloak._last_forced_refresh[workshop_realm] = \
+            time.monotonic() - Keycloak._min_refresh_interval
+        await Keycloak.get_rotated_public_key_for_workshop_realm(kid="other")
+        assert len(requested_urls) == 4
+
+    @pytest.mark.asyncio
+    async def test_verify_token_after_key_rotation(
+            self,
+            keycloak_url,
+            workshop_realm,
+            rsa_private_key_pem,
+            rsa_public_key_pem,
+            another_rsa_public_key_pem,
+            jwks,
+            patch_successful_http_request
+    ):
+        Keycloak.configure(keycloak_url, workshop_realm)
+        token = jws.sign(
+            {"preferred_username": "test", "realm_access": {"roles": []}},
+            rsa_private_key_pem,
+            algorithm="RS256",
+            headers={"kid": "new-key"}
+        )
+        outdated_key = another_rsa_public_key_pem.decode()
+
+        # new key is not yet known
+        with pytest.raises(HTTPException):
+            await verify_token(token=token, jwt_pub_key=outdated_key)
+
+        # new key is available after refresh
+        jwks["keys"] = [{
+            **jwk.construct(rsa_public_key_pem, "RS256").to_dict(),
+            "kid": "new-key"
+        }]
+        Keycloak._last_forced_refresh = {}
+        token_data = await verify_token(token=token, jwt_pub_key=outdated_key)
+        assert token_data.username == "test"
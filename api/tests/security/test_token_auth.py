@@ -0,0 +1,154 @@
+from datetime import datetime, timedelta, UTC
+
+from unittest import mock
+
+import pytest
+from api.security import token_auth
+from api.security.keycloak import Keycloak
+from api.security.token_auth import (
+    verify_token, verified_token_cache, VerifiedTokenCache, TokenData
+)
+from fastapi import HTTPException
+from jose import jwk, jws
+
+
+@pytest.fixture(autouse=True)
+def clear_verified_token_cache():
+    verified_token_cache.clear()
+    yield
+    verified_token_cache.clear()
+
+
+@pytest.fixture
+def jwt_payload():
+    return {
+        "exp": (datetime.now(UTC) + timedelta(minutes=5)).timestamp(),
+        "preferred_username": "test-user",
+        "realm_access": {"roles": ["workshop"]}
+    }
+
+
+@pytest.fixture
+def token_data(jwt_payload):
+    return TokenData(**jwt_payload)
+
+
+class TestVerifiedTokenCache:
+
+    def test_get_put(self, token_data, jwt_payload):
+        cache = VerifiedTokenCache()
+        assert cache.get("token", "key") is None
+        cache.put("token", "key", token_data, jwt_payload["exp"])
+        assert cache.get("token", "key") == token_data
+        # tokens are only served for the key they were verified with
+        assert cache.get("token", "other-key") is None
+        assert cache.stats() == {
+            "size": 1, "max_size": 1024, "hits": 1, "misses": 2
+        }
+
+    def test_expired_tokens_are_evicted(self, token_data):
+        cache = VerifiedTokenCache()
+        expired = (datetime.now(UTC) - timedelta(seconds=1)).timestamp()
+        cache.put("token", "key", token_data, expired)
+        assert cache.get("token", "key") is None
+        assert cache.stats()["size"] == 0
+
+    def test_least_recently_used_tokens_are_evicted(
+            self, token_data, jwt_payload
+    ):
+        cache = VerifiedTokenCache(max_size=2)
+        for token in ["token-1", "token-2"]:
+            cache.put(token, "key", token_data, jwt_payload["exp"])
+        cache.get("token-1", "key")
+        cache.put("token-3", "key", token_data, jwt_payload["exp"])
+        assert cache.get("token-1", "key") == token_data
+        assert cache.get("token-2", "key") is None
+        assert cache.get("token-3", "key") == token_data
+
+    def test_disabled(self, token_data, jwt_payload):
+        cache = VerifiedTokenCache(max_size=0)
+        cache.put("token", "key", token_data, jwt_payload["exp"])
+        assert cache.get("token", "key") is None
+
+
+@pytest.mark.asyncio
+async def test_verify_token_uses_cache(
+        jwt_payload, rsa_private_key_pem, rsa_public_key_pem
+):
+    token = jws.sign(jwt_payload, rsa_private_key_pem, algorithm="RS256")
+    key = rsa_public_key_pem.decode()
+    for _ in range(3):
+        token_data = await verify_token(token=token, jwt_pub_key=key)
+        assert token_data.username == "test-user"
+    assert verified_token_cache.stats()["hits"] == 2
+    assert verified_token_cache.stats()["misses"] == 1
+
+
+@pytest.mark.asyncio
+async def test_verify_token_does_not_cache_invalid_tokens(
+        jwt_payload, rsa_private_key_pem, another_rsa_public_key_pem
+):
+    token = jws.sign(jwt_payload, rsa_private_key_pem, algorithm="RS256")
+    key = another_rsa_public_key_pem.decode()
+    for _ in range(2):
+        with pytest.raises(HTTPException):
+            await verify_token(token=token, jwt_pub_key=key)
+    assert verified_token_cache.stats()["size"] == 0
+
+
+@pytest.mark.asyncio
+async def test_verify_token_expired_does_not_look_up_rotated_key(
+        jwt_payload, rsa_private_key_pem, rsa_public_key_pem
+):
+    jwt_payload["exp"] = (datetime.now(UTC) - timedelta(minutes=5)).timestamp()
+    token = jws.sign(
+        jwt_payload,
+        rsa_private_key_pem,
+        algorithm="RS256",
+        headers={"kid": "key"}
+    )
+    with mock.patch.object(
+            Keycloak, "get_rotated_public_key_for_workshop_realm"
+    ) as get_rotated_key:
+        with pytest.raises(HTTPException):
+            await verify_token(
+                token=token, jwt_pub_key=rsa_public_key_pem.decode()
+            )
+    get_rotated_key.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_verify_token_does_not_retry_with_active_key(
+        jwt_payload,
+        rsa_private_key_pem,
+        rsa_public_key_pem,
+        another_rsa_public_key_pem
+):
+    token = jws.sign(
+        jwt_payload,
+        rsa_private_key_pem,
+        algorithm="RS256",
+        headers={"kid": "key"}
+    )
+    # active key as served by the realm endpoint with the base64 encoded key
+    # on a single line
+    key_lines = another_rsa_public_key_pem.decode().strip().splitlines()
+    active_key = "\n".join(
+        [key_lines[0], "".join(key_lines[1:-1]), key_lines[-1]]
+    )
+    # same key as served by the JWKS endpoint
+    jwks_key = jwk.construct(
+        jwk.construct(active_key, "RS256").to_dict(), "RS256"
+    ).to_pem().decode()
+    assert jwks_key != active_key
+
+    with mock.patch.object(
+            Keycloak,
+            "get_rotated_public_key_for_workshop_realm",
+            mock.AsyncMock(return_value=jwks_key)
+    ), mock.patch.object(
+        token_auth, "_decode_token", wraps=token_auth._decode_token
+    ) as decode_token:
+        with pytest.raises(HTTPException):
+            await verify_token(token=token, jwt_pub_key=active_key)
+    decode_token.assert_called_once()
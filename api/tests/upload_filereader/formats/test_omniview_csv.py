@@ -1,3 +1,6 @@
+import io
+from array import array
+
 import pytest
 from api.upload_filereader.filereader import FileReaderException
 from api.upload_filereader.formats.omniview_csv import OmniviewCSVReader
@@ -51,3 +54,55 @@ class TestOmniviewCSVReader:
         file = request.getfixturevalue(file)
         with pytest.raises(FileReaderException):
             OmniviewCSVReader().read_file(file)
+
+    @pytest.mark.parametrize(
+        "file,expected",
+        [
+            ("omniview_csv_file", True),
+            ("omniview_sin_csv_file", True),
+            ("picoscope_1ch_eng_csv_file", False),
+            ("vcds_txt_file", False)
+        ]
+    )
+    def test_probe(self, file, expected, request):
+        file = request.getfixturevalue(file)
+        assert bool(OmniviewCSVReader().probe(file)) is expected
+        assert file.tell() == 0
+
+    @pytest.mark.parametrize("block_size", [1, 7, 2**16])
+    def test_read_file_streaming(self, block_size, omniview_sin_csv_file):
+        expected = OmniviewCSVReader().read_file(omniview_sin_csv_file)
+        omniview_sin_csv_file.seek(0)
+
+        reader = OmniviewCSVReader(streaming=True, block_size=block_size)
+        result = reader.read_file(omniview_sin_csv_file)
+
+        assert len(result) == 1
+        assert isinstance(result[0]["signal"], array)
+        assert result[0]["signal"].typecode == "d"
+        assert result[0]["signal"].tolist() == expected[0]["signal"]
+        assert result[0]["device_specs"] == expected[0]["device_specs"]
+
+    @pytest.mark.parametrize("streaming", [False, True])
+    @pytest.mark.parametrize(
+        "content,expected_error",
+        [
+            (
+                b"Omniscope-A1\n0,1.0\n1,\n3,2.0\n",
+                "Expected first column to match row index but got 3 != 2."
+            ),
+            (
+                b"Omniscope-A1\n0,1.0\n1,2.0,3.0\n",
+                "Expected two entries per row but got 3."
+            ),
+            (
+                b"Omniscope-A1\n0,1.0\n1,x\n3,2.0\n",
+                "Expected second column to be float value but got x"
+            )
+        ]
+    )
+    def test_read_file_invalid_rows(self, streaming, content, expected_error):
+        reader = OmniviewCSVReader(streaming=streaming, block_size=4)
+        with pytest.raises(FileReaderException) as excinfo:
+            reader.read_file(io.BytesIO(content))
+        assert str(excinfo.value) == expected_error
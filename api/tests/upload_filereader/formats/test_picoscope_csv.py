@@ -1,3 +1,4 @@
+import io
 from numbers import Number
 
 import numpy as np
@@ -69,3 +70,97 @@ class TestPicoscopeCSVReader:
         file = request.getfixturevalue(file)
         with pytest.raises(FileReaderException):
             PicoscopeCSVReader().read_file(file)
+
+    @pytest.mark.parametrize(
+        "file,expected",
+        [
+            ("picoscope_1ch_eng_csv_file", True),
+            ("picoscope_4ch_ger_csv_file", True),
+            ("picoscope_8ch_ger_comma_decimal_csv_file", True),
+            ("omniview_csv_file", False),
+            ("vcds_txt_file", False)
+        ]
+    )
+    def test_probe(self, file, expected, request):
+        file = request.getfixturevalue(file)
+        assert bool(PicoscopeCSVReader().probe(file)) is expected
+        assert file.tell() == 0
+
+    @pytest.mark.parametrize(
+        "file",
+        [
+            "picoscope_1ch_eng_csv_file",
+            "picoscope_4ch_eng_csv_file",
+            "picoscope_1ch_ger_csv_file",
+            "picoscope_4ch_ger_csv_file",
+            "picoscope_8ch_ger_comma_decimal_csv_file"
+        ]
+    )
+    def test_read_file_engines_match(self, file, request):
+        file = request.getfixturevalue(file)
+        numpy_result = PicoscopeCSVReader(engine="numpy").read_file(file)
+        file.seek(0)
+        python_result = PicoscopeCSVReader(engine="python").read_file(file)
+
+        assert len(numpy_result) == len(python_result)
+        for numpy_data, python_data in zip(numpy_result, python_result):
+            assert numpy_data["duration"] == python_data["duration"]
+            assert numpy_data["sampling_rate"] == python_data["sampling_rate"]
+            assert numpy_data["device_specs"] == python_data["device_specs"]
+            assert isinstance(numpy_data["signal"], list)
+            assert np.allclose(numpy_data["signal"], python_data["signal"])
+
+    @pytest.mark.parametrize("engine", ["numpy", "python"])
+    @pytest.mark.parametrize(
+        "content,expected_error",
+        [
+            (
+                b"Time,Channel A\n(ms),(V)\n\n0.0,1.0\n0.1\n",
+                "conversion failed: discontinuity detected"
+            ),
+            (
+                b"Time,Channel A\n(ms),(V)\n\n0.0,1.0\n0.1,x\n",
+                "conversion failed:could not convert string to float: 'x'"
+            ),
+            (
+                b"Time;Channel A\n(ms);(V)\n\n0,0;1,0\n0,1;1,0;2,0\n",
+                "conversion failed: discontinuity detected"
+            )
+        ]
+    )
+    def test_read_file_invalid_values(self, engine, content, expected_error):
+        file = io.BytesIO(content)
+        with pytest.raises(FileReaderException) as excinfo:
+            PicoscopeCSVReader(engine=engine).read_file(file)
+        assert str(excinfo.value) == expected_error
+
+    @pytest.mark.parametrize("engine", ["numpy", "python"])
+    def test_read_file_unit_conversion(self, engine):
+        file = io.BytesIO(
+            b"Zeit;Kanal A;Kanal B\n(ms);(mV);(V)\n\n"
+            b"-0,1;1000,0;1,5\n0,0;2000,0;2,5\n0,1;3000,0;3,5\n"
+        )
+        result = PicoscopeCSVReader(engine=engine).read_file(file)
+        assert [data["signal"] for data in result] == [
+            [1.0, 2.0, 3.0], [1.5, 2.5, 3.5]
+        ]
+        assert result[0]["sampling_rate"] == 10000
+
+    @pytest.mark.parametrize("engine", ["numpy", "python"])
+    def test_read_file_as_array(self, engine, picoscope_4ch_ger_csv_file):
+        expected = PicoscopeCSVReader(engine=engine).read_file(
+            picoscope_4ch_ger_csv_file
+        )
+        picoscope_4ch_ger_csv_file.seek(0)
+        result = PicoscopeCSVReader(engine=engine, as_array=True).read_file(
+            picoscope_4ch_ger_csv_file
+        )
+        for data, expected_data in zip(result, expected):
+            assert isinstance(data["signal"], np.ndarray)
+            assert data["signal"].flags["C_CONTIGUOUS"]
+            assert data["signal"].tolist() == expected_data["signal"]
+            assert data["duration"] == expected_data["duration"]
+
+    def test_unknown_engine(self):
+        with pytest.raises(ValueError):
+            PicoscopeCSVReader(engine="pandas")
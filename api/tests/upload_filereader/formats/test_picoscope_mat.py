@@ -1,5 +1,6 @@
 from numbers import Number
 
+import numpy as np
 import pytest
 from api.upload_filereader.filereader import FileReaderException
 from api.upload_filereader.formats.picoscope_mat import PicoscopeMATReader
@@ -32,6 +33,18 @@ class TestPicoscopeMATReader:
             assert data["device_specs"]["channel"] == expected_channels[i]
             assert data["device_specs"]["type"] == "picoscope"
 
+    def test_read_file_as_array(self, picoscope_4ch_mat_file):
+        expected = PicoscopeMATReader().read_file(picoscope_4ch_mat_file)
+        picoscope_4ch_mat_file.seek(0)
+        result = PicoscopeMATReader(as_array=True).read_file(
+            picoscope_4ch_mat_file
+        )
+        assert len(result) == len(expected)
+        for data, expected_data in zip(result, expected):
+            assert isinstance(data["signal"], np.ndarray)
+            assert data["signal"].ndim == 1
+            assert data["signal"].tolist() == expected_data["signal"]
+
     @pytest.mark.parametrize(
         "file",
         [
@@ -42,3 +55,18 @@ class TestPicoscopeMATReader:
         file = request.getfixturevalue(file)
         with pytest.raises(FileReaderException):
             PicoscopeMATReader().read_file(file)
+
+    @pytest.mark.parametrize(
+        "file,expected",
+        [
+            ("picoscope_1ch_mat_file", True),
+            ("picoscope_4ch_mat_file", True),
+            ("picoscope_1ch_eng_csv_file", False),
+            ("omniview_csv_file", False),
+            ("vcds_txt_file", False)
+        ]
+    )
+    def test_probe(self, file, expected, request):
+        file = request.getfixturevalue(file)
+        assert bool(PicoscopeMATReader().probe(file)) is expected
+        assert file.tell() == 0
@@ -36,6 +36,20 @@ class TestVCDSTXTReader:
         with pytest.raises(FileReaderException):
             VCDSTXTReader().read_file(file)
 
+    @pytest.mark.parametrize(
+        "file,expected",
+        [
+            ("vcds_txt_file", True),
+            ("vcds_no_milage_txt_file", True),
+            ("picoscope_1ch_eng_csv_file", False),
+            ("omniview_csv_file", False)
+        ]
+    )
+    def test_probe(self, file, expected, request):
+        file = request.getfixturevalue(file)
+        assert bool(VCDSTXTReader().probe(file)) is expected
+        assert file.tell() == 0
+
     def test_read_file_without_milage(self, vcds_no_milage_txt_file):
         reader = VCDSTXTReader()
         result = reader.read_file(vcds_no_milage_txt_file)
@@ -0,0 +1,45 @@
+import io
+
+import pytest
+from api.upload_filereader import (
+    OBD_FORMATS, TIMESERIES_FORMATS, filereader_factory
+)
+
+
+class TestDetectFormat:
+
+    @pytest.mark.parametrize(
+        "file,file_format",
+        [
+            ("picoscope_1ch_mat_file", "Picoscope MAT"),
+            ("picoscope_4ch_mat_file", "Picoscope MAT"),
+            ("picoscope_1ch_eng_csv_file", "Picoscope CSV"),
+            ("picoscope_4ch_ger_csv_file", "Picoscope CSV"),
+            ("picoscope_8ch_ger_comma_decimal_csv_file", "Picoscope CSV"),
+            ("omniview_csv_file", "Omniview CSV"),
+            ("omniview_sin_csv_file", "Omniview CSV"),
+            ("vcds_txt_file", "VCDS TXT"),
+            ("vcds_no_milage_txt_file", "VCDS TXT")
+        ]
+    )
+    def test_detect_format(self, file, file_format, request):
+        file = request.getfixturevalue(file)
+        assert filereader_factory.detect_format(file) == file_format
+        # the file is rewound to be read afterwards
+        assert file.tell() == 0
+
+    @pytest.mark.parametrize(
+        "content", [b"", b"some text\nwithout format\n", b"\xff\xfe\x00"]
+    )
+    def test_detect_format_unknown(self, content):
+        assert filereader_factory.detect_format(io.BytesIO(content)) is None
+
+    def test_detect_format_restricted(
+            self, vcds_txt_file, picoscope_1ch_mat_file
+    ):
+        assert filereader_factory.detect_format(
+            vcds_txt_file, TIMESERIES_FORMATS
+        ) is None
+        assert filereader_factory.detect_format(
+            picoscope_1ch_mat_file, OBD_FORMATS
+        ) is None
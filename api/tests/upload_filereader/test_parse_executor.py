@@ -0,0 +1,186 @@
+import asyncio
+import os
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from unittest import mock
+
+import numpy as np
+import pytest
+from api.upload_filereader.filereader import FileReaderException
+from api.upload_filereader.parse_executor import (
+    ParseExecutor, ParseExecutorSaturated, _file_path, _read_file
+)
+
+
+class TestParseExecutor:
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("kind", ["thread", "process"])
+    async def test_read_file(self, kind, picoscope_4ch_eng_csv_file):
+        parse_executor = ParseExecutor(kind=kind, max_workers=1)
+        try:
+            result = await parse_executor.read_file(
+                "Picoscope CSV", picoscope_4ch_eng_csv_file, as_array=True
+            )
+        finally:
+            parse_executor.shutdown()
+
+        assert [data["device_specs"]["channel"] for data in result] == \
+               ["A", "B", "C", "D"]
+        assert isinstance(result[0]["signal"], np.ndarray)
+        stats = parse_executor.stats()
+        assert stats["kind"] == kind
+        assert stats["pending"] == 0
+        assert stats["formats"]["Picoscope CSV"]["count"] == 1
+        assert stats["formats"]["Picoscope CSV"]["failed"] == 0
+        assert stats["formats"]["Picoscope CSV"]["max_seconds"] > 0
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("kind", ["thread", "process"])
+    async def test_read_file_fails(self, kind, vcds_txt_file):
+        parse_executor = ParseExecutor(kind=kind, max_workers=1)
+        try:
+            with pytest.raises(FileReaderException):
+                await parse_executor.read_file("Picoscope CSV", vcds_txt_file)
+        finally:
+            parse_executor.shutdown()
+        stats = parse_executor.stats()
+        assert stats["pending"] == 0
+        assert stats["formats"]["Picoscope CSV"]["count"] == 0
+        assert stats["formats"]["Picoscope CSV"]["failed"] == 1
+
+    @pytest.mark.asyncio
+    async def test_read_file_saturated(self, picoscope_1ch_eng_csv_file):
+        parse_executor = ParseExecutor(max_workers=1, max_pending=1)
+        release = threading.Event()
+
+        def blocked_read_file(*args):
+            release.wait(timeout=10)
+            return _read_file(*args)
+
+        with mock.patch(
+                "api.upload_filereader.parse_executor._read_file",
+                side_effect=blocked_read_file
+        ):
+            first = asyncio.create_task(
+                parse_executor.read_file(
+                    "Picoscope CSV", picoscope_1ch_eng_csv_file
+                )
+            )
+            await asyncio.sleep(0)
+            assert parse_executor.pending == 1
+
+            # further files are rejected while the first one is parsed
+            with pytest.raises(ParseExecutorSaturated):
+                await parse_executor.read_file(
+                    "Picoscope CSV", picoscope_1ch_eng_csv_file
+                )
+            release.set()
+            result = await first
+
+        parse_executor.shutdown()
+        assert len(result) == 1
+        assert parse_executor.stats()["rejected"] == 1
+        assert parse_executor.stats()["pending"] == 0
+
+    @pytest.mark.asyncio
+    async def test_thread_pool_fallback(self, picoscope_1ch_eng_csv_file):
+        parse_executor = ParseExecutor(kind="process")
+        with mock.patch(
+                "api.upload_filereader.parse_executor.ProcessPoolExecutor",
+                side_effect=NotImplementedError
+        ):
+            result = await parse_executor.read_file(
+                "Picoscope CSV", picoscope_1ch_eng_csv_file
+            )
+        parse_executor.shutdown()
+        assert len(result) == 1
+        assert parse_executor.kind == "thread"
+
+    @pytest.mark.asyncio
+    async def test_read_spooled_file_in_process(
+            self, picoscope_1ch_eng_csv_file
+    ):
+        # files without a path on disk are copied for the worker
+        upload = tempfile.SpooledTemporaryFile(max_size=16)
+        upload.write(picoscope_1ch_eng_csv_file.read())
+        upload.seek(0)
+        parse_executor = ParseExecutor(kind="process", max_workers=1)
+        try:
+            with mock.patch(
+                    "api.upload_filereader.parse_executor.os.unlink",
+                    wraps=os.unlink
+            ) as unlink:
+                result = await parse_executor.read_file(
+                    "Picoscope CSV", upload
+                )
+        finally:
+            parse_executor.shutdown()
+        assert len(result) == 1
+        # the temporary copy read by the worker is deleted
+        unlink.assert_called_once()
+        assert not os.path.exists(unlink.call_args.args[0])
+
+    @pytest.mark.asyncio
+    async def test_read_named_file_in_process(
+            self, picoscope_1ch_eng_csv_file
+    ):
+        # assembled uploads are named temporary files, read without a copy
+        upload = tempfile.NamedTemporaryFile()
+        upload.write(picoscope_1ch_eng_csv_file.read())
+        upload.flush()
+        upload.seek(0)
+        parse_executor = ParseExecutor(kind="process", max_workers=1)
+        try:
+            with mock.patch(
+                    "api.upload_filereader.parse_executor.tempfile"
+                    ".NamedTemporaryFile"
+            ) as copy:
+                result = await parse_executor.read_file(
+                    "Picoscope CSV", upload
+                )
+        finally:
+            parse_executor.shutdown()
+            upload.close()
+        assert len(result) == 1
+        copy.assert_not_called()
+
+    def test_file_path(self, picoscope_1ch_eng_csv_file):
+        # files on disk are read by the worker directly
+        path, is_copy = _file_path(picoscope_1ch_eng_csv_file)
+        assert path == picoscope_1ch_eng_csv_file.name
+        assert not is_copy
+
+        upload = tempfile.SpooledTemporaryFile()
+        upload.write(b"test data")
+        upload.seek(0)
+        path, is_copy = _file_path(upload)
+        try:
+            assert is_copy
+            with open(path, "rb") as f:
+                assert f.read() == b"test data"
+        finally:
+            os.unlink(path)
+
+    def test_start(self):
+        parse_executor = ParseExecutor(kind="process", max_workers=1)
+        try:
+            parse_executor.start()
+            assert isinstance(parse_executor._executor, ProcessPoolExecutor)
+        finally:
+            parse_executor.shutdown()
+        assert parse_executor.kind == "process"
+
+    def test_start_process_pool_fallback(self):
+        parse_executor = ParseExecutor(kind="process")
+        # starting worker processes fails
+        with mock.patch.object(
+                ProcessPoolExecutor, "submit", side_effect=OSError
+        ):
+            parse_executor.start()
+        try:
+            assert isinstance(parse_executor._executor, ThreadPoolExecutor)
+        finally:
+            parse_executor.shutdown()
+        assert parse_executor.kind == "thread"
@@ -519,10 +519,24 @@ def timeseries_data(
 ):
     timeseries_data = get_from_api(ressource_url, access_token)
     signal_url = f"{ressource_url}/signal"
-    signal = get_from_api(signal_url, access_token)
+    # the chart can not display more points than pixels, so only a min/max
+    # envelope of long signals is requested
+    response = httpx.get(
+        signal_url,
+        headers=_auth_header(access_token),
+        params={"max_points": 2000}
+    )
+    response.raise_for_status()
+    signal = response.json()
+    start = int(response.headers.get("x-signal-start", 0))
+    sample_distance = float(
+        response.headers.get("x-signal-sample-distance", 1)
+    )
     # convert signal to 2d array with columns 'Zeit' and 'Signal'
     sr = timeseries_data["sampling_rate"]
-    signal = [[i / sr, v] for i, v in enumerate(signal)]
+    signal = [
+        [(start + i * sample_distance) / sr, v] for i, v in enumerate(signal)
+    ]
 
     return templates.TemplateResponse(
         "timeseries_data.html",
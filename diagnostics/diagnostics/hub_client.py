@@ -9,6 +9,10 @@ class HubClient:
     needed to run a specific diagnosis and to provide (intermediate) results.
     """
 
+    # Seconds to wait for a response in addition to the time the Hub holds
+    # a request for data
+    request_timeout: float = 5.
+
     def __init__(self, hub_url, diag_id, api_key):
         self.hub_url = hub_url
         self.diag_id = diag_id
@@ -50,28 +54,40 @@ class HubClient:
     def test_connection(self):
         self.http_client.get(self.ping_url).raise_for_status()
 
-    def _get_from_url(self, url: str, query_params: dict = {}):
-        response = self.http_client.get(url, params=query_params)
+    def _get_from_url(
+            self, url: str, query_params: dict = {}, wait: float = 0
+    ):
+        # Requests with wait > 0 are held by the Hub until data is added or
+        # wait seconds passed
+        response = self.http_client.get(
+            url,
+            params={**query_params, "wait": wait} if wait else query_params,
+            timeout=wait + self.request_timeout
+        )
         response.raise_for_status()
         return response.json()
 
     def get_diag(self) -> dict:
         return self._get_from_url(self.diag_url)
 
-    def get_obd_data(self) -> List[dict]:
-        return self._get_from_url(self.obd_url)
+    def get_obd_data(self, wait: float = 0) -> List[dict]:
+        return self._get_from_url(self.obd_url, wait=wait)
 
     def get_vehicle(self) -> dict:
         return self._get_from_url(self.vehicle_url)
 
-    def get_oscillograms(self, component: str) -> List[dict]:
+    def get_oscillograms(
+            self, component: str, wait: float = 0
+    ) -> List[dict]:
         return self._get_from_url(
-            self.oscillograms_url, query_params={"component": component}
+            self.oscillograms_url,
+            query_params={"component": component},
+            wait=wait
         )
 
-    def get_symptoms(self, component: str) -> List[dict]:
+    def get_symptoms(self, component: str, wait: float = 0) -> List[dict]:
         return self._get_from_url(
-            self.symptoms_url, query_params={"component": component}
+            self.symptoms_url, query_params={"component": component}, wait=wait
         )
 
     def _create_action_add_oscillogram(self, component: str) -> dict:
@@ -1,4 +1,3 @@
-from time import sleep
 from typing import List
 
 from vehicle_diag_smach.data_types.customer_complaint_data import (
@@ -16,9 +15,11 @@ from ..hub_client import HubClient
 
 class HubDataAccessor(DataAccessor):
 
-    def __init__(self, hub_client: HubClient, data_poll_interval: int):
+    def __init__(self, hub_client: HubClient, data_wait_timeout: int):
         self.hub_client = hub_client
-        self.data_poll_interval = data_poll_interval
+        # Seconds the Hub holds a request for data before it has to be
+        # repeated
+        self.data_wait_timeout = data_wait_timeout
 
     def get_workshop_info(self) -> WorkshopData:
         diag = self.hub_client.get_diag()
@@ -35,8 +36,9 @@ class HubDataAccessor(DataAccessor):
         print("Waiting for Hub OBD Data ...")
         hub_obd_data = []
         while hub_obd_data == []:
-            sleep(self.data_poll_interval)
-            hub_obd_data = self.hub_client.get_obd_data()
+            hub_obd_data = self.hub_client.get_obd_data(
+                wait=self.data_wait_timeout
+            )
         return hub_obd_data
 
     def _get_dtcs(self) -> List[str]:
@@ -71,8 +73,9 @@ class HubDataAccessor(DataAccessor):
         )
         oscillograms = []
         while oscillograms == []:
-            sleep(self.data_poll_interval)
-            oscillograms = self.hub_client.get_oscillograms(component)
+            oscillograms = self.hub_client.get_oscillograms(
+                component, wait=self.data_wait_timeout
+            )
         return oscillograms
 
     def _get_oscillogram_by_component(
@@ -115,8 +118,9 @@ class HubDataAccessor(DataAccessor):
         )
         symptoms = []
         while symptoms == []:
-            sleep(self.data_poll_interval)
-            symptoms = self.hub_client.get_symptoms(component)
+            symptoms = self.hub_client.get_symptoms(
+                component, wait=self.data_wait_timeout
+            )
         return symptoms
 
     def _get_symptom(self, component: str) -> dict:
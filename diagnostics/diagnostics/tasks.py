@@ -17,7 +17,7 @@ class Settings(BaseSettings):
     redis_host: str = "redis"
     redis_port: str = "6379"
     hub_url: str = "http://api:8000/v1"
-    data_poll_interval: int = 1
+    data_wait_timeout: int = 60
     models_dir: str = "models"
     knowledge_graph_url: str = "http://knowledge-graph:3030"
 
@@ -59,7 +59,7 @@ def diagnose(diag_id):
     # set up vehicle_diag_smach interfaces
     data_accessor = HubDataAccessor(
         hub_client=hub_client,
-        data_poll_interval=settings.data_poll_interval
+        data_wait_timeout=settings.data_wait_timeout
     )
     data_provider = HubDataProvider(
         hub_client=hub_client
@@ -55,6 +55,12 @@ $kcadm create roles \
 	-s description="Role for API assets endpoints"
 
 
+$kcadm create roles \
+	-r werkstatt-hub \
+	-s name=knowledge \
+	-s description="Role for API knowledge management endpoints"
+
+
 # Add groups and set roles
 $kcadm create groups \
     -r werkstatt-hub \
@@ -87,7 +93,8 @@ $kcadm add-roles \
     -r werkstatt-hub \
     --gname Admins \
     --rolename workshop \
-    --rolename shared
+    --rolename shared \
+    --rolename knowledge
 
 # Add users
 $kcadm create users \
@@ -168,7 +175,8 @@ then
         --rolename workshop \
         --rolename shared \
         --rolename customers \
-        --rolename assets
+        --rolename assets \
+        --rolename knowledge
 
     $kcadm create clients \
         -r werkstatt-hub \